@@ -127,6 +127,21 @@ function parseSourceStatsFromLog(activityLog) {
   return stats;
 }
 
+// Keep at most this many log entries client-side while following a run
+const ACTIVITY_LOG_LIMIT = 500;
+// Reconnects (each with a fresh ticket) before the live view falls back to polling
+const STREAM_MAX_RETRIES = 3;
+
+// Append a delta from the server, keeping only the newest "live count" per source
+function mergeActivityLog(activityLog, delta) {
+  const merged = [...(activityLog || []), ...(delta || [])];
+  const latest = {};
+  merged.forEach((e, i) => { if (e.type === "source_stats") latest[e.source] = i; });
+  return merged
+    .filter((e, i) => e.type !== "source_stats" || latest[e.source] === i)
+    .slice(-ACTIVITY_LOG_LIMIT);
+}
+
 function SourceCounter({ sourceKey, sourceStats, isActive, isDone, isQueued, scrapeStatus }) {
   const cfg = SOURCE_CFG[sourceKey];
   if (!cfg) return null;
@@ -688,13 +703,13 @@ function ScrapeLiveDashboard({ scrapeStatus, onStop, isAborting, liveLeadCount,
 }
 
 const FacebookLeadCard = ({ lead, onSelect, updateStatus }) => {
-  const authorInitial = (lead.raw_json?.authorName || lead.title || "?").charAt(0).toUpperCase();
-  const groupName  = lead.fb_group_name || lead.raw_json?.groupName || lead.raw_json?.group || "";
-  const groupUrl   = lead.fb_group_url  || lead.raw_json?.groupUrl  || "";
-  const likes      = lead.raw_json?.likesCount    || 0;
-  const comments   = lead.raw_json?.commentsCount || 0;
-  const shares     = lead.raw_json?.sharesCount   || 0;
-  const authorName = lead.raw_json?.authorName    || lead.raw_json?.author || "";
+  const authorInitial = (lead.raw_summary?.authorName || lead.title || "?").charAt(0).toUpperCase();
+  const groupName  = lead.fb_group_name || lead.raw_summary?.groupName || lead.raw_summary?.group || "";
+  const groupUrl   = lead.fb_group_url  || lead.raw_summary?.groupUrl  || "";
+  const likes      = lead.raw_summary?.likesCount    || 0;
+  const comments   = lead.raw_summary?.commentsCount || 0;
+  const shares     = lead.raw_summary?.sharesCount   || 0;
+  const authorName = lead.raw_summary?.authorName    || lead.raw_summary?.author || "";
   const snippet    = (lead.post || "").slice(0, 200) + ((lead.post || "").length > 200 ? "..." : "");
   return (
     <div className="bg-white/[0.02] border border-white/[0.06] rounded-2xl p-3 lg:p-4 hover:bg-white/[0.04] hover:border-indigo-500/20 transition-all group cursor-pointer" onClick={() => onSelect(lead)}>
@@ -1101,12 +1116,12 @@ onBlur={e => setMaxPosts(Math.max(5, Math.min(500, parseInt(e.target.value) || 5
             <>
               <div className="divide-y divide-white/[0.04]">
                 {groupLeads.map(lead => {
-                  const authorName = lead.raw_json?.authorName || lead.raw_json?.author || "";
+                  const authorName = lead.raw_summary?.authorName || lead.raw_summary?.author || "";
                   const authorInitial = (authorName || lead.title || "?").charAt(0).toUpperCase();
                   const snippet = (lead.post || "").slice(0, 220) + ((lead.post || "").length > 220 ? "…" : "");
                   const postDate = lead.datetime ? new Date(lead.datetime).toLocaleDateString("en-US", { month: "short", day: "numeric", year: "numeric" }) : null;
-                  const likes    = lead.raw_json?.likesCount    || 0;
-                  const comments = lead.raw_json?.commentsCount || 0;
+                  const likes    = lead.raw_summary?.likesCount    || 0;
+                  const comments = lead.raw_summary?.commentsCount || 0;
                   return (
                     <div key={lead.post_id} className="px-4 py-3.5 hover:bg-white/[0.02] transition-colors cursor-pointer group" onClick={() => setSelectedLead(lead)}>
                       <div className="flex items-start gap-3 mb-2">
@@ -1166,12 +1181,12 @@ function LeadDetailModal({ lead, onClose, updateStatus }) {
             <div className="flex items-center gap-2 mb-1 flex-wrap">
               <SourceTag source={lead.source} />
               <Badge color={lead.score >= 70 ? "green" : lead.score >= 40 ? "yellow" : "slate"}>Score {lead.score}</Badge>
-              {lead.source === "FACEBOOK" && (lead.fb_group_name || lead.raw_json?.groupName) && (
+              {lead.source === "FACEBOOK" && (lead.fb_group_name || lead.raw_summary?.groupName) && (
                 <span className="text-[10px] text-indigo-400/70 flex items-center gap-1">
                   <Users className="w-3 h-3" />
                   {lead.fb_group_url
-                    ? <a href={lead.fb_group_url} target="_blank" rel="noreferrer" className="hover:text-indigo-300 underline underline-offset-2">{lead.fb_group_name || lead.raw_json?.groupName}</a>
-                    : (lead.fb_group_name || lead.raw_json?.groupName)}
+                    ? <a href={lead.fb_group_url} target="_blank" rel="noreferrer" className="hover:text-indigo-300 underline underline-offset-2">{lead.fb_group_name || lead.raw_summary?.groupName}</a>
+                    : (lead.fb_group_name || lead.raw_summary?.groupName)}
                 </span>
               )}
             </div>
@@ -1183,11 +1198,11 @@ function LeadDetailModal({ lead, onClose, updateStatus }) {
           {lead.source === "FACEBOOK" && (
             <div className="bg-indigo-500/5 border border-indigo-500/20 rounded-xl p-4 flex items-center gap-3">
               <div className="w-10 h-10 rounded-full bg-gradient-to-br from-indigo-500 to-purple-600 flex items-center justify-center text-white font-bold flex-shrink-0">
-                {(lead.raw_json?.authorName || "?").charAt(0).toUpperCase()}
+                {(lead.raw_summary?.authorName || "?").charAt(0).toUpperCase()}
               </div>
               <div>
-                <div className="text-xs font-semibold text-white/80">{lead.raw_json?.authorName || "Unknown author"}</div>
-                {lead.raw_json?.authorUrl && <a href={lead.raw_json.authorUrl} target="_blank" rel="noreferrer" className="text-[10px] text-indigo-400 hover:text-indigo-300">View Facebook profile →</a>}
+                <div className="text-xs font-semibold text-white/80">{lead.raw_summary?.authorName || "Unknown author"}</div>
+                {lead.raw_summary?.authorUrl && <a href={lead.raw_summary.authorUrl} target="_blank" rel="noreferrer" className="text-[10px] text-indigo-400 hover:text-indigo-300">View Facebook profile →</a>}
               </div>
             </div>
           )}
@@ -1258,6 +1273,7 @@ export default function Services() {
   const [scraping, setScraping]         = useState(false);
   const [runId, setRunId]               = useState(null);
   const [scrapeStatus, setScrapeStatus] = useState(null);
+  const statusCursor = useRef({ runId: null, cursor: null, etag: null });
   const [isAborting, setIsAborting]     = useState(false);
   const [fSource, setFSource]           = useState("");
   const [fServiceCat, setFServiceCat]   = useState("");
@@ -1426,18 +1442,40 @@ const exportRunLeads = useCallback(async (runId, e) => {
 
   const fetchFbGroupCount = useCallback(async () => { try { const r = await axios.get(`${API}/fb-groups/`, { headers }); setFbGroupCount((r.data.groups || []).length); } catch (_) {} }, [headers]);
 const checkScrapeStatus = useCallback(async () => {
+  // Only ask for log entries after the last cursor, and let the server answer 304 when nothing changed
+  const poll = (c) => axios.get(`${API}/scrape/status/`, {
+    headers:        c.etag ? { ...headers, "If-None-Match": c.etag } : headers,
+    params:         c.cursor != null ? { since: c.cursor } : {},
+    validateStatus: s => (s >= 200 && s < 300) || s === 304,
+  });
   try {
-    const res = await axios.get(`${API}/scrape/status/`, { headers });
-    setScrapeStatus(res.data);
-    if (res.data.status === "RUNNING") {
+    let cur = statusCursor.current;
+    let res = await poll(cur);
+    if (res.status === 304) return;
+    // A cursor from a previous run means nothing for a new one — start over from its tail
+    if (res.data.incremental && res.data.run_id !== cur.runId) {
+      cur = { runId: null, cursor: null, etag: null };
+      res = await poll(cur);
+    }
+    const data = res.data;
+    statusCursor.current = { runId: data.run_id, cursor: data.cursor ?? null, etag: res.headers.etag || null };
+    setScrapeStatus(prev => {
+      const sameRun = data.incremental && prev?.run_id === data.run_id;
+      return {
+        ...data,
+        source_stats: sameRun ? { ...prev.source_stats, ...data.source_stats } : data.source_stats,
+        activity_log: mergeActivityLog(sameRun ? prev.activity_log : [], data.activity_log),
+      };
+    });
+    if (data.status === "RUNNING") {
       setScraping(true);
-      setRunId(res.data.run_id);
+      setRunId(data.run_id);
       // ✅ FIXED: also trigger isAborting from is_stopping (covers limit-hit case)
-      if (res.data.cancel_requested || res.data.is_stopping) setIsAborting(true);
+      if (data.cancel_requested || data.is_stopping) setIsAborting(true);
     } else {
       setScraping(false);
       setIsAborting(false);
-      if (res.data.limit_stop) fetchLeads(1);
+      if (data.limit_stop) fetchLeads(1);
     }
   } catch (e) { console.error(e); }
 }, [headers]);
@@ -1452,6 +1490,55 @@ const checkScrapeStatus = useCallback(async () => {
     setPage(1); fetchLeads(1);
   }, [fSource, fServiceCat, fStatus, fMinScore, fSearchDebounced, fHasPhone, fHasEmail, fFbGroupDebounced, fDateFrom, fDateTo]);
 
+  // Live run updates over the event stream; the status poll below only runs while it's down
+  const streamLive = useRef(false);
+  useEffect(() => {
+    if (!scraping || !runId || scrapeStatus?.run_id !== runId) return;
+    let es = null, retry = null, failures = 0, closed = false;
+
+    const stop = () => { closed = true; streamLive.current = false; clearTimeout(retry); es?.close(); };
+    const fail = () => {
+      streamLive.current = false;
+      // A ticket is only good for a minute, so every reconnect asks for a new one
+      if (closed || ++failures > STREAM_MAX_RETRIES) return;
+      retry = setTimeout(open, 2000 * failures);
+    };
+    const open = async () => {
+      try {
+        const { data } = await axios.post(`${API}/scrape/runs/${runId}/events/ticket/`, null, { headers });
+        if (closed) return;
+        const since = statusCursor.current.cursor;
+        es = new EventSource(
+          `${API}/scrape/runs/${runId}/events/?ticket=${encodeURIComponent(data.ticket)}` +
+          (since != null ? `&since=${since}` : "")
+        );
+      } catch (e) { return fail(); }
+
+      es.onopen  = () => { failures = 0; streamLive.current = true; };
+      es.onerror = () => { es.close(); fail(); };
+      es.addEventListener("log", (e) => {
+        const entry = JSON.parse(e.data);
+        if (entry.seq <= (statusCursor.current.cursor ?? -1)) return;
+        statusCursor.current = { ...statusCursor.current, cursor: entry.seq };
+        setScrapeStatus(prev => prev && { ...prev, activity_log: mergeActivityLog(prev.activity_log, [entry]) });
+      });
+      es.addEventListener("progress", (e) => {
+        const p = JSON.parse(e.data);
+        setScrapeStatus(prev => prev && {
+          ...prev, ...p,
+          source_stats: Object.keys(p.source_stats || {}).length ? p.source_stats : prev.source_stats,
+          is_stopping:  p.status === "RUNNING" && (p.cancel_requested || (p.current_stage || "").toLowerCase().startsWith("stopping")),
+        });
+        if (p.cancel_requested) setIsAborting(true);
+      });
+      // The run finished — one last status poll settles scraping/limit_stop state
+      es.addEventListener("end", () => { stop(); checkScrapeStatus(); });
+    };
+
+    open();
+    return stop;
+  }, [scraping, runId, scrapeStatus?.run_id, headers, checkScrapeStatus]);
+
   useEffect(() => {
     if (!scraping) return;
     checkScrapeStatus();
@@ -1459,7 +1546,7 @@ const checkScrapeStatus = useCallback(async () => {
     let tick = 0;
     const iv = setInterval(() => {
       tick++;
-      checkScrapeStatus();
+      if (!streamLive.current) checkScrapeStatus();
       fetchNewLeadsOnly();
       if (tick % 8 === 0) fetchHistory();
     }, 2000);
@@ -1510,6 +1597,7 @@ const checkScrapeStatus = useCallback(async () => {
     }
 
     setScraping(true); setScrapeStatus(null); setSidebarOpen(false);
+    statusCursor.current = { runId: null, cursor: null, etag: null };
     scrapeStartTs.current = new Date().toISOString();
     newestLeadTs.current = new Date().toISOString();
     setNewLeadsBuffer([]); setPendingNewCount(0);
@@ -1,5 +1,18 @@
 from django.contrib import admin
-from .models import ServiceLead
+from .models import ServiceLead, ScheduledScrape
 
 # Register your models here.
-admin.site.register(ServiceLead)
\ No newline at end of file
+admin.site.register(ServiceLead)
+
+
+@admin.register(ScheduledScrape)
+class ScheduledScrapeAdmin(admin.ModelAdmin):
+    list_display    = ("name", "cron", "enabled", "location_value", "next_run_at", "last_fired_at")
+    list_filter     = ("enabled",)
+    readonly_fields = ("next_run_at", "last_fired_at")
+
+    def save_model(self, request, obj, form, change):
+        # The scheduler recomputes the next fire time from the new cron
+        if "cron" in form.changed_data or "enabled" in form.changed_data:
+            obj.next_run_at = None
+        super().save_model(request, obj, form, change)
\ No newline at end of file
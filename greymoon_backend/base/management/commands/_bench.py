@@ -0,0 +1,70 @@
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.backends import utils as db_utils
+
+
+class QueryCounter:
+    """Counts SQL statements from every thread while active."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def active(self):
+        original_execute     = db_utils.CursorWrapper.execute
+        original_executemany = db_utils.CursorWrapper.executemany
+        counter              = self
+
+        def execute(cursor, sql, params=None):
+            with counter._lock:
+                counter.count += 1
+            return original_execute(cursor, sql, params)
+
+        def executemany(cursor, sql, param_list):
+            with counter._lock:
+                counter.count += 1
+            return original_executemany(cursor, sql, param_list)
+
+        db_utils.CursorWrapper.execute     = execute
+        db_utils.CursorWrapper.executemany = executemany
+        try:
+            yield self
+        finally:
+            db_utils.CursorWrapper.execute     = original_execute
+            db_utils.CursorWrapper.executemany = original_executemany
+
+
+@contextmanager
+def throwaway_database(in_place: bool = False):
+    """
+    Run the block against a freshly migrated test database (a temp file
+    for SQLite, so pipeline threads share it) and drop it afterwards.
+    With in_place=True the configured database is used as is.
+    """
+    if in_place:
+        yield
+        return
+    old_name = connection.settings_dict["NAME"]
+    if connection.vendor == "sqlite":
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = tempfile.mktemp(suffix=".sqlite3")
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextmanager
+def patched(module, **values):
+    original = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(module, name, value)
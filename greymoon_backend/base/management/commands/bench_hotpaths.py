@@ -0,0 +1,216 @@
+import io
+import json
+import os
+import platform
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from base.services.fuzzy_title import make_title_bucket_hash, title_similarity
+from base.services.google_normalizer import normalize_google_serp_page
+from base.services.ingest_pool import (
+    _worker_count, normalize_craigslist_items, normalize_facebook_items, shutdown_pool,
+)
+from base.services.lead_scorer import calculate_lead_score, score_leads
+from base.services.normalizer import (
+    normalize_craigslist, normalize_craigslist_batch, normalize_facebook, normalize_facebook_batch,
+)
+from base.services.synthetic_leads import SyntheticLeadGenerator
+
+from ._bench import QueryCounter, throwaway_database
+
+BENCHES       = ("normalize", "fuzzy", "score", "save")
+SAVE_BATCH    = 500     # items per _save_lead_batch call, as the CL stage sees them
+RESULTS_DIR   = "bench_results"
+
+
+def _timed(fn, repeat: int) -> float:
+    """Best wall time of `repeat` calls, with the hot paths' prints discarded."""
+    best = float("inf")
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _dedup_scores(truth: list, saved: list[bool]) -> dict:
+    """Precision/recall of "skipped as duplicate" against the generator's labels."""
+    tp = fp = fn = tn = 0
+    for label, was_saved in zip(truth, saved):
+        is_dup = label is not None
+        if is_dup and not was_saved:
+            tp += 1
+        elif not is_dup and not was_saved:
+            fp += 1
+        elif is_dup and was_saved:
+            fn += 1
+        else:
+            tn += 1
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall    = tp / (tp + fn) if tp + fn else 1.0
+    f1        = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": round(precision, 4),
+        "recall":    round(recall, 4),
+        "f1":        round(f1, 4),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmarks for the normalize, fuzzy-title, scoring and save "
+        "hot paths on synthetic leads, with dedup precision/recall. Results "
+        "are written as JSON for tracking regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000",
+                            help="Comma-separated item counts, e.g. 1000,10000,100000.")
+        parser.add_argument("--only", default=",".join(BENCHES),
+                            help=f"Comma-separated subset of: {', '.join(BENCHES)}.")
+        parser.add_argument("--dup-rate", type=float, default=0.10)
+        parser.add_argument("--near-dup-rate", type=float, default=0.10)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--process-pool", action="store_true",
+                            help="Also time normalise+hash+score batches on the ingest process pool.")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="Best-of count for the in-memory benches (save runs once).")
+        parser.add_argument("--output", help=f"JSON path; defaults to {RESULTS_DIR}/hotpaths-<timestamp>.json.")
+        parser.add_argument("--in-place", action="store_true", help="Use the configured database for save.")
+
+    def handle(self, *args, **opts):
+        try:
+            sizes = [int(s) for s in opts["sizes"].split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        only = [b for b in opts["only"].split(",") if b]
+        unknown = set(only) - set(BENCHES)
+        if unknown:
+            raise CommandError(f"Unknown bench(es): {sorted(unknown)}. Options: {list(BENCHES)}")
+
+        self.results = []
+        self.dedup   = []
+        repeat       = max(1, opts["repeat"])
+
+        with throwaway_database(opts["in_place"] or "save" not in only):
+            for n in sizes:
+                gen = SyntheticLeadGenerator(
+                    seed=opts["seed"],
+                    dup_rate=opts["dup_rate"],
+                    near_dup_rate=opts["near_dup_rate"],
+                )
+                cl_items, cl_truth = gen.craigslist(n)
+                fb_items, fb_truth = gen.facebook(n)
+                serp_pages         = gen.google_serp(max(1, n // 10))
+
+                cl_norm = normalize_craigslist_batch(cl_items, "plumbing")
+                fb_norm = normalize_facebook_batch(fb_items, "plumbing", "Austin TX")
+
+                if "normalize" in only:
+                    self._record("normalize_craigslist", n, _timed(
+                        lambda: [normalize_craigslist(i, "plumbing") for i in cl_items], repeat))
+                    self._record("normalize_facebook", n, _timed(
+                        lambda: [normalize_facebook(i, "plumbing", "Austin TX") for i in fb_items], repeat))
+                    self._record("normalize_craigslist_batch", n, _timed(
+                        lambda: normalize_craigslist_batch(cl_items, "plumbing"), repeat))
+                    self._record("normalize_facebook_batch", n, _timed(
+                        lambda: normalize_facebook_batch(fb_items, "plumbing", "Austin TX"), repeat))
+                    leads = sum(len(p["organicResults"]) for p in serp_pages)
+                    self._record("normalize_google_serp_page", leads, _timed(
+                        lambda: [normalize_google_serp_page(p, "plumbing", "Austin TX") for p in serp_pages], repeat))
+
+                if "normalize" in only and opts["process_pool"]:
+                    normalize_craigslist_items(cl_items[:1000], "plumbing")   # spawn the workers untimed
+                    self._record("normalize_craigslist_items", n, _timed(
+                        lambda: normalize_craigslist_items(cl_items, "plumbing"), repeat),
+                        workers=_worker_count())
+                    self._record("normalize_facebook_items", n, _timed(
+                        lambda: normalize_facebook_items(fb_items, "plumbing", "Austin TX"), repeat),
+                        workers=_worker_count())
+
+                if "fuzzy" in only:
+                    titles = [i["title"] for i in cl_items]
+                    pairs  = list(zip(titles, titles[1:] + titles[:1]))
+                    self._record("title_similarity", len(pairs), _timed(
+                        lambda: [title_similarity(a, b) for a, b in pairs], repeat))
+                    self._record("make_title_bucket_hash", n, _timed(
+                        lambda: [make_title_bucket_hash(t) for t in titles], repeat))
+
+                if "score" in only:
+                    both = cl_norm + fb_norm
+                    self._record("calculate_lead_score", len(both), _timed(
+                        lambda: [calculate_lead_score(i) for i in both], repeat))
+                    self._record("score_leads", len(both), _timed(
+                        lambda: score_leads(both), repeat))
+
+                if "save" in only:
+                    self._bench_save("craigslist", cl_norm, cl_truth)
+                    self._bench_save("facebook", fb_norm, fb_truth)
+        shutdown_pool()
+
+        report = {
+            "meta": {
+                "timestamp":     datetime.now(timezone.utc).isoformat(),
+                "python":        platform.python_version(),
+                "platform":      platform.platform(),
+                "sizes":         sizes,
+                "seed":          opts["seed"],
+                "dup_rate":      opts["dup_rate"],
+                "near_dup_rate": opts["near_dup_rate"],
+                "repeat":        repeat,
+            },
+            "results": self.results,
+            "dedup":   self.dedup,
+        }
+        path = opts["output"] or os.path.join(
+            RESULTS_DIR, f"hotpaths-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        for r in self.results:
+            extra = f", {r['queries']} queries" if "queries" in r else ""
+            self.stdout.write(
+                f"{r['bench']:<28} n={r['n']:<7} {r['seconds']:>8.3f}s  "
+                f"{r['per_sec']:>12,.0f}/s{extra}"
+            )
+        for d in self.dedup:
+            self.stdout.write(
+                f"dedup {d['source']:<22} n={d['n']:<7} precision {d['precision']:.3f}  "
+                f"recall {d['recall']:.3f}  f1 {d['f1']:.3f}"
+            )
+        self.stdout.write(f"Results written to {path}")
+
+    def _record(self, bench: str, n: int, seconds: float, **extra) -> None:
+        self.results.append({
+            "bench":   bench,
+            "n":       n,
+            "seconds": round(seconds, 4),
+            "per_sec": round(n / seconds, 1) if seconds else None,
+            **extra,
+        })
+
+    def _bench_save(self, source: str, normalized: list, truth: list) -> None:
+        from base.models import ServiceLead
+        from base.services.pipeline import _new_run_stats, _save_lead_batch
+
+        ServiceLead.objects.all().delete()
+        stats   = _new_run_stats()
+        counter = QueryCounter()
+
+        with redirect_stdout(io.StringIO()), counter.active():
+            started = time.perf_counter()
+            for i in range(0, len(normalized), SAVE_BATCH):
+                _save_lead_batch(normalized[i:i + SAVE_BATCH], stats, source_key=source)
+            seconds = time.perf_counter() - started
+
+        saved_ids = set(ServiceLead.objects.values_list("post_id", flat=True))
+        saved     = [item.post_id in saved_ids for item in normalized]
+        self._record(f"save_lead_batch[{source}]", len(normalized), seconds, queries=counter.count)
+        self.dedup.append({"source": source, "n": len(normalized), **_dedup_scores(truth, saved)})
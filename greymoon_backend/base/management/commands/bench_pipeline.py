@@ -0,0 +1,190 @@
+import json
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from base.services import craigslist_service, fb_service, google_search_service
+from base.services.apify_client import ApifyClient, set_client
+from base.services.apify_mock import ARRIVAL_CURVES, MockApifyServer, write_fixture
+from base.services.synthetic_leads import FACEBOOK_ACTOR, SyntheticLeadGenerator
+
+from ._bench import QueryCounter, patched, throwaway_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive full pipeline runs against the local Apify stand-in and report "
+        "wall time, DB queries and peak memory. Runs on a throwaway test "
+        "database unless --in-place is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", help="Directory of recorded actor datasets to replay.")
+        parser.add_argument("--synthetic", type=int, metavar="N",
+                            help="Replay generated datasets of about N items per source instead.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--record", metavar="DIR",
+                            help="Proxy to the real Apify API and write what it returns to DIR as fixtures.")
+        parser.add_argument("--location-type", default="city", choices=["state", "city", "zip"])
+        parser.add_argument("--location", default="Austin")
+        parser.add_argument("--categories", default="", help="Comma-separated; defaults to the first category.")
+        parser.add_argument("--sources", default="craigslist,facebook,google")
+        parser.add_argument("--fb-group", action="append", default=[], dest="fb_groups")
+        parser.add_argument("--max-posts-per-group", type=int, default=50)
+        parser.add_argument("--google-max-pages", type=int, default=3)
+        parser.add_argument("--no-deep-scrape", action="store_true")
+        parser.add_argument("--max-leads", type=int, default=0)
+        parser.add_argument("--runs", type=int, default=1, help="Repeat the run N times.")
+        parser.add_argument("--sequential-sources", action="store_true")
+        parser.add_argument("--process-pool", action="store_true",
+                            help="Normalise, hash and score on the ingest process pool.")
+
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API call.")
+        parser.add_argument("--jitter", type=float, default=0.0)
+        parser.add_argument("--run-seconds", type=float, default=2.0, help="How long each mock actor run lasts.")
+        parser.add_argument("--arrival", default="linear", choices=sorted(ARRIVAL_CURVES))
+        parser.add_argument("--poll-interval", type=float, default=0.25,
+                            help="Overrides the services' POLL_INTERVAL for the bench.")
+        parser.add_argument("--stagger", type=float, default=0.0,
+                            help="Overrides the services' LAUNCH_STAGGER for the bench.")
+        parser.add_argument("--webhooks", action="store_true",
+                            help="Serve the webhook receiver locally and have the mock fire run webhooks.")
+
+        parser.add_argument("--in-place", action="store_true", help="Use the configured database.")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, **opts):
+        if not (opts["fixtures"] or opts["synthetic"] or opts["record"]):
+            raise CommandError("Pass --fixtures DIR or --synthetic N to replay, or --record DIR to capture fixtures.")
+        if opts["record"] and not settings.APIFY_TOKEN:
+            raise CommandError("--record needs APIFY_TOKEN set.")
+
+        fixtures_dir = opts["fixtures"]
+        if opts["synthetic"]:
+            fixtures_dir = tempfile.mkdtemp(prefix="bench-fixtures-")
+            datasets = SyntheticLeadGenerator(seed=opts["seed"]).actor_fixtures(opts["synthetic"])
+            for actor_id, runs in datasets.items():
+                write_fixture(fixtures_dir, actor_id, runs)
+            if not opts["fb_groups"]:
+                opts["fb_groups"] = sorted({
+                    item["inputUrl"] for run in datasets[FACEBOOK_ACTOR] for item in run
+                })
+
+        server = MockApifyServer(
+            fixtures_dir,
+            latency=opts["latency"],
+            jitter=opts["jitter"],
+            run_seconds=opts["run_seconds"],
+            arrival=opts["arrival"],
+            record_dir=opts["record"],
+            token=settings.APIFY_TOKEN,
+        ).start()
+        previous_client = set_client(ApifyClient(token="mock", base_url=server.url))
+
+        receiver = self._start_receiver() if opts["webhooks"] else None
+        results  = []
+        try:
+            with throwaway_database(opts["in_place"]), \
+                 patched(craigslist_service, POLL_INTERVAL=opts["poll_interval"], LAUNCH_STAGGER=opts["stagger"]), \
+                 patched(fb_service, POLL_INTERVAL=opts["poll_interval"], LAUNCH_STAGGER=opts["stagger"]), \
+                 patched(google_search_service, POLL_INTERVAL=opts["poll_interval"]):
+                for n in range(opts["runs"]):
+                    results.append(self._bench_once(n + 1, opts))
+        finally:
+            if receiver:
+                receiver.shutdown()
+                settings.APIFY_WEBHOOK_URL = receiver.previous_url
+            set_client(previous_client)
+            written = server.stop()
+
+        if opts["json"]:
+            self.stdout.write(json.dumps({"runs": results, "recorded": written}, indent=2))
+            return
+        for r in results:
+            self.stdout.write(
+                f"Run {r['run']}: {r['wall_s']:.2f}s wall, {r['queries']} queries, "
+                f"peak {r['peak_alloc_mb']:.1f} MB allocated (max RSS {r['max_rss_mb']:.0f} MB), "
+                f"{r['leads_saved']} saved / {r['leads_skipped']} skipped, "
+                f"{r['apify_calls']} Apify call(s)"
+            )
+        for path in written:
+            self.stdout.write(f"Recorded {path}")
+
+    def _bench_once(self, n: int, opts) -> dict:
+        from base.models import ScrapeRun
+        from base.services.pipeline import run_pipeline
+
+        categories = [c for c in opts["categories"].split(",") if c]
+        if not categories:
+            from base.services.category_map import ALL_CATEGORIES
+            categories = ALL_CATEGORIES[:1]
+        sources = [s for s in opts["sources"].split(",") if s]
+
+        run = ScrapeRun.objects.create(
+            run_id=str(uuid.uuid4()),
+            status="RUNNING",
+            location_type=opts["location_type"],
+            location_value=opts["location"],
+            categories=categories,
+            sources=sources,
+            max_leads=opts["max_leads"],
+        )
+
+        from base.services.apify_client import get_client
+        get_client().metrics.reset()
+        counter = QueryCounter()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with counter.active():
+            stats = run_pipeline(
+                location_type=opts["location_type"],
+                location_value=opts["location"],
+                categories=categories,
+                sources=sources,
+                scrape_run_id=run.pk,
+                max_posts_per_group=opts["max_posts_per_group"],
+                fb_group_urls=opts["fb_groups"],
+                google_max_pages=opts["google_max_pages"],
+                google_deep_scrape=not opts["no_deep_scrape"],
+                max_leads=opts["max_leads"],
+                concurrent_sources=not opts["sequential_sources"],
+                process_pool=opts["process_pool"],
+            ) or {}
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        apify = get_client().metrics.snapshot()
+        return {
+            "run":           n,
+            "wall_s":        round(wall, 3),
+            "queries":       counter.count,
+            "peak_alloc_mb": round(peak / 1_048_576, 2),
+            "max_rss_mb":    round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "leads_saved":   stats.get("leads_saved", 0),
+            "leads_skipped": stats.get("leads_skipped", 0),
+            "errors":        len(stats.get("errors", [])),
+            "apify_calls":   sum(s["calls"] for s in apify.values()),
+            "apify":         apify,
+        }
+
+    def _start_receiver(self):
+        from wsgiref.simple_server import WSGIRequestHandler, make_server
+        from django.core.wsgi import get_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        httpd = make_server("127.0.0.1", 0, get_wsgi_application(), handler_class=QuietHandler)
+        threading.Thread(target=httpd.serve_forever, name="webhook-receiver", daemon=True).start()
+        httpd.previous_url = settings.APIFY_WEBHOOK_URL
+        settings.APIFY_WEBHOOK_URL = f"http://127.0.0.1:{httpd.server_port}/api/apify/webhook/"
+        return httpd
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base.services.lead_entities import KEY_FIELDS, entity_keys, link_lead_entities
+
+CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the canonical phone/email/domain keys on leads written before "
+        "entity resolution existed and cluster them into LeadEntity rows, "
+        "in pk-ordered chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                            help=f"Rows read and updated per transaction (default {CHUNK_SIZE}).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count the unlinked leads without changing them.")
+
+    def handle(self, *args, **opts):
+        from base.models import ServiceLead
+
+        unlinked = ServiceLead.objects.filter(entity__isnull=True)
+        if opts["dry_run"]:
+            self.stdout.write(f"{unlinked.count()} lead(s) not linked to an entity")
+            return
+
+        chunk_size = max(1, opts["chunk_size"])
+        last_pk    = 0
+        linked     = 0
+
+        while True:
+            rows = list(
+                unlinked.filter(pk__gt=last_pk).order_by("pk")
+                .only("pk", "url", "phone", "email", *KEY_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+
+            for row in rows:
+                row.phone_e164, row.email_norm, row.domain = entity_keys(row.phone, row.email, row.url)
+            with transaction.atomic():
+                ServiceLead.objects.bulk_update(rows, list(KEY_FIELDS), batch_size=500)
+                linked += link_lead_entities(
+                    (row.pk, row.phone_e164, row.email_norm, row.domain) for row in rows
+                )
+
+            self.stdout.write(f"  … up to pk {last_pk}: {linked} linked")
+
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} lead(s) to entities"))
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Length
+
+from base.services.normalizer import fast_hash
+from base.services.text_kernel import normalize_title
+
+CHUNK_SIZE    = 2000
+LEGACY_LENGTH = 64      # sha256 hex; fast hashes are 32
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite Craigslist/Facebook content_hash values from the legacy sha256 "
+        "scheme to the fast blake2b one, in pk-ordered chunks. Once it has run, "
+        "CONTENT_HASH_MODE can move from compat to fast."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                            help=f"Rows read and updated per transaction (default {CHUNK_SIZE}).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count the legacy rows without changing them.")
+
+    def handle(self, *args, **opts):
+        from base.models import ServiceLead
+
+        legacy = (
+            ServiceLead.objects
+            .filter(source__in=("CRAIGSLIST", "FACEBOOK"))
+            .annotate(hash_len=Length("content_hash"))
+            .filter(hash_len=LEGACY_LENGTH)
+        )
+        if opts["dry_run"]:
+            self.stdout.write(f"{legacy.count()} lead(s) still on the legacy hash")
+            return
+
+        chunk_size = max(1, opts["chunk_size"])
+        last_pk    = 0
+        rehashed   = kept = 0
+
+        while True:
+            rows = list(
+                legacy.filter(pk__gt=last_pk).order_by("pk")
+                .only("pk", "title", "post", "content_hash")[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+
+            for row in rows:
+                row.content_hash = fast_hash(normalize_title(row.title), (row.post or "")[:300])
+            try:
+                with transaction.atomic():
+                    ServiceLead.objects.bulk_update(rows, ["content_hash"])
+                rehashed += len(rows)
+            except IntegrityError:
+                # A fast hash some other row already holds — update the rest one by one
+                for row in rows:
+                    try:
+                        with transaction.atomic():
+                            ServiceLead.objects.filter(pk=row.pk).update(content_hash=row.content_hash)
+                        rehashed += 1
+                    except IntegrityError:
+                        kept += 1
+
+            self.stdout.write(f"  … up to pk {last_pk}: {rehashed} rehashed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rehashed {rehashed} lead(s)"
+            + (f"; {kept} kept their legacy hash (fast hash already taken)" if kept else "")
+        ))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base.services.lead_scorer import score_leads
+
+CHUNK_SIZE = 2000
+
+# Everything score_leads reads, plus what it writes
+SCORE_INPUTS = (
+    "pk", "source", "title", "post", "phone", "email", "latitude", "longitude",
+    "location", "service_category", "category", "datetime", "map_accuracy",
+    "created_at", "score", "score_reason",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute score and score_reason for every lead with the current "
+        "scoring rules, in pk-ordered chunks. Freshness is judged as of each "
+        "lead's created_at, as it was when the lead was first scored."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                            help=f"Rows read and updated per transaction (default {CHUNK_SIZE}).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count the leads whose score would change without writing.")
+
+    def handle(self, *args, **opts):
+        from base.models import ServiceLead
+
+        chunk_size = max(1, opts["chunk_size"])
+        last_pk    = 0
+        seen       = changed = 0
+
+        while True:
+            rows = list(
+                ServiceLead.objects.filter(pk__gt=last_pk).order_by("pk")
+                .only(*SCORE_INPUTS)[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+            seen   += len(rows)
+
+            scores, reasons = score_leads(rows, scored_at=[row.created_at for row in rows])
+            stale = []
+            for row, score, reason in zip(rows, scores, reasons):
+                if row.score != score or row.score_reason != reason:
+                    row.score, row.score_reason = score, reason
+                    stale.append(row)
+            changed += len(stale)
+
+            if stale and not opts["dry_run"]:
+                with transaction.atomic():
+                    ServiceLead.objects.bulk_update(stale, ["score", "score_reason"], batch_size=500)
+
+            self.stdout.write(f"  … up to pk {last_pk}: {changed} of {seen} changed")
+
+        verb = "would change" if opts["dry_run"] else "rescored"
+        self.stdout.write(self.style.SUCCESS(f"{changed} of {seen} lead(s) {verb}"))
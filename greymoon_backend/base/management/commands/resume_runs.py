@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from base.services.job_queue import resume_run, stalled_runs
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue interrupted runs to continue from their checkpoint: in-flight "
+        "actors are re-attached, datasets read from the last saved offset and "
+        "finished batches skipped. `run_workers` picks the jobs up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("run_ids", nargs="*",
+                            help="ScrapeRun run_id values to resume.")
+        parser.add_argument("--stalled", action="store_true",
+                            help="Resume every RUNNING run that no live job is working on.")
+
+    def handle(self, *args, **opts):
+        from base.models import ScrapeRun
+
+        if opts["stalled"]:
+            runs = list(stalled_runs())
+        elif opts["run_ids"]:
+            runs = list(ScrapeRun.objects.filter(run_id__in=opts["run_ids"]))
+            missing = set(opts["run_ids"]) - {r.run_id for r in runs}
+            if missing:
+                raise CommandError(f"Unknown run(s): {', '.join(sorted(missing))}")
+        else:
+            raise CommandError("Give run ids or --stalled")
+
+        if not runs:
+            self.stdout.write("Nothing to resume")
+            return
+
+        for run in runs:
+            job = resume_run(run.pk)
+            if job is None:
+                self.stdout.write(f"{run.run_id}: not resumable ({run.status.lower()}, cancelled or still live)")
+            else:
+                self.stdout.write(f"{run.run_id}: queued as job {job.pk}")
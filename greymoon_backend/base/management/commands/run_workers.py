@@ -0,0 +1,95 @@
+import os
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from base.services.ingest_pool import shutdown_pool
+from base.services.job_queue import claim_job, mark_worker_process, run_job, worker_name
+from base.services.scheduler import run_scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued pipeline jobs. Each process runs up to --concurrency jobs "
+        "at once; start more processes (on any node sharing the database) to "
+        "scale out. SIGINT/SIGTERM stops claiming and drains running jobs; a "
+        "second signal exits at once and leaves their leases to expire. "
+        "Each process also fires due ScheduledScrape specs unless --no-scheduler. "
+        "Once workers are deployed, set PIPELINE_IN_PROCESS_WORKER=0 so web "
+        "processes stop running the jobs they queue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int,
+                            default=getattr(settings, "PIPELINE_WORKER_CONCURRENCY", 2))
+        parser.add_argument("--poll", type=float, default=2.0,
+                            help="Seconds between queue checks when idle.")
+        parser.add_argument("--lease", type=int,
+                            default=getattr(settings, "PIPELINE_JOB_LEASE", 60),
+                            help="Lease length in seconds; renewed every third of it.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once the queue is empty instead of waiting for more jobs.")
+        parser.add_argument("--no-scheduler", action="store_true",
+                            help="Don't fire scheduled scrapes from this process.")
+
+    def handle(self, *args, **opts):
+        concurrency = max(1, opts["concurrency"])
+        self.stop   = threading.Event()
+        mark_worker_process()
+
+        def _on_signal(signum, frame):
+            if self.stop.is_set():
+                self.stdout.write("Second signal — exiting without draining.")
+                os._exit(1)
+            self.stdout.write("Stopping — no new jobs will be claimed; draining running ones…")
+            self.stop.set()
+
+        signal.signal(signal.SIGINT, _on_signal)
+        signal.signal(signal.SIGTERM, _on_signal)
+
+        slots = [
+            threading.Thread(
+                target=self._slot,
+                args=(i, opts["poll"], opts["lease"], opts["once"]),
+                name=f"pipeline-worker-{i}",
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        if not (opts["no_scheduler"] or opts["once"]):
+            threading.Thread(
+                target=run_scheduler, args=(self.stop,),
+                name="pipeline-scheduler", daemon=True,
+            ).start()
+
+        self.stdout.write(f"Pipeline worker {worker_name()} started with {concurrency} slot(s)")
+        for t in slots:
+            t.start()
+        # join() with a timeout so the main thread keeps handling signals
+        while any(t.is_alive() for t in slots):
+            for t in slots:
+                t.join(timeout=0.5)
+        shutdown_pool()
+        self.stdout.write("Pipeline worker stopped")
+
+    def _slot(self, slot: int, poll: float, lease: int, once: bool):
+        name = worker_name(slot)
+        try:
+            while not self.stop.is_set():
+                try:
+                    job = claim_job(name, lease)
+                except Exception as e:
+                    self.stderr.write(f"[{name}] Could not claim a job: {e}")
+                    job = None
+
+                if job is None:
+                    if once:
+                        return
+                    self.stop.wait(poll)
+                    continue
+                run_job(job, lease)
+        finally:
+            connection.close()
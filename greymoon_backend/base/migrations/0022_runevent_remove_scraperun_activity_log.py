@@ -0,0 +1,67 @@
+# Generated by Django 6.0.3 on 2026-10-18 14:35
+
+import django.db.models.deletion
+from datetime import datetime, timezone
+from django.db import migrations, models
+
+
+def copy_activity_logs(apps, schema_editor):
+    ScrapeRun = apps.get_model("base", "ScrapeRun")
+    RunEvent  = apps.get_model("base", "RunEvent")
+
+    for run in ScrapeRun.objects.exclude(activity_log=[]).iterator(chunk_size=200):
+        events   = []
+        last_seq = 0
+        for entry in run.activity_log or []:
+            try:
+                ts = datetime.fromisoformat(str(entry.get("ts")).replace("Z", "+00:00"))
+            except (TypeError, ValueError):
+                ts = run.created_at or datetime.now(timezone.utc)
+            seq      = max(last_seq + 1, int(ts.timestamp() * 1_000_000))
+            last_seq = seq
+            extra    = {
+                k: v for k, v in entry.items()
+                if k not in ("ts", "stage", "detail", "level")
+            }
+            events.append(RunEvent(
+                run_id=run.pk,
+                seq=seq,
+                ts=ts,
+                stage=(entry.get("stage") or "")[:200],
+                detail=entry.get("detail") or "",
+                level=entry.get("level") or "info",
+                extra=extra or None,
+            ))
+        RunEvent.objects.bulk_create(events, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0021_servicelead_title_ngram_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.BigIntegerField()),
+                ('ts', models.DateTimeField()),
+                ('stage', models.CharField(blank=True, max_length=200)),
+                ('detail', models.TextField(blank=True)),
+                ('level', models.CharField(default='info', max_length=20)),
+                ('extra', models.JSONField(blank=True, null=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='base.scraperun')),
+            ],
+            options={
+                'ordering': ['run', 'seq'],
+                'indexes': [models.Index(fields=['run', 'seq'], name='base_runeve_run_id_a05489_idx')],
+            },
+        ),
+        migrations.RunPython(copy_activity_logs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='scraperun',
+            name='activity_log',
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.3 on 2026-10-18 14:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0022_runevent_remove_scraperun_activity_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], default='QUEUED', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('max_attempts', models.IntegerField(default=2)),
+                ('worker_id', models.CharField(blank=True, max_length=200)),
+                ('lease_token', models.CharField(blank=True, max_length=32)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='base.scraperun')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='base_pipeli_status_5da997_idx'), models.Index(fields=['status', 'lease_expires_at'], name='base_pipeli_status_a7621d_idx')],
+            },
+        ),
+    ]
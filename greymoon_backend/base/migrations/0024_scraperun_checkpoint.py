@@ -0,0 +1,18 @@
+# Generated by Django 6.0.3 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0023_pipelinejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperun',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
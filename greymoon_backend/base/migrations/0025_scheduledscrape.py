@@ -0,0 +1,45 @@
+# Generated by Django 6.0.3 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0024_scraperun_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledScrape',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('cron', models.CharField(max_length=100)),
+                ('enabled', models.BooleanField(default=True)),
+                ('location_type', models.CharField(blank=True, max_length=20)),
+                ('location_value', models.CharField(blank=True, max_length=100)),
+                ('categories', models.JSONField(blank=True, default=list)),
+                ('sources', models.JSONField(blank=True, default=list)),
+                ('fb_group_urls', models.JSONField(blank=True, default=list)),
+                ('max_posts_per_group', models.IntegerField(default=50)),
+                ('google_max_pages', models.IntegerField(default=3)),
+                ('google_deep_scrape', models.BooleanField(default=True)),
+                ('max_leads', models.IntegerField(default=0)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_fired_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['enabled', 'next_run_at'], name='base_schedu_enabled_44dc3b_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='scraperun',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='base.scheduledscrape'),
+        ),
+    ]
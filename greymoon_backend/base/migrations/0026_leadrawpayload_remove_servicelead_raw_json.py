@@ -0,0 +1,87 @@
+# Generated by Django 6.0.3 on 2026-10-18 16:40
+
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CHUNK_SIZE   = 500
+SUMMARY_KEYS = (
+    "authorName", "author", "authorUrl",
+    "groupName", "group", "groupUrl",
+    "likesCount", "commentsCount", "sharesCount",
+)
+
+
+def move_raw_json(apps, schema_editor):
+    ServiceLead    = apps.get_model("base", "ServiceLead")
+    LeadRawPayload = apps.get_model("base", "LeadRawPayload")
+
+    last_pk = 0
+    while True:
+        chunk = list(
+            ServiceLead.objects.filter(pk__gt=last_pk, raw_json__isnull=False)
+            .order_by("pk").values_list("pk", "raw_json")[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1][0]
+
+        payloads, summaries = [], []
+        for pk, raw in chunk:
+            data = json.dumps(raw, separators=(",", ":"), default=str).encode()
+            payloads.append(LeadRawPayload(lead_id=pk, data=zlib.compress(data, 6), size=len(data)))
+            if isinstance(raw, dict):
+                summary = {k: raw[k] for k in SUMMARY_KEYS if raw.get(k) not in (None, "")}
+                if summary:
+                    summaries.append(ServiceLead(pk=pk, raw_summary=summary))
+        LeadRawPayload.objects.bulk_create(payloads, ignore_conflicts=True)
+        ServiceLead.objects.bulk_update(summaries, ["raw_summary"])
+
+
+def restore_raw_json(apps, schema_editor):
+    ServiceLead    = apps.get_model("base", "ServiceLead")
+    LeadRawPayload = apps.get_model("base", "LeadRawPayload")
+
+    last_pk = 0
+    while True:
+        chunk = list(
+            LeadRawPayload.objects.filter(pk__gt=last_pk)
+            .order_by("pk").values_list("pk", "data")[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1][0]
+        ServiceLead.objects.bulk_update(
+            [ServiceLead(pk=pk, raw_json=json.loads(zlib.decompress(bytes(data)))) for pk, data in chunk],
+            ["raw_json"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0025_scheduledscrape'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadRawPayload',
+            fields=[
+                ('lead', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='raw_payload', serialize=False, to='base.servicelead')),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='servicelead',
+            name='raw_summary',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(move_raw_json, restore_raw_json),
+        migrations.RemoveField(
+            model_name='servicelead',
+            name='raw_json',
+        ),
+    ]
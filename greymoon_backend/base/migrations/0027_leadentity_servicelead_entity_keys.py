@@ -0,0 +1,57 @@
+# Generated by Django 6.0.3 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0026_leadrawpayload_remove_servicelead_raw_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadEntity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_e164', models.CharField(blank=True, default='', max_length=16)),
+                ('email_norm', models.CharField(blank=True, default='', max_length=254)),
+                ('domain', models.CharField(blank=True, default='', max_length=253)),
+                ('lead_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='servicelead',
+            name='domain',
+            field=models.CharField(blank=True, default='', max_length=253),
+        ),
+        migrations.AddField(
+            model_name='servicelead',
+            name='email_norm',
+            field=models.CharField(blank=True, default='', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='servicelead',
+            name='phone_e164',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='servicelead',
+            name='entity',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leads', to='base.leadentity'),
+        ),
+        migrations.AddIndex(
+            model_name='servicelead',
+            index=models.Index(fields=['phone_e164'], name='base_servic_phone_e_530406_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicelead',
+            index=models.Index(fields=['email_norm'], name='base_servic_email_n_063616_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicelead',
+            index=models.Index(fields=['domain'], name='base_servic_domain_ee5ae6_idx'),
+        ),
+    ]
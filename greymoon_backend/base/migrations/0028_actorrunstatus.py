@@ -0,0 +1,21 @@
+# Generated by Django 6.0.3 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0027_leadentity_servicelead_entity_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActorRunStatus',
+            fields=[
+                ('apify_run_id', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('status', models.CharField(max_length=20)),
+                ('received_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
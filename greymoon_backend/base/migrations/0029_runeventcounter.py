@@ -0,0 +1,21 @@
+# Generated by Django 6.0.3 on 2026-10-18 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0028_actorrunstatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunEventCounter',
+            fields=[
+                ('run', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='event_counter', serialize=False, to='base.scraperun')),
+                ('last_seq', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
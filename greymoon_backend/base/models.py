@@ -1,6 +1,24 @@
 from django.db import models
 
 
+class LeadEntity(models.Model):
+    """
+    One business seen across sources — the leads that share a canonical
+    phone, email or domain, clustered by base.services.lead_entities.
+    The key fields hold the first value seen for each, for display.
+    """
+
+    phone_e164 = models.CharField(max_length=16, blank=True, default="")
+    email_norm = models.CharField(max_length=254, blank=True, default="")
+    domain = models.CharField(max_length=253, blank=True, default="")
+
+    lead_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Entity {self.pk} ({self.lead_count} leads) {self.domain or self.phone_e164 or self.email_norm}"
+
+
 class ServiceLead(models.Model):
 
     STATUS_CHOICES = [
@@ -40,6 +58,15 @@ class ServiceLead(models.Model):
     email = models.CharField(max_length=255, null=True, blank=True)
     zip_code = models.CharField(max_length=20, null=True, blank=True)
 
+    # Canonical contact keys for cross-source entity resolution
+    phone_e164 = models.CharField(max_length=16, blank=True, default="")
+    email_norm = models.CharField(max_length=254, blank=True, default="")
+    domain = models.CharField(max_length=253, blank=True, default="")
+    entity = models.ForeignKey(
+        LeadEntity, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="leads",
+    )
+
     fb_group_name = models.CharField(max_length=500, null=True, blank=True)
     fb_group_url = models.URLField(max_length=1000, null=True, blank=True)
 
@@ -48,7 +75,8 @@ class ServiceLead(models.Model):
     score = models.IntegerField(default=0)
     score_reason = models.JSONField(null=True, blank=True)
 
-    raw_json = models.JSONField(null=True, blank=True)
+    # Card fields from the source item; the full item is in LeadRawPayload
+    raw_summary = models.JSONField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -65,6 +93,9 @@ class ServiceLead(models.Model):
             models.Index(fields=["score"]),
             models.Index(fields=["fb_group_name"]),
             models.Index(fields=["title"]),
+            models.Index(fields=["phone_e164"]),
+            models.Index(fields=["email_norm"]),
+            models.Index(fields=["domain"]),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -75,6 +106,29 @@ class ServiceLead(models.Model):
         ]
 
 
+class LeadRawPayload(models.Model):
+    """
+    The source item a lead was built from, as zlib-compressed JSON. Kept
+    out of the ServiceLead row so list pages, table scans and backups of
+    the lead table never carry it; only the lead detail endpoint reads it.
+    """
+
+    lead = models.OneToOneField(
+        ServiceLead, on_delete=models.CASCADE,
+        primary_key=True, related_name="raw_payload",
+    )
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)   # uncompressed bytes
+
+    def __str__(self):
+        return f"raw payload of lead {self.lead_id} ({self.size} bytes)"
+
+    @property
+    def payload(self):
+        from .services.raw_payloads import decompress_payload
+        return decompress_payload(self.data)
+
+
 class ScrapeRun(models.Model):
 
     STATUS_CHOICES = [
@@ -87,7 +141,6 @@ class ScrapeRun(models.Model):
 
     current_stage = models.CharField(max_length=200, null=True, blank=True)
     stage_detail = models.TextField(null=True, blank=True)
-    activity_log = models.JSONField(default=list, blank=True)
 
     run_id = models.CharField(max_length=100)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="RUNNING")
@@ -113,6 +166,15 @@ class ScrapeRun(models.Model):
 
     cancel_requested = models.BooleanField(default=False)
 
+    # Resume state — batches done, actor runs in flight, dataset offsets saved
+    checkpoint = models.JSONField(default=dict, blank=True)
+
+    # Set when the scheduler fired this run
+    schedule = models.ForeignKey(
+        "ScheduledScrape", null=True, blank=True,
+        on_delete=models.SET_NULL, related_name="runs",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     finished_at = models.DateTimeField(null=True, blank=True)
 
@@ -122,6 +184,153 @@ class ScrapeRun(models.Model):
     class Meta:
         ordering = ["-created_at"]
 
+
+class ScheduledScrape(models.Model):
+    """
+    A saved scrape spec fired by the worker's scheduler on a cron schedule
+    (UTC). Each run only asks the actors for postings newer than the
+    spec's last successful run.
+    """
+
+    name    = models.CharField(max_length=200)
+    cron    = models.CharField(max_length=100)   # "minute hour day month weekday" or @daily etc.
+    enabled = models.BooleanField(default=True)
+
+    location_type       = models.CharField(max_length=20, blank=True)
+    location_value      = models.CharField(max_length=100, blank=True)
+    categories          = models.JSONField(default=list, blank=True)
+    sources             = models.JSONField(default=list, blank=True)
+    fb_group_urls       = models.JSONField(default=list, blank=True)
+    max_posts_per_group = models.IntegerField(default=50)
+    google_max_pages    = models.IntegerField(default=3)
+    google_deep_scrape  = models.BooleanField(default=True)
+    max_leads           = models.IntegerField(default=0)   # 0 = no limit
+
+    next_run_at   = models.DateTimeField(null=True, blank=True)   # null = scheduler computes it
+    last_fired_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} | {self.cron} | {'on' if self.enabled else 'off'}"
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        from .services.scheduler import parse_cron
+        try:
+            parse_cron(self.cron)
+        except ValueError as e:
+            raise ValidationError({"cron": str(e)})
+
+    class Meta:
+        ordering = ["name"]
+        indexes = [
+            models.Index(fields=["enabled", "next_run_at"]),
+        ]
+
+
+class PipelineJob(models.Model):
+
+    STATUS_CHOICES = [
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+        ("CANCELLED", "Cancelled"),
+    ]
+
+    run          = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name="jobs")
+    kwargs       = models.JSONField(default=dict, blank=True)   # run_pipeline arguments
+    status       = models.CharField(max_length=20, choices=STATUS_CHOICES, default="QUEUED")
+    attempts     = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=2)
+
+    worker_id        = models.CharField(max_length=200, blank=True)
+    lease_token      = models.CharField(max_length=32, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    error            = models.TextField(blank=True)
+
+    created_at  = models.DateTimeField(auto_now_add=True)
+    started_at  = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"job {self.pk} | run {self.run_id} | {self.status}"
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["status", "lease_expires_at"]),
+        ]
+
+
+class ActorRunStatus(models.Model):
+    """
+    Terminal status of an Apify actor run as delivered by its webhook.
+    The webhook lands in a web process; actor wait loops run in worker
+    processes, so this row is how they learn about it.
+    """
+
+    apify_run_id = models.CharField(max_length=64, primary_key=True)
+    status       = models.CharField(max_length=20)
+    received_at  = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.apify_run_id} → {self.status}"
+
+
+class RunEvent(models.Model):
+
+    run    = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name="events")
+    seq    = models.BigIntegerField()
+    ts     = models.DateTimeField()
+    stage  = models.CharField(max_length=200, blank=True)
+    detail = models.TextField(blank=True)
+    level  = models.CharField(max_length=20, default="info")
+    extra  = models.JSONField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.run_id}#{self.seq} [{self.level}] {self.stage}"
+
+    def as_log_entry(self) -> dict:
+        entry = {
+            "seq":    self.seq,
+            "ts":     self.ts.isoformat(),
+            "stage":  self.stage,
+            "detail": self.detail,
+            "level":  self.level,
+        }
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+    class Meta:
+        ordering = ["run", "seq"]
+        indexes = [
+            models.Index(fields=["run", "seq"]),
+        ]
+
+
+class RunEventCounter(models.Model):
+    """
+    The last RunEvent seq handed out for a run. Seqs are allocated from
+    this row in the same transaction that inserts the events, so writers
+    commit in seq order and a `seq > cursor` read never skips an event
+    that lands later.
+    """
+
+    run      = models.OneToOneField(
+        ScrapeRun, on_delete=models.CASCADE,
+        primary_key=True, related_name="event_counter",
+    )
+    last_seq = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"run {self.run_id} events up to #{self.last_seq}"
+
+
 class ScrapedFbGroup(models.Model):
 
     group_url   = models.URLField(max_length=1000, unique=True, db_index=True)
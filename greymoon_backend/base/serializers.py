@@ -1,13 +1,28 @@
 from rest_framework import serializers
 from .models import ServiceLead, ScrapeRun
+from .services.raw_payloads import load_raw_payload
 
 
 class ServiceLeadSerializer(serializers.ModelSerializer):
+    # Leads in this lead's entity — only set when list_services collapses by entity
+    entity_size = serializers.SerializerMethodField()
+
+    def get_entity_size(self, obj):
+        return getattr(obj, "entity_size", None)
+
     class Meta:
         model = ServiceLead
         fields = "__all__"
 
 
+class ServiceLeadDetailSerializer(ServiceLeadSerializer):
+    # Full source item — one LeadRawPayload read, so only on the detail view
+    raw_json = serializers.SerializerMethodField()
+
+    def get_raw_json(self, obj):
+        return load_raw_payload(obj.pk)
+
+
 class ScrapeRunSerializer(serializers.ModelSerializer):
     class Meta:
         model = ScrapeRun
@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .cancellation import is_cancelled
+
+DEFAULT_CONCURRENCY    = 3
+IDLE_WAIT              = 0.5    # seconds — how often a quiet executor re-checks cancel
+QUEUE_PAGES_PER_WORKER = 2      # unsaved result chunks buffered per worker before it blocks
+
+_DONE   = object()
+_FAILED = object()
+
+
+class BatchIncomplete(Exception):
+    """
+    Raised by a worker whose batch ended without all of its results —
+    launch failed, the actor failed or was aborted, or the run was
+    cancelled. Whatever it emitted is still saved, but the batch is not
+    reported as done, so a resume runs it again.
+    """
+
+
+def concurrency_for(source: str) -> int:
+    """In-flight actor runs for a source: per-source setting, else the global one."""
+    per_source = getattr(settings, "APIFY_SOURCE_CONCURRENCY", {}) or {}
+    n = per_source.get(source) or getattr(settings, "APIFY_MAX_CONCURRENT_RUNS", DEFAULT_CONCURRENCY)
+    return max(1, int(n))
+
+
+def summed_progress(callback):
+    """
+    Per-batch progress callbacks that report the total across all batches
+    in flight, so concurrent runs don't overwrite each other's count.
+    """
+    counts: dict = {}
+    lock = threading.Lock()
+
+    def for_batch(b_idx):
+        if callback is None:
+            return None
+
+        def report(count: int):
+            with lock:
+                counts[b_idx] = count
+                total = sum(counts.values())
+            callback(total)
+        return report
+    return for_batch
+
+
+class ActorBatchExecutor:
+    """
+    Keeps up to `concurrency` actor batches in flight and streams their
+    results back to the caller's thread as they arrive.
+
+    `worker(b_idx, batch, emit)` runs one batch (launch, wait, fetch) on a
+    pool thread and calls emit(items) for every chunk of results — once at
+    the end, or several times if it streams. run() yields (b_idx, items)
+    in arrival order, so all saving still happens on the caller's thread.
+    `on_done(b_idx)`, if given, is called on that same thread once a
+    batch's worker has returned and everything it emitted has been
+    consumed — the point where a checkpoint can record it as finished.
+    It is not called for a batch whose worker raised (BatchIncomplete or
+    any other error) or that returned after the run was cancelled.
+
+    No new batch is launched once the run is cancelled; batches already in
+    flight see the same token, abort their actor and emit what they have.
+    If the consumer stops early (LimitReached), batches not yet started are
+    dropped, and a worker blocked on the full results queue stops with
+    BatchIncomplete.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        concurrency: int = None,
+        scrape_run_id=None,
+        stagger: float = 0.0,
+        log=None,
+        label: str = None,
+    ):
+        self.source        = source
+        self.concurrency   = max(1, concurrency or concurrency_for(source))
+        self.scrape_run_id = scrape_run_id
+        self.stagger       = stagger
+        self.log           = log or print
+        self.label         = label or source.title()
+
+    @staticmethod
+    def _put(results: queue.Queue, closed: threading.Event, entry) -> bool:
+        """Block while the queue is full; False once the consumer has gone."""
+        while not closed.is_set():
+            try:
+                results.put(entry, timeout=IDLE_WAIT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _task(self, b_idx, batch, worker, results: queue.Queue, closed: threading.Event):
+        from django.db import connection
+
+        def emit(items):
+            if not self._put(results, closed, (b_idx, items)):
+                raise BatchIncomplete("consumer stopped")
+
+        outcome = _FAILED
+        try:
+            worker(b_idx, batch, emit)
+            if not is_cancelled(self.scrape_run_id):
+                outcome = _DONE
+        except BatchIncomplete as e:
+            self.log(f"[{self.label}] Batch {b_idx + 1} not finished: {e}")
+        except Exception as e:
+            self.log(f"[{self.label}] Batch {b_idx + 1} failed: {e}")
+        finally:
+            self._put(results, closed, (b_idx, outcome))
+            connection.close()
+
+    def run(self, batches, worker, on_done=None):
+        batches  = list(batches)
+        # Bounded, so a worker that fetches faster than the caller saves
+        # blocks instead of piling pages up in memory
+        results: queue.Queue = queue.Queue(maxsize=QUEUE_PAGES_PER_WORKER * self.concurrency)
+        closed   = threading.Event()
+        pool     = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix=f"actors-{self.source}",
+        )
+        next_idx       = 0
+        in_flight      = 0
+        next_launch_at = 0.0
+
+        if len(batches) > 1:
+            self.log(
+                f"[{self.label}] {len(batches)} batch(es), "
+                f"up to {min(self.concurrency, len(batches))} actor run(s) in flight"
+            )
+
+        try:
+            while True:
+                # ── Top up the in-flight set ──────────────────
+                while (
+                    next_idx < len(batches)
+                    and in_flight < self.concurrency
+                    and time.monotonic() >= next_launch_at
+                    and not is_cancelled(self.scrape_run_id)
+                ):
+                    pool.submit(self._task, next_idx, batches[next_idx], worker, results, closed)
+                    next_idx      += 1
+                    in_flight     += 1
+                    next_launch_at = time.monotonic() + self.stagger
+
+                if in_flight == 0:
+                    if next_idx < len(batches) and is_cancelled(self.scrape_run_id):
+                        self.log(
+                            f"[{self.label}] Cancel requested — "
+                            f"{len(batches) - next_idx} batch(es) not started"
+                        )
+                    if next_idx >= len(batches) or is_cancelled(self.scrape_run_id):
+                        return
+
+                # ── Wait for the next result (or the next launch slot) ──
+                can_launch = next_idx < len(batches) and in_flight < self.concurrency
+                timeout    = max(0.0, next_launch_at - time.monotonic()) if can_launch else IDLE_WAIT
+                try:
+                    b_idx, items = results.get(timeout=timeout or IDLE_WAIT)
+                except queue.Empty:
+                    continue
+
+                if items is _DONE or items is _FAILED:
+                    in_flight -= 1
+                    if items is _DONE and on_done is not None:
+                        on_done(b_idx)
+                    continue
+                yield b_idx, items
+        finally:
+            # Blocked workers give up their put and stop
+            closed.set()
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+from .apify_client import get_client
+from .cancellation import is_cancelled, wait_cancelled, wait_event_or_cancel
+
+WEBHOOK_EVENTS = (
+    "ACTOR.RUN.SUCCEEDED",
+    "ACTOR.RUN.FAILED",
+    "ACTOR.RUN.ABORTED",
+    "ACTOR.RUN.TIMED_OUT",
+)
+EVENT_STATUS = {
+    "ACTOR.RUN.SUCCEEDED": "SUCCEEDED",
+    "ACTOR.RUN.FAILED":    "FAILED",
+    "ACTOR.RUN.ABORTED":   "ABORTED",
+    "ACTOR.RUN.TIMED_OUT": "TIMED-OUT",
+}
+FALLBACK_POLL_INTERVAL = 30     # seconds — Apify status polls while a webhook is pending
+MAX_TRACKED_RUNS       = 1000
+STATUS_RETENTION_HOURS = 24     # delivered statuses kept in ActorRunStatus
+
+
+class _ActorRun:
+    __slots__ = ("event", "status")
+
+    def __init__(self):
+        self.event  = threading.Event()
+        self.status = None
+
+
+class ActorRunRegistry:
+    """
+    Terminal statuses delivered by Apify webhooks, keyed by Apify run id,
+    with an Event per run that the service wait loops sleep on. A webhook
+    can land before its waiter has looked, so entries are created on either
+    side and the oldest are dropped past MAX_TRACKED_RUNS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: OrderedDict = OrderedDict()
+
+    def _entry(self, run_id: str) -> _ActorRun:
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None:
+                entry = self._runs[run_id] = _ActorRun()
+                while len(self._runs) > MAX_TRACKED_RUNS:
+                    self._runs.popitem(last=False)
+            return entry
+
+    def event(self, run_id: str) -> threading.Event:
+        return self._entry(run_id).event
+
+    def status(self, run_id: str) -> str | None:
+        with self._lock:
+            entry = self._runs.get(run_id)
+        return entry.status if entry else None
+
+    def notify(self, run_id: str, status: str) -> None:
+        entry = self._entry(run_id)
+        entry.status = status
+        entry.event.set()
+
+
+actor_runs = ActorRunRegistry()
+
+
+def webhooks_enabled() -> bool:
+    """
+    Webhooks need both a URL and a secret: the receiver is public, and the
+    statuses it records end actor waits, so it only accepts signed calls.
+    """
+    return bool(
+        getattr(settings, "APIFY_WEBHOOK_URL", "")
+        and getattr(settings, "APIFY_WEBHOOK_SECRET", "")
+    )
+
+
+def launch_webhooks() -> list[dict] | None:
+    """Ad-hoc webhook definition to attach to an actor launch, or None."""
+    if not webhooks_enabled():
+        return None
+    url  = settings.APIFY_WEBHOOK_URL
+    url += ("&" if "?" in url else "?") + urlencode({"secret": settings.APIFY_WEBHOOK_SECRET})
+    return [{"eventTypes": list(WEBHOOK_EVENTS), "requestUrl": url}]
+
+
+def status_from_webhook(body: dict) -> tuple[str | None, str | None]:
+    """(Apify run id, run status) from a webhook's default payload."""
+    resource = body.get("resource") or {}
+    run_id   = (body.get("eventData") or {}).get("actorRunId") or resource.get("id")
+    status   = resource.get("status") or EVENT_STATUS.get(body.get("eventType"))
+    return run_id, status
+
+
+def record_webhook_status(run_id: str, status: str) -> None:
+    """
+    Store a webhook's terminal status where every process can read it,
+    then wake any waiter in this one. Called by the webhook view.
+    """
+    from base.models import ActorRunStatus
+    from django.utils import timezone
+    from datetime import timedelta
+
+    try:
+        ActorRunStatus.objects.update_or_create(apify_run_id=run_id, defaults={"status": status})
+        ActorRunStatus.objects.filter(
+            received_at__lt=timezone.now() - timedelta(hours=STATUS_RETENTION_HOURS)
+        ).delete()
+    except Exception as e:
+        print(f"[Apify webhook] Could not store status for run {run_id}: {e}")
+    actor_runs.notify(run_id, status)
+
+
+def delivered_status(run_id: str) -> str | None:
+    """A webhook status for the run — this process's registry, else the shared row."""
+    status = actor_runs.status(run_id)
+    if status:
+        return status
+    from base.models import ActorRunStatus
+    try:
+        status = (
+            ActorRunStatus.objects.filter(apify_run_id=run_id)
+            .values_list("status", flat=True).first()
+        )
+    except Exception as e:
+        print(f"[Apify webhook] Could not read status for run {run_id}: {e}")
+        return None
+    if status:
+        actor_runs.notify(run_id, status)
+    return status
+
+
+def run_status(run_id: str) -> str:
+    """Status delivered by webhook if there is one, else a GET to Apify."""
+    delivered = delivered_status(run_id) if webhooks_enabled() else None
+    return delivered or get_client().run_status(run_id)
+
+
+def wait_for_actor(scrape_run_id, run_id: str, interval: float) -> bool:
+    """
+    Sleep between status polls of an actor run. Returns True if the run
+    was cancelled.
+
+    With webhooks on, this waits up to the fallback interval so Apify is
+    polled less often. The webhook usually lands in a different process
+    (the web server, not the run_workers process running this loop), so
+    the wait is cut into `interval` slices and the shared ActorRunStatus
+    row is checked after each — a delivered status is seen within one
+    short poll either way, and at once when it lands in this process.
+    """
+    if not webhooks_enabled():
+        return wait_cancelled(scrape_run_id, interval)
+    if delivered_status(run_id):
+        return is_cancelled(scrape_run_id)
+
+    timeout  = getattr(settings, "APIFY_WEBHOOK_FALLBACK_POLL", FALLBACK_POLL_INTERVAL)
+    deadline = time.monotonic() + max(interval, timeout)
+    event    = actor_runs.event(run_id)
+    while True:
+        slice_ = min(interval, deadline - time.monotonic())
+        if slice_ <= 0:
+            return False
+        if wait_event_or_cancel(scrape_run_id, event, slice_):
+            return True
+        if event.is_set() or delivered_status(run_id):
+            return False
@@ -0,0 +1,318 @@
+import base64
+import json as jsonlib
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+API_BASE        = "https://api.apify.com/v2"
+CONNECT_TIMEOUT = 5      # seconds
+READ_TIMEOUT    = 30     # seconds — dataset downloads pass a longer one
+MAX_RETRIES     = 4
+BACKOFF_BASE    = 0.5    # seconds, doubled per attempt
+BACKOFF_CAP     = 8.0
+POOL_SIZE       = 32
+PAGE_SIZE       = 500    # items per dataset request
+
+RETRY_STATUSES  = {429, 500, 502, 503, 504}
+
+
+class ApifyError(Exception):
+    pass
+
+
+def encode_webhooks(webhooks: list[dict]) -> str:
+    """Ad-hoc webhooks as Apify's `webhooks` query param: base64 of a JSON array."""
+    return base64.b64encode(jsonlib.dumps(webhooks).encode()).decode()
+
+
+def decode_webhooks(param: str) -> list[dict]:
+    return jsonlib.loads(base64.b64decode(param))
+
+
+class ApifyMetrics:
+    """Per-endpoint call counts, retries, errors and latency for ApifyClient."""
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._stats: dict = {}
+
+    def record(self, label: str, elapsed: float, retries: int, ok: bool) -> None:
+        with self._lock:
+            s = self._stats.setdefault(label, {
+                "calls": 0, "errors": 0, "retries": 0,
+                "total_ms": 0.0, "max_ms": 0.0,
+            })
+            ms = elapsed * 1000
+            s["calls"]    += 1
+            s["retries"]  += retries
+            s["total_ms"] += ms
+            s["max_ms"]    = max(s["max_ms"], ms)
+            if not ok:
+                s["errors"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                label: {
+                    **s,
+                    "avg_ms":   round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0,
+                    "total_ms": round(s["total_ms"], 1),
+                    "max_ms":   round(s["max_ms"], 1),
+                }
+                for label, s in self._stats.items()
+            }
+
+    def summary(self) -> str:
+        snap = self.snapshot()
+        if not snap:
+            return "no calls"
+        return ", ".join(
+            f"{label}: {s['calls']} call(s) avg {s['avg_ms']:.0f}ms"
+            + (f", {s['retries']} retr{'y' if s['retries'] == 1 else 'ies'}" if s["retries"] else "")
+            + (f", {s['errors']} error(s)" if s["errors"] else "")
+            for label, s in sorted(snap.items())
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class ApifyClient:
+    """
+    Thin Apify REST client shared by the scraper services.
+
+    One keep-alive requests.Session with a connection pool sized for the
+    pollers, (connect, read) timeouts on every call, and retries with
+    jittered exponential backoff on 429/5xx and connection errors —
+    Retry-After is honoured on 429. Launches (POST to /runs) are only
+    retried when the request provably never reached Apify, so an actor is
+    never started twice.
+    """
+
+    def __init__(
+        self,
+        token: str = None,
+        base_url: str = API_BASE,
+        max_retries: int = MAX_RETRIES,
+        pool_size: int = POOL_SIZE,
+    ):
+        self.base_url    = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.metrics     = ApifyMetrics()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization":   f"Bearer {token if token is not None else settings.APIFY_TOKEN}",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    # ── Transport ─────────────────────────────────────────────
+    def _backoff(self, attempt: int, resp=None) -> float:
+        if resp is not None and resp.status_code == 429:
+            try:
+                return min(float(resp.headers["Retry-After"]), BACKOFF_CAP * 4)
+            except (KeyError, TypeError, ValueError):
+                pass
+        ceiling = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        label: str,
+        params: dict = None,
+        json: dict = None,
+        read_timeout: float = READ_TIMEOUT,
+        idempotent: bool = True,
+    ) -> requests.Response:
+        url      = path if path.startswith("http") else f"{self.base_url}{path}"
+        started  = time.monotonic()
+        retries  = 0
+        ok       = False
+        try:
+            while True:
+                resp = None
+                try:
+                    resp = self.session.request(
+                        method, url, params=params, json=json,
+                        timeout=(CONNECT_TIMEOUT, read_timeout),
+                    )
+                    retryable = resp.status_code == 429 or (
+                        idempotent and resp.status_code in RETRY_STATUSES
+                    )
+                    if not retryable:
+                        resp.raise_for_status()
+                        ok = True
+                        return resp
+                    error = ApifyError(f"{method} {path} → HTTP {resp.status_code}")
+                except requests.HTTPError as e:
+                    raise ApifyError(f"{method} {path} → {e}") from e
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    never_sent = isinstance(e, requests.ConnectTimeout)
+                    if not (idempotent or never_sent):
+                        raise ApifyError(f"{method} {path} → {e}") from e
+                    error = e
+
+                if retries >= self.max_retries:
+                    if isinstance(error, ApifyError):
+                        raise error
+                    raise ApifyError(f"{method} {path} → {error}") from error
+                time.sleep(self._backoff(retries, resp))
+                retries += 1
+        finally:
+            self.metrics.record(label, time.monotonic() - started, retries, ok)
+
+    # ── Actors ────────────────────────────────────────────────
+    def launch_actor(
+        self,
+        actor_id: str,
+        payload: dict,
+        webhooks: list[dict] = None,
+    ) -> tuple[str, str]:
+        """Start an actor run; returns (run_id, default dataset id)."""
+        params = {"webhooks": encode_webhooks(webhooks)} if webhooks else None
+        resp = self.request(
+            "POST", f"/acts/{actor_id}/runs",
+            label="launch", params=params, json=payload, idempotent=False,
+        )
+        data = resp.json()["data"]
+        return data["id"], data["defaultDatasetId"]
+
+    def run_status(self, run_id: str) -> str:
+        resp = self.request("GET", f"/actor-runs/{run_id}", label="run_status", read_timeout=15)
+        return resp.json()["data"]["status"]
+
+    def abort_run(self, run_id: str) -> bool:
+        try:
+            self.request(
+                "POST", f"/actor-runs/{run_id}/abort",
+                label="abort", read_timeout=10,
+            )
+            return True
+        except Exception as e:
+            print(f"[Apify] Could not abort run {run_id}: {e}")
+            return False
+
+    def list_runs(self, status: str, limit: int = 100) -> list[dict]:
+        resp = self.request(
+            "GET", "/actor-runs",
+            label="list_runs", params={"status": status, "limit": limit}, read_timeout=15,
+        )
+        return resp.json().get("data", {}).get("items", [])
+
+    # ── Datasets ──────────────────────────────────────────────
+    def dataset_count(self, dataset_id: str) -> int:
+        """Current item count from dataset metadata — 0 if it can't be read."""
+        try:
+            resp = self.request(
+                "GET", f"/datasets/{dataset_id}",
+                label="dataset_count", read_timeout=10,
+            )
+            return resp.json().get("data", {}).get("itemCount", 0)
+        except Exception:
+            return 0
+
+    def dataset_items(
+        self,
+        dataset_id: str,
+        limit: int = None,
+        offset: int = 0,
+        clean: bool = False,
+        fields=None,
+        omit=None,
+    ) -> list:
+        """One page of items. `fields`/`omit` project server-side."""
+        params = {}
+        if clean:
+            params["clean"] = "true"
+        if limit is not None:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        if fields:
+            params["fields"] = ",".join(fields)
+        if omit:
+            params["omit"] = ",".join(omit)
+        resp = self.request(
+            "GET", f"/datasets/{dataset_id}/items",
+            label="dataset_items", params=params, read_timeout=120,
+        )
+        return resp.json()
+
+    def iter_dataset_pages(
+        self,
+        dataset_id: str,
+        offset: int = 0,
+        page_size: int = PAGE_SIZE,
+        end_offset: int = None,
+        clean: bool = False,
+        **projection,
+    ):
+        """
+        Page through a dataset of any size from `offset`, stopping at raw
+        item `end_offset` if given (an absolute position, not a count — a
+        resumed read keeps the same end). Yields (next_offset, items) per
+        page; next_offset counts raw items, so a caller that stores it
+        after handling a page can resume there. Only one page is held in
+        memory at a time.
+
+        clean=True is applied here rather than sent to Apify: a server-side
+        clean drops empty items from the page, so its length no longer
+        says how far the read got or whether the dataset has ended.
+        """
+        while end_offset is None or offset < end_offset:
+            limit = page_size if end_offset is None else min(page_size, end_offset - offset)
+            items = self.dataset_items(dataset_id, limit=limit, offset=offset, **projection)
+            if not items:
+                return
+            offset += len(items)
+            yield offset, clean_items(items) if clean else items
+            if len(items) < limit:
+                return
+
+    def iter_dataset(self, dataset_id: str, **kwargs):
+        """Items one at a time — see iter_dataset_pages() for the arguments."""
+        for _, items in self.iter_dataset_pages(dataset_id, **kwargs):
+            yield from items
+
+
+def clean_items(items: list) -> list:
+    """Apify's clean=true, locally: drop hidden (#-prefixed) fields, then empty items."""
+    out = []
+    for item in items:
+        if isinstance(item, dict):
+            item = {k: v for k, v in item.items() if not k.startswith("#")}
+        if item:
+            out.append(item)
+    return out
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ApifyClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ApifyClient()
+    return _client
+
+
+def set_client(client: ApifyClient | None) -> ApifyClient | None:
+    """Swap the shared client (e.g. for one pointed at a local stand-in); returns the old one."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
@@ -0,0 +1,382 @@
+"""
+apify_mock.py
+─────────────
+A local stand-in for the parts of the Apify REST API the scraper services
+use, so whole pipeline runs can be driven offline:
+
+    POST /v2/acts/{actor}/runs          launch (ad-hoc webhooks honoured)
+    GET  /v2/actor-runs/{id}            status
+    POST /v2/actor-runs/{id}/abort      abort
+    GET  /v2/actor-runs?status=         listing
+    GET  /v2/datasets/{id}              itemCount
+    GET  /v2/datasets/{id}/items        offset/limit/fields/omit/clean
+
+Replay
+  Each launched run replays a recorded dataset from the fixtures directory
+  — one `<actor id>.json` per actor, holding {"actor_id", "runs": [[items],
+  …]}; successive launches cycle through "runs". A run lasts `run_seconds`
+  and its items become visible along an arrival curve, so streaming reads
+  and progress counts behave as they do against real actors.
+
+Record
+  With record_dir set the server proxies every call to the real API
+  instead, and on stop() writes the datasets it saw, per actor and in
+  launch order, as fixtures in the same format.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from .apify_client import API_BASE, decode_webhooks
+
+ARRIVAL_CURVES = {
+    "linear": lambda x: x,
+    "early":  lambda x: x ** 0.5,       # most items in the first part of the run
+    "late":   lambda x: x ** 2,         # most items near the end
+    "end":    lambda x: 1.0 if x >= 1 else 0.0,
+}
+TERMINAL_EVENTS = {
+    "SUCCEEDED": "ACTOR.RUN.SUCCEEDED",
+    "ABORTED":   "ACTOR.RUN.ABORTED",
+}
+
+_ROUTES = [
+    ("POST", re.compile(r"^/v2/acts/([^/]+)/runs$"),          "launch"),
+    ("GET",  re.compile(r"^/v2/actor-runs/([^/]+)$"),         "run_status"),
+    ("POST", re.compile(r"^/v2/actor-runs/([^/]+)/abort$"),   "abort"),
+    ("GET",  re.compile(r"^/v2/actor-runs$"),                 "list_runs"),
+    ("GET",  re.compile(r"^/v2/datasets/([^/]+)$"),           "dataset"),
+    ("GET",  re.compile(r"^/v2/datasets/([^/]+)/items$"),     "dataset_items"),
+]
+
+
+def fixture_path(fixtures_dir: str, actor_id: str) -> str:
+    return os.path.join(fixtures_dir, f"{actor_id.replace('/', '~')}.json")
+
+
+def load_fixtures(fixtures_dir: str) -> dict:
+    """{actor_id: [[items], …]} from every fixture file in the directory."""
+    fixtures = {}
+    if not fixtures_dir or not os.path.isdir(fixtures_dir):
+        return fixtures
+    for name in sorted(os.listdir(fixtures_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(fixtures_dir, name)) as f:
+            data = json.load(f)
+        actor_id = data.get("actor_id") or name[:-5]
+        fixtures[actor_id] = [list(run) for run in data.get("runs", [])]
+    return fixtures
+
+
+def write_fixture(fixtures_dir: str, actor_id: str, runs: list[list]) -> str:
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = fixture_path(fixtures_dir, actor_id)
+    with open(path, "w") as f:
+        json.dump({"actor_id": actor_id, "runs": runs}, f)
+    return path
+
+
+def _project(items: list, fields=None, omit=None, clean=False) -> list:
+    out = []
+    for item in items:
+        if not isinstance(item, dict):
+            out.append(item)
+            continue
+        if fields:
+            item = {k: item[k] for k in fields if k in item}
+        if omit:
+            item = {k: v for k, v in item.items() if k not in omit}
+        if clean:
+            # skipHidden + skipEmpty — a cleaned page can be shorter than limit
+            item = {k: v for k, v in item.items() if not k.startswith("#")}
+            if not item:
+                continue
+        out.append(item)
+    return out
+
+
+class _MockRun:
+    def __init__(self, actor_id: str, items: list, duration: float, webhooks: list):
+        self.id         = uuid.uuid4().hex[:17]
+        self.dataset_id = uuid.uuid4().hex[:17]
+        self.actor_id   = actor_id
+        self.items      = items
+        self.duration   = duration
+        self.webhooks   = webhooks
+        self.started    = time.monotonic()
+        self.aborted_at = None
+        self.fired      = False
+
+    def _progress(self) -> float:
+        end = self.aborted_at if self.aborted_at is not None else time.monotonic()
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, (end - self.started) / self.duration)
+
+    def status(self) -> str:
+        if self.aborted_at is not None:
+            return "ABORTED"
+        return "SUCCEEDED" if self._progress() >= 1.0 else "RUNNING"
+
+    def visible(self, curve) -> int:
+        return int(round(len(self.items) * curve(self._progress())))
+
+
+class MockApifyServer:
+    """
+    Threaded local Apify stand-in. Use as a context manager, or start() /
+    stop(); point an ApifyClient at `.url`.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: str = None,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        run_seconds: float = 2.0,
+        arrival: str = "linear",
+        record_dir: str = None,
+        upstream: str = API_BASE,
+        token: str = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if arrival not in ARRIVAL_CURVES:
+            raise ValueError(f"Unknown arrival curve '{arrival}'. Options: {sorted(ARRIVAL_CURVES)}")
+
+        self.fixtures     = load_fixtures(fixtures_dir)
+        self.latency      = latency
+        self.jitter       = jitter
+        self.run_seconds  = run_seconds
+        self.curve        = ARRIVAL_CURVES[arrival]
+        self.record_dir   = record_dir
+        self.upstream     = upstream.rstrip("/")
+        self.token        = token
+        self.host         = host
+        self.port         = port
+
+        self._lock        = threading.Lock()
+        self._runs: dict  = {}
+        self._datasets: dict = {}
+        self._launches: dict = {}   # actor_id → number of runs launched
+
+        # Record mode: dataset id → actor id, and items seen by offset
+        self._recorded_datasets: list = []
+        self._recorded_items: dict = {}
+        self._session = requests.Session() if record_dir else None
+
+        self._server  = None
+        self._thread  = None
+
+    # ── Lifecycle ─────────────────────────────────────────────
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v2"
+
+    def start(self) -> "MockApifyServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port    = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="apify-mock", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> list[str]:
+        """Shut down; in record mode, returns the fixture files written."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        return self._write_recording() if self.record_dir else []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── Replay ────────────────────────────────────────────────
+    def launch(self, actor_id: str, webhooks: list) -> _MockRun:
+        with self._lock:
+            recorded = self.fixtures.get(actor_id) or [[]]
+            n        = self._launches.get(actor_id, 0)
+            self._launches[actor_id] = n + 1
+            run = _MockRun(actor_id, recorded[n % len(recorded)], self.run_seconds, webhooks)
+            self._runs[run.id] = run
+            self._datasets[run.dataset_id] = run
+        if webhooks:
+            timer = threading.Timer(run.duration, self._fire_webhooks, args=(run,))
+            timer.daemon = True
+            timer.start()
+        return run
+
+    def abort(self, run: _MockRun) -> None:
+        with self._lock:
+            if run.status() == "RUNNING":
+                run.aborted_at = time.monotonic()
+        self._fire_webhooks(run)
+
+    def _fire_webhooks(self, run: _MockRun) -> None:
+        status = run.status()
+        event  = TERMINAL_EVENTS.get(status)
+        with self._lock:
+            if run.fired or event is None:
+                return
+            run.fired = True
+        body = {
+            "eventType": event,
+            "eventData": {"actorId": run.actor_id, "actorRunId": run.id},
+            "resource":  {"id": run.id, "status": status, "defaultDatasetId": run.dataset_id},
+        }
+        for hook in run.webhooks:
+            if event not in hook.get("eventTypes", []):
+                continue
+            try:
+                requests.post(hook["requestUrl"], json=body, timeout=5)
+            except Exception as e:
+                print(f"[Apify mock] Webhook to {hook['requestUrl']} failed: {e}")
+
+    def _replay(self, method: str, route: str, arg: str, query: dict, body: bytes):
+        if route == "launch":
+            hooks = decode_webhooks(query["webhooks"][0]) if "webhooks" in query else []
+            run   = self.launch(arg.replace("/", "~"), hooks)
+            return 201, {"data": {"id": run.id, "defaultDatasetId": run.dataset_id, "status": "RUNNING"}}
+
+        if route == "list_runs":
+            wanted = (query.get("status") or [None])[0]
+            with self._lock:
+                runs = list(self._runs.values())
+            items = [
+                {"id": r.id, "actId": r.actor_id, "status": r.status(), "defaultDatasetId": r.dataset_id}
+                for r in runs if wanted is None or r.status() == wanted
+            ]
+            return 200, {"data": {"items": items, "count": len(items), "total": len(items)}}
+
+        if route in ("run_status", "abort"):
+            run = self._runs.get(arg)
+            if run is None:
+                return 404, {"error": {"type": "record-not-found"}}
+            if route == "abort":
+                self.abort(run)
+            return 200, {"data": {"id": run.id, "status": run.status(), "defaultDatasetId": run.dataset_id}}
+
+        run = self._datasets.get(arg)
+        if run is None:
+            return 404, {"error": {"type": "record-not-found"}}
+        visible = run.visible(self.curve)
+        if route == "dataset":
+            return 200, {"data": {"id": arg, "itemCount": visible}}
+
+        offset = int((query.get("offset") or [0])[0])
+        limit  = int((query.get("limit") or [visible])[0])
+        items  = run.items[offset:min(visible, offset + limit)]
+        fields = (query.get("fields") or [""])[0].split(",") if "fields" in query else None
+        omit   = (query.get("omit") or [""])[0].split(",") if "omit" in query else None
+        clean  = (query.get("clean") or ["false"])[0] in ("true", "1")
+        return 200, _project(items, fields, omit, clean)
+
+    # ── Record ────────────────────────────────────────────────
+    def _record(self, method: str, route: str, arg: str, query: dict, body: bytes):
+        projection = {k: query.pop(k)[0].split(",") for k in ("fields", "omit") if k in query}
+        resp = self._session.request(
+            method,
+            self.upstream + self._path_for(route, arg),
+            params={k: v[0] for k, v in query.items()},
+            data=body or None,
+            headers={
+                "Authorization": f"Bearer {self.token}",
+                "Content-Type":  "application/json",
+            },
+            timeout=(5, 120),
+        )
+        try:
+            payload = resp.json()
+        except ValueError:
+            return resp.status_code, {"error": resp.text[:500]}
+
+        if resp.ok and route == "launch":
+            with self._lock:
+                self._recorded_datasets.append((arg.replace("/", "~"), payload["data"]["defaultDatasetId"]))
+        elif resp.ok and route == "dataset_items":
+            offset = int((query.get("offset") or [0])[0])
+            with self._lock:
+                seen = self._recorded_items.setdefault(arg, {})
+                for i, item in enumerate(payload):
+                    seen[offset + i] = item
+            payload = _project(payload, projection.get("fields"), projection.get("omit"))
+        return resp.status_code, payload
+
+    @staticmethod
+    def _path_for(route: str, arg: str) -> str:
+        return {
+            "launch":        f"/acts/{arg}/runs",
+            "run_status":    f"/actor-runs/{arg}",
+            "abort":         f"/actor-runs/{arg}/abort",
+            "list_runs":     "/actor-runs",
+            "dataset":       f"/datasets/{arg}",
+            "dataset_items": f"/datasets/{arg}/items",
+        }[route]
+
+    def _write_recording(self) -> list[str]:
+        by_actor: dict = {}
+        with self._lock:
+            for actor_id, dataset_id in self._recorded_datasets:
+                seen = self._recorded_items.get(dataset_id, {})
+                by_actor.setdefault(actor_id, []).append([seen[i] for i in sorted(seen)])
+        return [write_fixture(self.record_dir, actor_id, runs) for actor_id, runs in by_actor.items()]
+
+    # ── HTTP ──────────────────────────────────────────────────
+    def dispatch(self, method: str, raw_path: str, body: bytes):
+        parsed = urlparse(raw_path)
+        query  = parse_qs(parsed.query)
+        for route_method, pattern, route in _ROUTES:
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                arg = match.group(1) if match.groups() else None
+                if self.latency or self.jitter:
+                    time.sleep(self.latency + random.uniform(0, self.jitter))
+                handler = self._record if self.record_dir else self._replay
+                return handler(method, route, arg, query, body)
+        return 404, {"error": {"type": "page-not-found", "message": f"{method} {parsed.path}"}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body   = self.rfile.read(length) if length else b""
+                try:
+                    status, payload = server.dispatch(method, self.path, body)
+                except Exception as e:
+                    status, payload = 500, {"error": {"type": "mock-error", "message": str(e)}}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        return Handler
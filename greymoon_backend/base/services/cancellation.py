@@ -0,0 +1,208 @@
+import threading
+import time
+
+WATCH_INTERVAL = 3.0    # seconds between DB checks for cancels from other processes
+
+LEASE_LOST = "lease_lost"   # token reason when another worker took the run's job over
+
+
+class CancellationToken:
+    """
+    Cancel flag for one ScrapeRun, backed by a threading.Event so pollers
+    can sleep on it and wake the moment the run is cancelled.
+    """
+
+    def __init__(self, scrape_run_id):
+        self.scrape_run_id = scrape_run_id
+        self.reason        = None
+        self._event        = threading.Event()
+        self._linked: set  = set()
+        self._lock         = threading.Lock()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Set the token. Returns False if it was already set."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            linked = list(self._linked)
+        for event in linked:
+            event.set()
+        return True
+
+    def link(self, event: threading.Event) -> None:
+        """Also set `event` on cancel, so a waiter on another event wakes too."""
+        with self._lock:
+            self._linked.add(event)
+            if self._event.is_set():
+                event.set()
+
+    def unlink(self, event: threading.Event) -> None:
+        with self._lock:
+            self._linked.discard(event)
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds; True as soon as the run is cancelled."""
+        return self._event.wait(timeout)
+
+
+_registry: dict = {}
+_registry_lock = threading.Lock()
+_watcher = None
+
+
+def get_token(scrape_run_id) -> CancellationToken | None:
+    if not scrape_run_id:
+        return None
+    with _registry_lock:
+        token = _registry.get(scrape_run_id)
+        if token is None:
+            token = _registry[scrape_run_id] = CancellationToken(scrape_run_id)
+            _ensure_watcher()
+        return token
+
+
+def release_token(scrape_run_id) -> None:
+    with _registry_lock:
+        _registry.pop(scrape_run_id, None)
+
+
+def _cancel_persisted(scrape_run_id) -> bool:
+    # Only for runs with no live token in this process, e.g. a background
+    # crawl thread that outlives run_pipeline
+    try:
+        from base.models import ScrapeRun
+        return ScrapeRun.objects.filter(pk=scrape_run_id, cancel_requested=True).exists()
+    except Exception:
+        return False
+
+
+def is_cancelled(scrape_run_id) -> bool:
+    if not scrape_run_id:
+        return False
+    with _registry_lock:
+        token = _registry.get(scrape_run_id)
+    if token is None:
+        return _cancel_persisted(scrape_run_id)
+    return token.is_cancelled()
+
+
+def wait_cancelled(scrape_run_id, timeout: float) -> bool:
+    """Interruptible sleep — returns True early if the run gets cancelled."""
+    with _registry_lock:
+        token = _registry.get(scrape_run_id) if scrape_run_id else None
+    if token is None:
+        time.sleep(timeout)
+        return is_cancelled(scrape_run_id)
+    return token.wait(timeout)
+
+
+def wait_event_or_cancel(scrape_run_id, event: threading.Event, timeout: float) -> bool:
+    """
+    Sleep until `event` is set, the run is cancelled or `timeout` passes.
+    Returns True if the run was cancelled.
+    """
+    with _registry_lock:
+        token = _registry.get(scrape_run_id) if scrape_run_id else None
+    if token is None:
+        event.wait(timeout)
+        return is_cancelled(scrape_run_id)
+    token.link(event)
+    try:
+        event.wait(timeout)
+    finally:
+        token.unlink(event)
+    return token.is_cancelled()
+
+
+def cancel_run(scrape_run_id, reason: str = "cancelled") -> None:
+    """
+    Cancel a run: wake everything in this process waiting on its token and
+    persist cancel_requested so other processes (and the UI) see it too.
+    """
+    if not scrape_run_id:
+        return
+    with _registry_lock:
+        token = _registry.get(scrape_run_id)
+    if token is not None and not token.cancel(reason):
+        return
+    try:
+        from base.models import ScrapeRun
+        ScrapeRun.objects.filter(pk=scrape_run_id).update(cancel_requested=True)
+    except Exception as e:
+        print(f"[Cancel] Could not persist cancel for run {scrape_run_id}: {e}")
+
+
+def detach_run(scrape_run_id) -> bool:
+    """
+    Stop this process's work on a run without cancelling the run — for a
+    worker whose job lease was taken over by another worker. Nothing is
+    persisted, and actors are left running for the new owner to re-attach
+    to. Returns False if the run isn't running here.
+    """
+    with _registry_lock:
+        token = _registry.get(scrape_run_id) if scrape_run_id else None
+    return token is not None and token.cancel(LEASE_LOST)
+
+
+def is_detached(scrape_run_id) -> bool:
+    """True once detach_run() has stopped this process's work on the run."""
+    with _registry_lock:
+        token = _registry.get(scrape_run_id) if scrape_run_id else None
+    return token is not None and token.is_cancelled() and token.reason == LEASE_LOST
+
+
+def abort_actor(scrape_run_id, apify_run_id) -> None:
+    """Abort an actor run on cancel — unless the run was detached, so it has a new owner."""
+    if is_detached(scrape_run_id):
+        return
+    from .apify_client import get_client
+    get_client().abort_run(apify_run_id)
+
+
+# ── Cross-process watcher ─────────────────────────────────────
+def _ensure_watcher():
+    # Caller holds _registry_lock
+    global _watcher
+    if _watcher is None or not _watcher.is_alive():
+        _watcher = threading.Thread(target=_watch, name="cancel-watcher", daemon=True)
+        _watcher.start()
+
+
+def _watch():
+    """
+    One query every WATCH_INTERVAL for all live tokens in this process,
+    picking up cancels written by another process. Exits once no tokens
+    are left; the next get_token() starts it again.
+    """
+    global _watcher
+    from django.db import connection
+
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            with _registry_lock:
+                pending = {
+                    pk: token for pk, token in _registry.items()
+                    if not token.is_cancelled()
+                }
+                if not _registry:
+                    _watcher = None
+                    return
+            if not pending:
+                continue
+            try:
+                from base.models import ScrapeRun
+                cancelled = ScrapeRun.objects.filter(
+                    pk__in=list(pending), cancel_requested=True,
+                ).values_list("pk", flat=True)
+                for pk in cancelled:
+                    pending[pk].cancel("cancelled")
+            except Exception as e:
+                print(f"[Cancel] Watcher could not check runs: {e}")
+    finally:
+        connection.close()
@@ -1,12 +1,14 @@
-import time
-import requests
-from django.conf import settings
+from .actor_executor import ActorBatchExecutor, BatchIncomplete, summed_progress
+from .actor_webhooks import launch_webhooks, run_status, wait_for_actor
+from .apify_client import get_client
+from .cancellation import abort_actor, is_cancelled, wait_cancelled
+from .run_checkpoint import get_checkpoint
 
 ACTOR_ID                 = "ivanvs~craigslist-scraper"
 POLL_INTERVAL            = 5
-COOLDOWN_BETWEEN_RUNS    = 10
-COOLDOWN_POLL_INTERVAL   = 1
+LAUNCH_STAGGER           = 10   # seconds between actor launches
 MAX_CITIES_PER_RUN       = 3
+DEFAULT_MAX_AGE          = 15   # days of postings the actor returns
 
 
 def chunk_list(lst, size):
@@ -14,21 +16,6 @@ def chunk_list(lst, size):
         yield lst[i:i + size]
 
 
-def _apify_headers():
-    return {"Authorization": f"Bearer {settings.APIFY_TOKEN}"}
-
-
-def _abort_apify_run(run_id: str):
-    try:
-        requests.post(
-            f"https://api.apify.com/v2/actor-runs/{run_id}/abort",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-    except Exception as e:
-        print(f"[Craigslist] Could not abort run {run_id}: {e}")
-
-
 def _register_apify_run(scrape_run_id: int | None, apify_run_id: str):
     if not scrape_run_id:
         return
@@ -44,30 +31,11 @@ def _register_apify_run(scrape_run_id: int | None, apify_run_id: str):
         print(f"[Craigslist] Could not register Apify run ID: {e}")
 
 
-def _is_cancel_requested(scrape_run_id: int | None) -> bool:
-    if not scrape_run_id:
-        return False
-    try:
-        from base.models import ScrapeRun
-        return ScrapeRun.objects.filter(pk=scrape_run_id, cancel_requested=True).exists()
-    except Exception:
-        return False
-
-
-def _fetch_dataset_count(dataset_id: str) -> int:
-    try:
-        resp = requests.get(
-            f"https://api.apify.com/v2/datasets/{dataset_id}",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-        resp.raise_for_status()
-        return resp.json().get("data", {}).get("itemCount", 0)
-    except Exception:
-        return 0
-
-
-def build_craigslist_payload(cities: list[str], category_codes: list[str]) -> dict:
+def build_craigslist_payload(
+    cities: list[str],
+    category_codes: list[str],
+    max_age: int = DEFAULT_MAX_AGE,
+) -> dict:
     urls = [
         {"url": f"https://{city}.craigslist.org/search/{code}"}
         for city in cities
@@ -75,7 +43,7 @@ def build_craigslist_payload(cities: list[str], category_codes: list[str]) -> di
     ]
     return {
         "urls": urls,
-        "maxAge": 15,
+        "maxAge": max_age,
         "maxConcurrency": 1,
         "proxyConfiguration": {
             "useApifyProxy": True,
@@ -89,21 +57,17 @@ def _launch_and_guard(
     cities: list[str],
     category_codes: list[str],
     scrape_run_id: int | None,
+    max_age: int = DEFAULT_MAX_AGE,
 ) -> tuple[str, str] | None:
-    resp = requests.post(
-        f"https://api.apify.com/v2/acts/{ACTOR_ID}/runs",
-        json=build_craigslist_payload(cities, category_codes),
-        headers=_apify_headers(),
+    run_id, dataset_id = get_client().launch_actor(
+        ACTOR_ID, build_craigslist_payload(cities, category_codes, max_age),
+        webhooks=launch_webhooks(),
     )
-    resp.raise_for_status()
-    data       = resp.json()["data"]
-    run_id     = data["id"]
-    dataset_id = data["defaultDatasetId"]
 
     _register_apify_run(scrape_run_id, run_id)
 
-    if _is_cancel_requested(scrape_run_id):
-        _abort_apify_run(run_id)
+    if is_cancelled(scrape_run_id):
+        abort_actor(scrape_run_id, run_id)
         return None
 
     return run_id, dataset_id
@@ -113,47 +77,40 @@ def wait_for_run(
     run_id, dataset_id=None, source_label="Craigslist",
     scrape_run_id=None, log_fn=None, progress_callback=None,
 ):
-    import time, requests
-    from django.conf import settings
- 
     log = log_fn or print
-    url = f"https://api.apify.com/v2/actor-runs/{run_id}"
+    client = get_client()
     poll_count = 0
     cl_poll_errors = 0
  
     while True:
         # ── Cancel / limit check ──────────────────────────────
-        if _is_cancel_requested(scrape_run_id):
-            _abort_apify_run(run_id)
+        if is_cancelled(scrape_run_id):
+            abort_actor(scrape_run_id, run_id)
             raise Exception(f"[{source_label}] Cancelled by user")
  
         try:
-            res = requests.get(url, headers=_apify_headers(), timeout=15)
-            res.raise_for_status()
-            status = res.json()["data"]["status"]
+            status = run_status(run_id)
             cl_poll_errors = 0
         except Exception as e:
             cl_poll_errors += 1
             log(f"[{source_label}] Status check error ({cl_poll_errors}/5): {e}")
             if cl_poll_errors >= 5:
                 raise Exception(f"[{source_label}] Max poll errors reached — aborting")
-            for _ in range(POLL_INTERVAL):
-                if _is_cancel_requested(scrape_run_id):
-                    _abort_apify_run(run_id)
-                    raise Exception(f"[{source_label}] Cancelled by user")
-                time.sleep(1)
+            if wait_cancelled(scrape_run_id, POLL_INTERVAL):
+                abort_actor(scrape_run_id, run_id)
+                raise Exception(f"[{source_label}] Cancelled by user")
             continue
 
         poll_count += 1
  
         if dataset_id and poll_count % 2 == 0:
-            count = _fetch_dataset_count(dataset_id)
+            count = client.dataset_count(dataset_id)
             if progress_callback and count > 0:
                 progress_callback(count)
  
             # ── FIX: re-check cancel immediately after callback ──
-            if _is_cancel_requested(scrape_run_id):
-                _abort_apify_run(run_id)
+            if is_cancelled(scrape_run_id):
+                abort_actor(scrape_run_id, run_id)
                 raise Exception(f"[{source_label}] Cancelled by user")
  
             log(f"[{source_label}] Status: {status} | ~{count} item(s) in Apify dataset so far")
@@ -166,38 +123,17 @@ def wait_for_run(
         if status in ["FAILED", "ABORTED", "TIMED-OUT"]:
             raise Exception(f"[{source_label}] Actor run {run_id} ended with: {status}")
  
-        # Interruptible sleep
-        for _ in range(POLL_INTERVAL):
-            if _is_cancel_requested(scrape_run_id):
-                _abort_apify_run(run_id)
-                raise Exception(f"[{source_label}] Cancelled by user")
-            time.sleep(1)
-
-def fetch_dataset(dataset_id: str, limit: int = 1000) -> list[dict]:
-    url = (
-        f"https://api.apify.com/v2/datasets/{dataset_id}"
-        f"/items?clean=true&limit={limit}"
-    )
-    resp = requests.get(url, headers=_apify_headers())
-    resp.raise_for_status()
-    return resp.json()
-
+        # Interruptible sleep — cut short by the run's webhook
+        if wait_for_actor(scrape_run_id, run_id, POLL_INTERVAL):
+            abort_actor(scrape_run_id, run_id)
+            raise Exception(f"[{source_label}] Cancelled by user")
 
-def _interruptible_cooldown(
-    seconds: int,
-    scrape_run_id: int | None,
-    log_fn=None,
-) -> bool:
-    log     = log_fn or print
-    elapsed = 0
-    while elapsed < seconds:
-        if _is_cancel_requested(scrape_run_id):
-            log("[Craigslist] Cancel requested — cooldown interrupted")
-            return False
-        chunk   = min(COOLDOWN_POLL_INTERVAL, seconds - elapsed)
-        time.sleep(chunk)
-        elapsed += chunk
-    return True
+def fetch_dataset_pages(dataset_id: str, offset: int = 0):
+    """
+    The dataset from `offset` on, one page at a time — no size cap.
+    Yields (next_offset, items) so the caller can checkpoint each page.
+    """
+    yield from get_client().iter_dataset_pages(dataset_id, offset=offset, clean=True)
 
 
 def scrape_craigslist_progressive(
@@ -206,28 +142,44 @@ def scrape_craigslist_progressive(
     scrape_run_id: int | None = None,
     _log_fn=None,
     progress_callback=None,
+    max_age: int = None,
 ):
+    """max_age narrows the posting window (days) — scheduled runs pass the time since their last one."""
+    log        = _log_fn or print
+    max_age    = max_age or DEFAULT_MAX_AGE
+    batches    = list(chunk_list(cities, MAX_CITIES_PER_RUN))
+    progress   = summed_progress(progress_callback)
+    checkpoint = get_checkpoint(scrape_run_id)
+
+    # Batch indexes still to run — on a resume, finished ones are skipped
+    pending = [i for i in range(len(batches)) if not checkpoint.is_done("craigslist", i)]
+    if len(pending) < len(batches):
+        log(f"[Craigslist] Resuming — {len(batches) - len(pending)} batch(es) already done")
+
+    def _run_batch(pos, batch, emit):
+        i     = pending[pos]
+        state = checkpoint.inflight("craigslist", i)
+
+        if state:
+            run_id, dataset_id, offset = state["run_id"], state["dataset_id"], state["offset"]
+            log(
+                f"[Craigslist] Re-attaching batch {i+1}/{len(batches)} to run {run_id} "
+                f"— {offset} item(s) already saved"
+            )
+        else:
+            log(
+                f"[Craigslist] Starting batch {i+1}/{len(batches)}: "
+                f"{batch} | categories: {category_codes}"
+            )
 
-    log     = _log_fn or print
-    batches = list(chunk_list(cities, MAX_CITIES_PER_RUN))
-
-    for i, batch in enumerate(batches):
-
-        if _is_cancel_requested(scrape_run_id):
-            log(f"[Craigslist] Cancel requested — stopping before batch {i+1}")
-            return
-
-        log(
-            f"[Craigslist] Starting batch {i+1}/{len(batches)}: "
-            f"{batch} | categories: {category_codes}"
-        )
-
-        result = _launch_and_guard(batch, category_codes, scrape_run_id)
-        if result is None:
-            log("[Craigslist] Cancelled during actor launch — stopping.")
-            return
-        run_id, dataset_id = result
-        log(f"[Craigslist] Actor started (run {run_id})")
+            result = _launch_and_guard(batch, category_codes, scrape_run_id, max_age)
+            if result is None:
+                log(f"[Craigslist] Cancelled during actor launch of batch {i+1}.")
+                raise BatchIncomplete("cancelled during launch")
+            run_id, dataset_id = result
+            offset = 0
+            checkpoint.start("craigslist", i, run_id, dataset_id)
+            log(f"[Craigslist] Actor started (run {run_id})")
 
         try:
             wait_for_run(
@@ -236,33 +188,39 @@ def scrape_craigslist_progressive(
                 source_label="Craigslist",
                 scrape_run_id=scrape_run_id,
                 log_fn=log,
-                progress_callback=progress_callback,
+                progress_callback=progress(i),
             )
         except Exception as e:
             log(f"[Craigslist] Run ended: {e}")
             try:
-                partial = fetch_dataset(dataset_id)
-                if partial:
+                for next_offset, partial in fetch_dataset_pages(dataset_id, offset):
                     log(f"[Craigslist] Saving {len(partial)} partial result(s)")
-                    yield partial
+                    emit((partial, next_offset))
             except Exception as fetch_err:
                 log(f"[Craigslist] Could not fetch partial dataset: {fetch_err}")
-            return
+            raise BatchIncomplete(f"run ended early: {e}")
 
-        if _is_cancel_requested(scrape_run_id):
+        if is_cancelled(scrape_run_id):
             log(f"[Craigslist] Cancel requested after run — skipping dataset fetch")
-            return
-
-        results = fetch_dataset(dataset_id)
-        log(f"[Craigslist] Got {len(results)} results from batch {i+1}")
+            raise BatchIncomplete("cancelled before dataset fetch")
+
+        total = 0
+        for next_offset, results in fetch_dataset_pages(dataset_id, offset):
+            total += len(results)
+            emit((results, next_offset))
+        log(f"[Craigslist] Got {total} results from batch {i+1}")
+
+    executor = ActorBatchExecutor(
+        "craigslist",
+        scrape_run_id=scrape_run_id,
+        stagger=LAUNCH_STAGGER,
+        log=log,
+    )
+    batch_runs = executor.run(
+        [batches[i] for i in pending], _run_batch,
+        on_done=lambda pos: checkpoint.complete("craigslist", pending[pos]),
+    )
+    for pos, (results, next_offset) in batch_runs:
         yield results
-
-        if i < len(batches) - 1:
-            log(
-                f"[Craigslist] Cooling down {COOLDOWN_BETWEEN_RUNS}s "
-                "before next batch..."
-            )
-            if not _interruptible_cooldown(
-                COOLDOWN_BETWEEN_RUNS, scrape_run_id, log_fn=log
-            ):
-                return
\ No newline at end of file
+        # Only reached once the pipeline has saved this page
+        checkpoint.advance("craigslist", pending[pos], next_offset)
@@ -1,28 +1,18 @@
 import time
-import requests
-from django.conf import settings
+
+from .actor_executor import ActorBatchExecutor, BatchIncomplete, summed_progress
+from .actor_webhooks import launch_webhooks, run_status, wait_for_actor
+from .apify_client import get_client
+from .cancellation import abort_actor, is_cancelled, wait_cancelled
+from .run_checkpoint import get_checkpoint
 
 FB_POSTS_ACTOR_ID = "apify~facebook-groups-scraper"
 
 POLL_INTERVAL            = 5
 GROUPS_PER_POST_BATCH    = 5
 MAX_POSTS_PER_GROUP      = 1000
-COOLDOWN_BETWEEN_BATCHES = 5
-
-
-def _apify_headers() -> dict:
-    return {"Authorization": f"Bearer {settings.APIFY_TOKEN}"}
-
-
-def _abort_apify_run(run_id: str):
-    try:
-        requests.post(
-            f"https://api.apify.com/v2/actor-runs/{run_id}/abort",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-    except Exception as e:
-        print(f"[Facebook] Could not abort run {run_id}: {e}")
+LAUNCH_STAGGER           = 5   # seconds between actor launches
+FETCH_PAGE_SIZE          = 500 # dataset items per request
 
 
 def _register_apify_run(scrape_run_id, apify_run_id: str):
@@ -40,65 +30,34 @@ def _register_apify_run(scrape_run_id, apify_run_id: str):
         print(f"[Facebook] Could not register Apify run ID: {e}")
 
 
-def _is_cancel_requested(scrape_run_id) -> bool:
-    if not scrape_run_id:
-        return False
-    try:
-        from base.models import ScrapeRun
-        return ScrapeRun.objects.filter(
-            pk=scrape_run_id, cancel_requested=True
-        ).exists()
-    except Exception:
-        return False
-
-
-def _fetch_dataset_count(dataset_id: str) -> int:
-    try:
-        resp = requests.get(
-            f"https://api.apify.com/v2/datasets/{dataset_id}",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-        resp.raise_for_status()
-        return resp.json().get("data", {}).get("itemCount", 0)
-    except Exception:
-        return 0
-
-
 def _launch_actor(
     actor_id: str,
     payload: dict,
     scrape_run_id,
 ) -> tuple[str, str] | None:
-    resp = requests.post(
-        f"https://api.apify.com/v2/acts/{actor_id}/runs",
-        json=payload,
-        headers=_apify_headers(),
-    )
-    resp.raise_for_status()
-    data       = resp.json()["data"]
-    run_id     = data["id"]
-    dataset_id = data["defaultDatasetId"]
+    run_id, dataset_id = get_client().launch_actor(actor_id, payload, webhooks=launch_webhooks())
 
     _register_apify_run(scrape_run_id, run_id)
 
-    if _is_cancel_requested(scrape_run_id):
-        _abort_apify_run(run_id)
+    if is_cancelled(scrape_run_id):
+        abort_actor(scrape_run_id, run_id)
         return None
 
     return run_id, dataset_id
 
 
-def _fetch_dataset(dataset_id: str, limit: int = 1000) -> list[dict]:
-    resp = requests.get(
-        f"https://api.apify.com/v2/datasets/{dataset_id}"
-        f"/items?limit={limit}",
-        headers=_apify_headers(),
-        timeout=60,
+def _fetch_dataset_pages(dataset_id: str, offset: int = 0, end_offset: int = None):
+    """
+    Read a dataset from `offset` up to `end_offset`, one page at a time. Yields
+    (next_offset, items) per page, where next_offset counts raw items, so
+    a caller that records it after handling each page can resume exactly
+    there after an error or on the next poll.
+    """
+    pages = get_client().iter_dataset_pages(
+        dataset_id, offset=offset, page_size=FETCH_PAGE_SIZE, end_offset=end_offset,
     )
-    resp.raise_for_status()
-    items = resp.json()
-    return [i for i in items if isinstance(i, dict)]
+    for next_offset, raw in pages:
+        yield next_offset, [i for i in raw if isinstance(i, dict)]
 
 
 def upsert_fb_groups(group_urls: list[str], log=None) -> None:
@@ -120,8 +79,9 @@ def upsert_fb_groups(group_urls: list[str], log=None) -> None:
 def build_fb_posts_payload(
     group_urls: list[str],
     max_posts: int = MAX_POSTS_PER_GROUP,
+    newer_than: str = None,
 ) -> dict:
-    return {
+    payload = {
         "startUrls":       [{"url": u} for u in group_urls],
         "maxPosts":        max_posts,
         "maxPostsPerPage": max_posts,
@@ -132,6 +92,9 @@ def build_fb_posts_payload(
             "apifyProxyCountry": "US",
         },
     }
+    if newer_than:
+        payload["onlyPostsNewerThan"] = newer_than   # YYYY-MM-DD
+    return payload
 
 
 def scrape_fb_groups_progressive(
@@ -140,8 +103,11 @@ def scrape_fb_groups_progressive(
     scrape_run_id=None,
     log=None,
     progress_callback=None,
+    newer_than: str = None,
 ):
-    log = log or print
+    """newer_than (YYYY-MM-DD) limits posts to a window — scheduled runs pass their last run's date."""
+    log    = log or print
+    client = get_client()
 
     if not group_urls:
         log("[Facebook Posts] No group URLs to scrape")
@@ -154,15 +120,17 @@ def scrape_fb_groups_progressive(
         for i in range(0, len(group_urls), GROUPS_PER_POST_BATCH)
     ]
     total_batches = len(batches)
+    progress      = summed_progress(progress_callback)
+    checkpoint    = get_checkpoint(scrape_run_id)
 
-    for b_idx, batch in enumerate(batches):
-        if _is_cancel_requested(scrape_run_id):
-            log(
-                f"[Facebook Posts] Cancel requested — "
-                f"stopping before batch {b_idx + 1}/{total_batches}"
-            )
-            return
+    # Batch indexes still to run — on a resume, finished ones are skipped
+    pending = [i for i in range(total_batches) if not checkpoint.is_done("facebook", i)]
+    if len(pending) < total_batches:
+        log(f"[Facebook Posts] Resuming — {total_batches - len(pending)} batch(es) already done")
 
+    def _run_batch(pos, batch, emit):
+        b_idx = pending[pos]
+        state = checkpoint.inflight("facebook", b_idx)
         batch_labels = ", ".join(
             u.rstrip("/").split("/")[-1] or u
             for u in batch[:3]
@@ -170,158 +138,146 @@ def scrape_fb_groups_progressive(
         if len(batch) > 3:
             batch_labels += f" (+{len(batch) - 3})"
 
-        log(
-            f"[Facebook Posts] Batch {b_idx + 1}/{total_batches} — "
-            f"scraping {len(batch)} group(s): {batch_labels}"
-        )
-
-        if _is_cancel_requested(scrape_run_id):
-            log(f"[Facebook Posts] Cancel requested — stopping before batch {b_idx + 1}")
-            return
+        if state:
+            run_id, dataset_id = state["run_id"], state["dataset_id"]
+            log(
+                f"[Facebook Posts] Batch {b_idx + 1}/{total_batches} — re-attaching to "
+                f"run {run_id}, {state['offset']} item(s) already saved: {batch_labels}"
+            )
+        else:
+            log(
+                f"[Facebook Posts] Batch {b_idx + 1}/{total_batches} — "
+                f"scraping {len(batch)} group(s): {batch_labels}"
+            )
 
-        payload = build_fb_posts_payload(batch, max_posts_per_group)
-        try:
-            result = _launch_actor(FB_POSTS_ACTOR_ID, payload, scrape_run_id)
-        except Exception as e:
-            log(f"[Facebook Posts] Failed to launch batch {b_idx + 1}: {e}")
-            continue
+            payload = build_fb_posts_payload(batch, max_posts_per_group, newer_than)
+            try:
+                result = _launch_actor(FB_POSTS_ACTOR_ID, payload, scrape_run_id)
+            except Exception as e:
+                log(f"[Facebook Posts] Failed to launch batch {b_idx + 1}: {e}")
+                raise BatchIncomplete(f"launch failed: {e}")
 
-        if result is None:
-            log(f"[Facebook Posts] Cancelled during launch — stopping")
-            return
+            if result is None:
+                log(f"[Facebook Posts] Cancelled during launch of batch {b_idx + 1}")
+                raise BatchIncomplete("cancelled during launch")
 
-        run_id, dataset_id = result
-        log(
-            f"[Facebook Posts] Batch {b_idx + 1} actor launched "
-            f"(run {run_id}) — waiting for posts…"
-        )
+            run_id, dataset_id = result
+            checkpoint.start("facebook", b_idx, run_id, dataset_id)
+            log(
+                f"[Facebook Posts] Batch {b_idx + 1} actor launched "
+                f"(run {run_id}) — waiting for posts…"
+            )
 
         # ── Stream results as they arrive ─────────────────────────
-        last_saved_count = 0
-        final_status     = None
+        report           = progress(b_idx)
+        offset           = state["offset"] if state else 0   # dataset items already emitted
+        end_offset       = len(batch) * max_posts_per_group * 2   # cap on the batch's whole dataset
         poll_count       = 0
+        started          = time.monotonic()
         poll_error_count = 0
+        ended            = None   # why the batch stopped short; None once it SUCCEEDED
+
+        def _read_new(stage: str):
+            nonlocal offset
+            for next_offset, items in _fetch_dataset_pages(dataset_id, offset, end_offset):
+                if items:
+                    log(
+                        f"[Facebook Posts] Batch {b_idx + 1} {stage} — "
+                        f"{len(items)} new post(s) (items {offset + 1}–{next_offset})"
+                    )
+                    _update_group_metadata(batch, items, log)
+                    emit((items, next_offset))
+                offset = next_offset
 
         while True:
             # Cancel check at top of every loop
-            if _is_cancel_requested(scrape_run_id):
-                _abort_apify_run(run_id)
+            if is_cancelled(scrape_run_id):
+                abort_actor(scrape_run_id, run_id)
                 log(f"[Facebook Posts] Cancelled by user --- run {run_id} aborted")
-                final_status = "ABORTED"
+                ended = "cancelled"
                 break
 
             # Poll actor status
             try:
-                res = requests.get(
-                    f"https://api.apify.com/v2/actor-runs/{run_id}",
-                    headers=_apify_headers(),
-                    timeout=15,
-                )
-                res.raise_for_status()
-                status = res.json()["data"]["status"]
+                status = run_status(run_id)
                 poll_error_count = 0
             except Exception as e:
                 poll_error_count += 1
                 log(f"[Facebook Posts] Status check error ({poll_error_count}/5): {e}")
                 if poll_error_count >= 5:
-                    final_status = "FAILED"
+                    ended = f"status checks failing: {e}"
                     break
-                for _ in range(POLL_INTERVAL):
-                    if _is_cancel_requested(scrape_run_id):
-                        break
-                    time.sleep(1)
+                wait_cancelled(scrape_run_id, POLL_INTERVAL)
                 continue
 
             poll_count += 1
 
-            # ── Fetch and yield NEW items every poll ──────────────
-            current_count = _fetch_dataset_count(dataset_id)
-            if progress_callback and current_count > 0:
-                progress_callback(current_count)
+            # ── Fetch and emit NEW items every poll ───────────────
+            current_count = client.dataset_count(dataset_id)
+            if report and current_count > 0:
+                report(current_count)
 
-            if current_count > last_saved_count:
+            if current_count > offset:
                 try:
-                    all_items = _fetch_dataset(
-                        dataset_id,
-                        limit=len(batch) * max_posts_per_group * 2,
-                    )
-                    new_items = all_items[last_saved_count:]
-                    if new_items:
-                        log(
-                            f"[Facebook Posts] Batch {b_idx + 1} — "
-                            f"yielding {len(new_items)} new post(s) "
-                            f"({current_count} total so far)"
-                        )
-                        _update_group_metadata(batch, new_items, log)
-                        yield new_items
-                        last_saved_count = len(all_items)
+                    _read_new("streaming")
+                except BatchIncomplete:
+                    raise   # the executor's consumer stopped — nothing left to stream to
                 except Exception as e:
-                    log(f"[Facebook Posts] Mid-run fetch error: {e}")
+                    log(f"[Facebook Posts] Mid-run fetch error at item {offset}: {e}")
 
-            # Re-check cancel after yield — limit may have just been hit
-            if _is_cancel_requested(scrape_run_id):
-                _abort_apify_run(run_id)
+            # Re-check cancel after emit — limit may have just been hit
+            if is_cancelled(scrape_run_id):
+                abort_actor(scrape_run_id, run_id)
                 log(f"[Facebook Posts] Cancelled after yield --- run {run_id} aborted")
-                final_status = "ABORTED"
+                ended = "cancelled"
                 break
 
             if poll_count % 4 == 0:
                 log(
                     f"[Facebook Posts] Still running "
-                    f"({poll_count * POLL_INTERVAL}s) | "
+                    f"({int(time.monotonic() - started)}s) | "
                     f"~{current_count} post(s) found so far..."
                 )
 
             if status == "SUCCEEDED":
-                final_status = "SUCCEEDED"
                 break
 
             if status in ("FAILED", "ABORTED", "TIMED-OUT"):
                 log(f"[Facebook Posts] Actor run {run_id} ended with: {status}")
-                final_status = status
+                ended = f"actor run {status}"
                 break
 
-            # Interruptible sleep
-            for _ in range(POLL_INTERVAL):
-                if _is_cancel_requested(scrape_run_id):
-                    _abort_apify_run(run_id)
-                    final_status = "ABORTED"
-                    break
-                time.sleep(1)
-
-            if final_status == "ABORTED":
+            # Interruptible sleep — cut short by the run's webhook
+            if wait_for_actor(scrape_run_id, run_id, POLL_INTERVAL):
+                abort_actor(scrape_run_id, run_id)
+                ended = "cancelled"
                 break
 
-        # ── Final fetch to catch any remaining items ──────────────
+        # ── Final read from where streaming stopped ───────────────
         try:
-            all_items = _fetch_dataset(
-                dataset_id,
-                limit=len(batch) * max_posts_per_group * 2,
-            )
-            remaining = all_items[last_saved_count:]
-            if remaining:
-                log(
-                    f"[Facebook Posts] Batch {b_idx + 1} final — "
-                    f"{len(remaining)} remaining post(s) saved"
-                )
-                _update_group_metadata(batch, remaining, log)
-                yield remaining
+            _read_new("final")
         except Exception as e:
-            log(f"[Facebook Posts] Final fetch error for batch {b_idx + 1}: {e}")
-
-        if final_status == "ABORTED":
-            return
-
-        if b_idx < total_batches - 1:
-            log(
-                f"[Facebook Posts] Cooling down {COOLDOWN_BETWEEN_BATCHES}s "
-                "before next batch…"
-            )
-            for _ in range(COOLDOWN_BETWEEN_BATCHES):
-                if _is_cancel_requested(scrape_run_id):
-                    log("[Facebook Posts] Cancel during cooldown — stopping")
-                    return
-                time.sleep(1)
+            log(f"[Facebook Posts] Final fetch error for batch {b_idx + 1} at item {offset}: {e}")
+            ended = ended or f"final fetch failed: {e}"
+
+        if ended:
+            raise BatchIncomplete(ended)
+
+    executor = ActorBatchExecutor(
+        "facebook",
+        scrape_run_id=scrape_run_id,
+        stagger=LAUNCH_STAGGER,
+        log=log,
+        label="Facebook Posts",
+    )
+    batch_runs = executor.run(
+        [batches[i] for i in pending], _run_batch,
+        on_done=lambda pos: checkpoint.complete("facebook", pending[pos]),
+    )
+    for pos, (items, next_offset) in batch_runs:
+        yield items
+        # Only reached once the pipeline has saved this page
+        checkpoint.advance("facebook", pending[pos], next_offset)
 
 
 def _update_group_metadata(batch_urls: list[str], items: list[dict], log):
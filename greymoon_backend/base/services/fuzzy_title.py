@@ -1,16 +1,12 @@
 # services/fuzzy_title.py
 
-import re
+import zlib
 import hashlib
+from array import array
 from difflib import SequenceMatcher
 
-def _normalize_title(title: str) -> str:
-    if not title:
-        return ""
-    t = title.lower().strip()
-    t = re.sub(r'[\W_]+', ' ', t)
-    t = re.sub(r'\s+', ' ', t).strip()
-    return t
+from .text_kernel import normalize_title
+
 
 def _get_trigrams(text: str) -> set:
     """Convert text into character trigrams for similarity comparison."""
@@ -22,9 +18,10 @@ def title_similarity(title_a: str, title_b: str) -> float:
     Returns similarity ratio between 0.0 and 1.0.
     Uses trigram overlap (Jaccard similarity) — fast and effective.
     """
-    a = _normalize_title(title_a)
-    b = _normalize_title(title_b)
+    return _normalized_similarity(normalize_title(title_a), normalize_title(title_b))
 
+def _normalized_similarity(a: str, b: str, trigrams_a: set = None) -> float:
+    """Same as title_similarity but for already-normalised titles."""
     if not a or not b:
         return 0.0
 
@@ -36,7 +33,7 @@ def title_similarity(title_a: str, title_b: str) -> float:
     if a in b or b in a:
         return 0.85
 
-    trigrams_a = _get_trigrams(a)
+    trigrams_a = trigrams_a if trigrams_a is not None else _get_trigrams(a)
     trigrams_b = _get_trigrams(b)
 
     if not trigrams_a or not trigrams_b:
@@ -47,27 +44,20 @@ def title_similarity(title_a: str, title_b: str) -> float:
 
     return intersection / union if union else 0.0
 
-def make_title_bucket_hash(title: str) -> str:
-    """
-    Creates a coarse 'bucket' hash from the first ~4 significant words.
-    Leads in the same bucket are candidates for fuzzy comparison.
-    This avoids comparing every new lead against all existing leads.
-    """
-    normalized = _normalize_title(title)
+# Remove very common service words that appear in nearly every title
+_BUCKET_STOP_WORDS = {
+    'cleaning', 'service', 'services', 'professional', 'affordable',
+    'cheap', 'best', 'great', 'quality', 'reliable', 'licensed',
+    'insured', 'free', 'estimate', 'call', 'now', 'today', 'available',
+    'experienced', 'local', 'residential', 'commercial', 'and', 'the',
+    'for', 'your', 'with', 'we', 'our', 'all', 'any', 'get', 'need',
+    'looking', 'repair', 'installation', 'removal', 'junk', 'house',
+    'home', 'yard', 'lawn',
+}
+
+def _bucket_key(normalized: str) -> str:
     words = normalized.split()
-
-    # Remove very common service words that appear in nearly every title
-    STOP_WORDS = {
-        'cleaning', 'service', 'services', 'professional', 'affordable',
-        'cheap', 'best', 'great', 'quality', 'reliable', 'licensed',
-        'insured', 'free', 'estimate', 'call', 'now', 'today', 'available',
-        'experienced', 'local', 'residential', 'commercial', 'and', 'the',
-        'for', 'your', 'with', 'we', 'our', 'all', 'any', 'get', 'need',
-        'looking', 'repair', 'installation', 'removal', 'junk', 'house',
-        'home', 'yard', 'lawn',
-    }
-
-    significant = [w for w in words if w not in STOP_WORDS and len(w) > 2]
+    significant = [w for w in words if w not in _BUCKET_STOP_WORDS and len(w) > 2]
 
     # Use first 3 significant words as the bucket key
     bucket_key = " ".join(significant[:3])
@@ -76,4 +66,149 @@ def make_title_bucket_hash(title: str) -> str:
         # Fall back to first 3 words of anything
         bucket_key = " ".join(words[:3])
 
-    return hashlib.md5(bucket_key.encode()).hexdigest()[:16]
\ No newline at end of file
+    return bucket_key
+
+def make_title_bucket_hash(title: str) -> str:
+    """
+    Creates a coarse 'bucket' hash from the first ~4 significant words.
+    Leads in the same bucket are candidates for fuzzy comparison.
+    This avoids comparing every new lead against all existing leads.
+    """
+    return hashlib.md5(_bucket_key(normalize_title(title)).encode()).hexdigest()[:16]
+
+
+# ── MinHash / LSH title index ─────────────────────────────────
+#
+# One-permutation MinHash: every trigram is hashed once and dropped into
+# one of NUM_PERM bins, keeping the minimum per bin. Empty bins borrow
+# the next filled bin's value (rotation densification), so signing a
+# title costs O(trigrams + NUM_PERM) instead of O(trigrams * NUM_PERM).
+# With 16 bands of 4 rows a pair at the 0.65 dedup threshold becomes a
+# candidate ~96% of the time, while unrelated titles (<0.2) almost never do.
+
+LSH_NUM_PERM   = 64
+LSH_BANDS      = 16
+LSH_BUCKET_CAP = 200    # same cap the old per-bucket DB query used
+
+_MASK64    = (1 << 64) - 1
+_BIN_SHIFT = 64 - 6     # top 6 bits pick one of 64 bins
+_VAL_MASK  = (1 << _BIN_SHIFT) - 1
+_GOLDEN    = 0x9E3779B97F4A7C15
+
+
+def _minhash_signature(trigrams: set, num_perm: int = LSH_NUM_PERM) -> tuple | None:
+    if not trigrams:
+        return None
+    bins = [None] * num_perm
+    for tri in trigrams:
+        h   = (zlib.crc32(tri.encode()) * _GOLDEN) & _MASK64
+        idx = (h >> _BIN_SHIFT) % num_perm
+        val = h & _VAL_MASK
+        cur = bins[idx]
+        if cur is None or val < cur:
+            bins[idx] = val
+
+    sig = list(bins)
+    for i in range(num_perm):
+        if bins[i] is not None:
+            continue
+        j, dist = (i + 1) % num_perm, 1
+        while bins[j] is None:
+            j, dist = (j + 1) % num_perm, dist + 1
+        sig[i] = bins[j] + dist * (_VAL_MASK + 1)
+    return tuple(sig)
+
+
+def prepare_title(title: str) -> tuple | None:
+    """
+    (normalised title, packed MinHash signature) — the per-title work of an
+    index lookup, computed ahead of time (e.g. in another process) and
+    handed to find_similar()/add(). The signature is packed as uint64
+    bytes, which pickle far smaller than a tuple of ints or a trigram set.
+    """
+    norm = normalize_title(title)
+    if not norm:
+        return None
+    sig = _minhash_signature(_get_trigrams(norm))
+    return norm, array("Q", sig).tobytes() if sig is not None else None
+
+
+class TitleLSHIndex:
+    """
+    In-memory near-duplicate index over the titles of one lead source.
+    Lookups are a handful of dict hits plus exact trigram comparisons
+    against the candidates, instead of a DB query per incoming lead.
+    Candidates come from the LSH bands *and* from the old
+    make_title_bucket_hash key, so anything the bucket query used to
+    catch is still caught — plus near-dupes that land in other buckets.
+    """
+
+    def __init__(self, num_perm: int = LSH_NUM_PERM, bands: int = LSH_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands    = bands
+        self.rows     = num_perm // bands
+        self._titles: list[str] = []
+        self._exact:  set[str] = set()
+        self._band_tables: list[dict] = [{} for _ in range(bands)]
+        self._bucket_table: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _band_keys(self, sig: tuple):
+        r = self.rows
+        for b in range(self.bands):
+            yield b, hash(sig[b * r:(b + 1) * r])
+
+    def _prepared(self, title: str, prepared: tuple | None) -> tuple | None:
+        """(normalised title, trigrams or None, signature tuple or None)."""
+        # A signature from prepare_title() is only usable at the default width
+        if prepared is not None and self.num_perm == LSH_NUM_PERM:
+            norm, packed = prepared
+            return norm, None, tuple(array("Q", packed)) if packed is not None else None
+        norm = normalize_title(title)
+        if not norm:
+            return None
+        trigrams = _get_trigrams(norm)
+        return norm, trigrams, _minhash_signature(trigrams, self.num_perm)
+
+    def add(self, title: str, prepared: tuple = None) -> None:
+        prepared = self._prepared(title, prepared)
+        if prepared is None or prepared[0] in self._exact:
+            return
+        norm, _, sig = prepared
+        idx = len(self._titles)
+        self._titles.append(norm)
+        self._exact.add(norm)
+
+        if sig is not None:
+            for b, key in self._band_keys(sig):
+                self._band_tables[b].setdefault(key, []).append(idx)
+        self._bucket_table.setdefault(_bucket_key(norm), []).append(idx)
+
+    def find_similar(self, title: str, threshold: float, prepared: tuple = None) -> tuple[str, float] | None:
+        """Return (existing normalised title, similarity) for the first
+        indexed title at or above threshold, or None. `prepared` is an
+        optional prepare_title() result for the same title."""
+        prepared = self._prepared(title, prepared)
+        if prepared is None:
+            return None
+        norm, trigrams, sig = prepared
+        if norm in self._exact:
+            return norm, 1.0
+
+        candidates = set(self._bucket_table.get(_bucket_key(norm), ())[-LSH_BUCKET_CAP:])
+        if sig is not None:
+            for b, key in self._band_keys(sig):
+                candidates.update(self._band_tables[b].get(key, ()))
+
+        if candidates and trigrams is None:
+            trigrams = _get_trigrams(norm)
+        for idx in sorted(candidates):
+            existing = self._titles[idx]
+            sim = _normalized_similarity(norm, existing, trigrams)
+            if sim >= threshold:
+                return existing, sim
+        return None
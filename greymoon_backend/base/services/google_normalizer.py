@@ -1,36 +1,11 @@
 import hashlib
 import json
-import re
+from functools import partial
 
-
-
-
-def _normalize_title(title: str) -> str:
-    if not title:
-        return ""
-    t = title.lower().strip()
-    t = re.sub(r'[\W_]+', ' ', t)
-    t = re.sub(r'\s+', ' ', t).strip()
-    return t
-
-
-    
-def _extract_emails(text: str) -> str | None:
-    if not text:
-        return None
-    matches = re.findall(
-        r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text
-    )
-    return matches[0] if matches else None
-
-
-def _extract_phones(text: str) -> str | None:
-    if not text:
-        return None
-    matches = re.findall(
-        r"(\+?1?\s?[\(\-]?\d{3}[\)\-\s]?\s?\d{3}[\-\s]?\d{4})", text
-    )
-    return matches[0].strip() if matches else None
+from .lead_entities import set_entity_keys
+from .lead_record import LeadRecord
+from .platform_domains import SKIP_DOMAINS
+from .text_kernel import extract_contacts, normalize_title
 
 
 def _content_hash(data: dict) -> str:
@@ -58,15 +33,6 @@ def _base_url(url: str) -> str:
         return url
 
 
-SKIP_DOMAINS = {
-    "yelp.com", "angi.com", "thumbtack.com", "homeadvisor.com",
-    "homedepot.com", "lowes.com", "amazon.com", "indeed.com",
-    "linkedin.com", "facebook.com", "instagram.com", "youtube.com",
-    "bbb.org", "angieslist.com", "taskrabbit.com", "craigslist.org",
-    "nextdoor.com", "google.com", "twitter.com", "x.com",
-}
-
-
 def _is_directory(url: str) -> bool:
     if not url:
         return False
@@ -86,42 +52,36 @@ def _build_lead(
     search_query: str,
     extra_raw: dict,
     lead_type: str = "organic",
-) -> dict | None:
+) -> LeadRecord | None:
     if not url:
         return None
     post_id   = _make_post_id(url)
     post_body = description or ""
-    normalized = {
-        "post_id":          post_id,
-        "url":              url,
-        "title":            title[:500],
-        "post":             post_body,
-        "phone":            phone or None,
-        "email":            email or None,
-        "location":         location,
-        "category":         service_category,
-        "service_category": service_category,
-        "state":            "",
-        "latitude":         "",
-        "longitude":        "",
-        "map_accuracy":     "",
-        "datetime":         None,
-        "source":           "GOOGLE",
-        "zip_code":         "",
-        "fb_group_name":    "",
-        "fb_group_url":     "",
-        "raw_json": {
-            **extra_raw,
-            "_google_query":    search_query,
-            "_google_url":      url,
-            "_google_title":    title,
-            "_lead_type":       lead_type,
-        },
-    }
-    normalized["content_hash"] = _content_hash({
-        "title_norm": _normalize_title(title),
+    normalized = LeadRecord(
+        post_id=post_id,
+        url=url,
+        title=title[:500],
+        post=post_body,
+        phone=phone or None,
+        email=email or None,
+        location=location,
+        category=service_category,
+        service_category=service_category,
+        source="GOOGLE",
+        # Built only if the lead survives dedup
+        raw=partial(
+            dict, extra_raw,
+            _google_query=search_query,
+            _google_url=url,
+            _google_title=title,
+            _lead_type=lead_type,
+        ),
+    )
+    normalized.content_hash = _content_hash({
+        "title_norm": normalize_title(title),
         "post":  description[:300],   # remove url from hash — url varies, content doesn't
     })
+    set_entity_keys(normalized)
     return normalized
 
 
@@ -147,10 +107,10 @@ def _resolve_contacts(
         if not email and crawled.get("emails"):
             email = crawled["emails"][0]
 
-    if not phone:
-        phone = _extract_phones(snippet) or ""
-    if not email:
-        email = _extract_emails(snippet) or ""
+    if not phone or not email:
+        snippet_phone, snippet_email = extract_contacts(snippet)
+        phone = phone or snippet_phone or ""
+        email = email or snippet_email or ""
 
     return phone or None, email or None
 
@@ -162,7 +122,7 @@ def _from_enriched_lead(
     location: str,
     search_query: str,
     contacts_map: dict,
-) -> dict | None:
+) -> LeadRecord | None:
     full_name    = lead.get("fullName") or ""
     job_title    = lead.get("jobTitle") or ""
     company_name = lead.get("companyName") or organic.get("title", "")
@@ -225,7 +185,7 @@ def _from_organic_result(
     location: str,
     search_query: str,
     contacts_map: dict,
-) -> dict | None:
+) -> LeadRecord | None:
     url   = result.get("url") or ""
     title = result.get("title") or ""
     desc  = result.get("description") or ""
@@ -249,7 +209,7 @@ def _from_organic_result(
         service_category=service_category,
         search_query=search_query,
         lead_type="organic",
-        extra_raw={**result},
+        extra_raw=result,
     )
 
 
@@ -259,7 +219,7 @@ def _from_paid_result(
     location: str,
     search_query: str,
     contacts_map: dict,
-) -> dict | None:
+) -> LeadRecord | None:
 
     url   = result.get("url") or result.get("displayedUrl") or ""
     title = result.get("title") or ""
@@ -284,7 +244,7 @@ def _from_paid_result(
         service_category=service_category,
         search_query=search_query,
         lead_type="paid",
-        extra_raw={**result},
+        extra_raw=result,
     )
 
 
@@ -325,7 +285,7 @@ def normalize_google_serp_page(
     service_category: str,
     location: str,
     contacts_map: dict = None,
-) -> list[dict]:
+) -> list[LeadRecord]:
     if contacts_map is None:
         contacts_map = {}
 
@@ -342,16 +302,16 @@ def normalize_google_serp_page(
     seen_post_ids = set()
     seen_domains  = set()
 
-    def _add(lead_dict):
-        if lead_dict is None:
+    def _add(record):
+        if record is None:
             return
-        pid    = lead_dict.get("post_id")
-        domain = _domain_from_url(lead_dict.get("url", ""))
+        pid    = record.post_id
+        domain = _domain_from_url(record.url)
         if pid in seen_post_ids:
             return
         seen_post_ids.add(pid)
         seen_domains.add(domain)
-        leads.append(lead_dict)
+        leads.append(record)
 
     # Build organic lookup by domain
     organic_by_domain = {}
@@ -1,41 +1,26 @@
 import threading
 import time
-import re
-import requests
 
-from django.conf import settings
+from .actor_executor import ActorBatchExecutor
+from .actor_webhooks import launch_webhooks, run_status, wait_for_actor
+from .apify_client import get_client
+from .cancellation import abort_actor, is_cancelled, wait_cancelled
+from .platform_domains import SKIP_DOMAINS
+from .run_checkpoint import get_checkpoint
+from .text_kernel import extract_page_contacts
 
 SERP_ACTOR_ID       = "apify~google-search-scraper"
 CRAWL_ACTOR_ID      = "apify~website-content-crawler"
 
 POLL_INTERVAL       = 5
-DATASET_FETCH_LIMIT = 2000
 DEFAULT_MAX_PAGES   = 10
 CRAWL_TIMEOUT       = 480
 CRAWL_BATCH_SIZE    = 5
 
-SKIP_DOMAINS = {
-    "yelp.com", "angi.com", "thumbtack.com", "homeadvisor.com",
-    "homedepot.com", "lowes.com", "amazon.com", "indeed.com",
-    "linkedin.com", "facebook.com", "instagram.com", "youtube.com",
-    "bbb.org", "angieslist.com", "taskrabbit.com", "craigslist.org",
-    "nextdoor.com", "google.com", "twitter.com", "x.com",
-}
-
-
-def _apify_headers() -> dict:
-    return {"Authorization": f"Bearer {settings.APIFY_TOKEN}"}
-
-
-def _abort_apify_run(run_id: str):
-    try:
-        requests.post(
-            f"https://api.apify.com/v2/actor-runs/{run_id}/abort",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-    except Exception as e:
-        print(f"[Google] Could not abort run {run_id}: {e}")
+# Server-side projections — only what the contact extractor and the SERP
+# normalizer read, so raw HTML and crawler metadata never leave Apify
+SERP_OMIT_FIELDS    = ("html",)
+CRAWL_FIELDS        = ("url", "loadedUrl", "text", "markdown", "content")
 
 
 def _register_apify_run(scrape_run_id, apify_run_id: str):
@@ -53,109 +38,24 @@ def _register_apify_run(scrape_run_id, apify_run_id: str):
         print(f"[Google] Could not register Apify run ID: {e}")
 
 
-def _is_cancel_requested(scrape_run_id) -> bool:
-    if not scrape_run_id:
-        return False
-    try:
-        from base.models import ScrapeRun
-        return ScrapeRun.objects.filter(
-            pk=scrape_run_id, cancel_requested=True
-        ).exists()
-    except Exception:
-        return False
-
-
 def _launch_actor(actor_id: str, payload: dict, scrape_run_id) -> tuple[str, str] | None:
-    resp = requests.post(
-        f"https://api.apify.com/v2/acts/{actor_id}/runs",
-        json=payload,
-        headers=_apify_headers(),
-    )
-    resp.raise_for_status()
-    data       = resp.json()["data"]
-    run_id     = data["id"]
-    dataset_id = data["defaultDatasetId"]
+    run_id, dataset_id = get_client().launch_actor(actor_id, payload, webhooks=launch_webhooks())
     _register_apify_run(scrape_run_id, run_id)
-    if _is_cancel_requested(scrape_run_id):
-        _abort_apify_run(run_id)
+    if is_cancelled(scrape_run_id):
+        abort_actor(scrape_run_id, run_id)
         return None
     return run_id, dataset_id
 
 
 def _fetch_dataset(dataset_id: str) -> list[dict]:
-    resp = requests.get(
-        f"https://api.apify.com/v2/datasets/{dataset_id}"
-        f"/items?clean=true&limit={DATASET_FETCH_LIMIT}",
-        headers=_apify_headers(),
-    )
-    resp.raise_for_status()
-    return resp.json()
+    """Every SERP page in the dataset — paged, so there is no size cap."""
+    return list(get_client().iter_dataset(dataset_id, clean=True, omit=SERP_OMIT_FIELDS))
 
 
-def _fetch_dataset_count(dataset_id: str) -> int:
-    """Poll Apify dataset metadata for current item count — no download needed."""
-    try:
-        resp = requests.get(
-            f"https://api.apify.com/v2/datasets/{dataset_id}",
-            headers=_apify_headers(),
-            timeout=10,
-        )
-        resp.raise_for_status()
-        return resp.json().get("data", {}).get("itemCount", 0)
-    except Exception:
-        return 0
-
-
-def _poll_run_status(run_id: str) -> str:
-    res = requests.get(
-        f"https://api.apify.com/v2/actor-runs/{run_id}",
-        headers=_apify_headers(),
-    )
-    res.raise_for_status()
-    return res.json()["data"]["status"]
-
-
-
-_PHONE_FORMATTED = re.compile(
-    r'(\+?1?[\s\.\-]?[\(\-]?\d{3}[\)\.\-\s][\.\-\s]?\d{3}[\.\-\s]\d{4})'
-)
-_PHONE_TEL_HREF_FORMATTED = re.compile(
-    r'href=["\']tel:[\+]?1?[\-\s\.]?(\(?\d{3}\)?[\-\s\.]?\d{3}[\-\s\.]\d{4})'
-)
-_PHONE_TEL_HREF_RAW = re.compile(
-    r'href=["\']tel:[\+]?1?(\d{10})["\']'
-)
-_EMAIL_RE = re.compile(
-    r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
-)
-_EMAIL_SKIP = {
-    "noreply", "no-reply", ".png", ".jpg", ".gif", ".svg",
-    ".css", ".js", "example.com", "sentry.io",
-    "wixpress.com", "squarespace.com", "wordpress.com",
-}
-
-
-def _extract_contacts(text: str) -> dict:
-    if not text:
-        return {"phones": [], "emails": []}
-
-    phones_formatted  = [m.strip() for m in _PHONE_FORMATTED.findall(text)]
-    phones_tel_fmt    = _PHONE_TEL_HREF_FORMATTED.findall(text)
-    phones_tel_raw    = [
-        f"({d[:3]}) {d[3:6]}-{d[6:]}"
-        for d in _PHONE_TEL_HREF_RAW.findall(text)
-    ]
-
-    all_phones = list(dict.fromkeys(
-        phones_tel_fmt + phones_tel_raw + phones_formatted
-    ))
-
-    emails = list(dict.fromkeys(
-        m.lower() for m in _EMAIL_RE.findall(text)
-        if not any(skip in m.lower() for skip in _EMAIL_SKIP)
-    ))
-
-    return {"phones": all_phones[:5], "emails": emails[:5]}
+def _iter_crawled_pages(dataset_id: str):
+    """Crawled pages, one dataset page at a time, projected to CRAWL_FIELDS."""
+    for _, pages in get_client().iter_dataset_pages(dataset_id, clean=True, fields=CRAWL_FIELDS):
+        yield pages
 
 
 def _normalise_domain(base_url: str) -> str:
@@ -214,6 +114,87 @@ def build_crawl_payload(urls: list[str]) -> dict:
     }
 
 
+def _crawl_batch(b_idx, batch, total_batches, scrape_run_id, log, emit):
+    """Run one crawler actor over a batch of sites and emit the crawled pages."""
+    batch_domains = ", ".join(
+        u.split("/")[2] for u in batch if len(u.split("/")) > 2
+    )
+    log(
+        f"[Google Website Crawl] Batch {b_idx+1}/{total_batches} — "
+        f"crawling: {batch_domains}"
+    )
+
+    payload = build_crawl_payload(batch)
+    try:
+        result = _launch_actor(CRAWL_ACTOR_ID, payload, scrape_run_id)
+    except Exception as e:
+        log(f"[Google Website Crawl] Failed to launch crawler batch {b_idx+1}: {e}")
+        return
+
+    if result is None:
+        log(f"[Google Website Crawl] Cancelled during launch of batch {b_idx+1}")
+        return
+
+    run_id, dataset_id = result
+    expected_pages = len(batch) * 3
+    log(
+        f"[Google Website Crawl] Batch {b_idx+1} actor running (run {run_id}) — "
+        f"waiting for Playwright to render up to {expected_pages} page(s)..."
+    )
+
+    client      = get_client()
+    poll_count  = 0
+    started     = time.monotonic()
+    error_count = 0
+    MAX_POLL_ERRORS = 5
+    while True:
+        if is_cancelled(scrape_run_id):
+            abort_actor(scrape_run_id, run_id)
+            log(f"[Google Website Crawl] Cancelled mid-crawl — aborting batch {b_idx+1}")
+            break
+
+        try:
+            status = run_status(run_id)
+            error_count = 0  # reset on success
+        except Exception as e:
+            error_count += 1
+            log(f"[Google Website Crawl] Status check error for batch {b_idx+1} ({error_count}/{MAX_POLL_ERRORS}): {e}")
+            if error_count >= MAX_POLL_ERRORS:
+                log(f"[Google Website Crawl] Batch {b_idx+1} — max poll errors reached, skipping batch")
+                break
+            wait_cancelled(scrape_run_id, POLL_INTERVAL)
+            continue
+
+        poll_count += 1
+        if status == "SUCCEEDED":
+            log(
+                f"[Google Website Crawl] Batch {b_idx+1} finished — "
+                f"extracting contacts from crawled pages..."
+            )
+            break
+        elif status in ("FAILED", "ABORTED", "TIMED-OUT"):
+            log(
+                f"[Google Website Crawl] Batch {b_idx+1} ended with status: {status} — "
+                f"saving any partial results"
+            )
+            break
+        else:
+            if poll_count % 3 == 0:
+                elapsed = int(time.monotonic() - started)
+                log(
+                    f"[Google Website Crawl] Batch {b_idx+1} still running "
+                    f"({elapsed}s elapsed, status: {status})..."
+                )
+
+        wait_for_actor(scrape_run_id, run_id, POLL_INTERVAL)
+
+    try:
+        for pages in _iter_crawled_pages(dataset_id):
+            emit(pages)
+    except Exception as e:
+        log(f"[Google Website Crawl] Could not fetch dataset for batch {b_idx+1}: {e}")
+
+
 def _run_crawl_parallel(
     urls_to_crawl: list[str],
     contacts_map: dict,
@@ -223,7 +204,7 @@ def _run_crawl_parallel(
     scrape_run_id,
     log,
 ):
-    if _is_cancel_requested(scrape_run_id):
+    if is_cancelled(scrape_run_id):
         log("[Google Website Crawl] Cancelled before crawl started — exiting")
         crawl_done.set()
         return
@@ -238,154 +219,76 @@ def _run_crawl_parallel(
         urls_to_crawl[i:i + CRAWL_BATCH_SIZE]
         for i in range(0, total, CRAWL_BATCH_SIZE)
     ]
+    executor = ActorBatchExecutor(
+        "crawl",
+        scrape_run_id=scrape_run_id,
+        log=log,
+        label="Google Website Crawl",
+    )
 
-    for b_idx, batch in enumerate(batches):
-        if _is_cancel_requested(scrape_run_id):
-            log(
-                f"[Google Website Crawl] Cancel requested — stopping after batch {b_idx} "
-                f"({b_idx * CRAWL_BATCH_SIZE} of {total} sites crawled)"
-            )
-            break
-
-        batch_domains = ", ".join(
-            u.split("/")[2] for u in batch if len(u.split("/")) > 2
-        )
-        log(
-            f"[Google Website Crawl] Batch {b_idx+1}/{len(batches)} — "
-            f"crawling: {batch_domains}"
-        )
-
-        payload = build_crawl_payload(batch)
-        try:
-            result = _launch_actor(CRAWL_ACTOR_ID, payload, scrape_run_id)
-        except Exception as e:
-            log(f"[Google Website Crawl] Failed to launch crawler batch {b_idx+1}: {e}")
-            continue
-
-        if result is None:
-            log(f"[Google Website Crawl] Cancelled during launch of batch {b_idx+1}")
-            break
-
-        run_id, dataset_id = result
-        expected_pages = len(batch) * 3
-        log(
-            f"[Google Website Crawl] Batch {b_idx+1} actor running (run {run_id}) — "
-            f"waiting for Playwright to render up to {expected_pages} page(s)..."
-        )
-
-        poll_count = 0
-        error_count = 0
-        MAX_POLL_ERRORS = 5
-        while True:
-            if _is_cancel_requested(scrape_run_id):
-                _abort_apify_run(run_id)
-                log(f"[Google Website Crawl] Cancelled mid-crawl — aborting batch {b_idx+1}")
-                break
-
-            try:
-                status = _poll_run_status(run_id)
-                error_count = 0  # reset on success
-            except Exception as e:
-                error_count += 1
-                log(f"[Google Website Crawl] Status check error for batch {b_idx+1} ({error_count}/{MAX_POLL_ERRORS}): {e}")
-                if error_count >= MAX_POLL_ERRORS:
-                    log(f"[Google Website Crawl] Batch {b_idx+1} — max poll errors reached, skipping batch")
-                    break
-                for _ in range(POLL_INTERVAL):
-                    if _is_cancel_requested(scrape_run_id):
-                        break
-                    time.sleep(1)
-                continue
+    def _run_batch(b_idx, batch, emit):
+        _crawl_batch(b_idx, batch, len(batches), scrape_run_id, log, emit)
 
-            poll_count += 1
-            if status == "SUCCEEDED":
-                log(
-                    f"[Google Website Crawl] Batch {b_idx+1} finished — "
-                    f"extracting contacts from crawled pages..."
-                )
-                break
-            elif status in ("FAILED", "ABORTED", "TIMED-OUT"):
-                log(
-                    f"[Google Website Crawl] Batch {b_idx+1} ended with status: {status} — "
-                    f"saving any partial results"
+    try:
+        for b_idx, pages in executor.run(batches, _run_batch):
+            batch_found = 0
+            for page in pages:
+                page_url  = page.get("url") or page.get("loadedUrl") or ""
+                page_text = (
+                    page.get("text") or
+                    page.get("markdown") or
+                    page.get("content") or
+                    ""
                 )
-                break
-            else:
-                if poll_count % 3 == 0:
-                    elapsed = poll_count * POLL_INTERVAL
-                    log(
-                        f"[Google Website Crawl] Batch {b_idx+1} still running "
-                        f"({elapsed}s elapsed, status: {status})..."
-                    )
+                if not page_url or not page_text:
+                    continue
 
-            for _ in range(POLL_INTERVAL):
-                if _is_cancel_requested(scrape_run_id):
-                    break
-                time.sleep(1)
-
-        try:
-            pages = _fetch_dataset(dataset_id)
-        except Exception as e:
-            log(f"[Google Website Crawl] Could not fetch dataset for batch {b_idx+1}: {e}")
-            continue
+                contacts = extract_page_contacts(page_text)
+                if not contacts["phones"] and not contacts["emails"]:
+                    continue
 
-        batch_found = 0
-        for page in pages:
-            page_url  = page.get("url") or page.get("loadedUrl") or ""
-            page_text = (
-                page.get("text") or
-                page.get("markdown") or
-                page.get("html") or
-                page.get("content") or
-                ""
-            )
-            if not page_url or not page_text:
-                continue
+                base     = _base_domain(page_url)
+                norm_key = _normalise_domain(base)
 
-            contacts = _extract_contacts(page_text)
-            if not contacts["phones"] and not contacts["emails"]:
-                continue
-
-            base     = _base_domain(page_url)
-            norm_key = _normalise_domain(base)
+                with contacts_lock:
+                    if norm_key not in contacts_map:
+                        contacts_map[norm_key] = {"phones": [], "emails": []}
+                    contacts_map[norm_key]["phones"] = list(dict.fromkeys(
+                        contacts_map[norm_key]["phones"] + contacts["phones"]
+                    ))[:5]
+                    contacts_map[norm_key]["emails"] = list(dict.fromkeys(
+                        contacts_map[norm_key]["emails"] + contacts["emails"]
+                    ))[:5]
+                batch_found += 1
 
             with contacts_lock:
-                if norm_key not in contacts_map:
-                    contacts_map[norm_key] = {"phones": [], "emails": []}
-                contacts_map[norm_key]["phones"] = list(dict.fromkeys(
-                    contacts_map[norm_key]["phones"] + contacts["phones"]
-                ))[:5]
-                contacts_map[norm_key]["emails"] = list(dict.fromkeys(
-                    contacts_map[norm_key]["emails"] + contacts["emails"]
-                ))[:5]
-            batch_found += 1
-
-        phones_found = sum(len(v["phones"]) for v in contacts_map.values())
-        emails_found = sum(len(v["emails"]) for v in contacts_map.values())
+                phones_found = sum(len(v["phones"]) for v in contacts_map.values())
+                emails_found = sum(len(v["emails"]) for v in contacts_map.values())
+                sites_found  = len(contacts_map)
+            log(
+                f"[Google Website Crawl] Batch {b_idx+1} complete — "
+                f"{batch_found}/{len(batches[b_idx])} site(s) yielded contacts "
+                f"(running totals: {phones_found} phone(s), {emails_found} email(s) "
+                f"across {sites_found} site(s))"
+            )
+
+            if enrich_callback and contacts_map:
+                try:
+                    with contacts_lock:
+                        snapshot = dict(contacts_map)
+                    enrich_callback(snapshot)
+                except Exception as e:
+                    log(f"[Google Website Crawl] Enrich callback error after batch {b_idx+1}: {e}")
+    finally:
+        total_sites  = len(contacts_map)
+        total_phones = sum(len(v["phones"]) for v in contacts_map.values())
+        total_emails = sum(len(v["emails"]) for v in contacts_map.values())
         log(
-            f"[Google Website Crawl] Batch {b_idx+1} complete — "
-            f"{batch_found}/{len(batch)} site(s) yielded contacts "
-            f"(running totals: {phones_found} phone(s), {emails_found} email(s) "
-            f"across {len(contacts_map)} site(s))"
+            f"[Google Website Crawl] All batches complete — "
+            f"{total_sites} site(s) with contact data, "
+            f"{total_phones} phone number(s), {total_emails} email address(es) extracted"
         )
-
-        if enrich_callback and contacts_map:
-            try:
-                with contacts_lock:
-                    snapshot = dict(contacts_map)
-                enrich_callback(snapshot)
-            except Exception as e:
-                log(f"[Google Website Crawl] Enrich callback error after batch {b_idx+1}: {e}")
-
-    total_sites  = len(contacts_map)
-    total_phones = sum(len(v["phones"]) for v in contacts_map.values())
-    total_emails = sum(len(v["emails"]) for v in contacts_map.values())
-    log(
-        f"[Google Website Crawl] All batches complete — "
-        f"{total_sites} site(s) with contact data, "
-        f"{total_phones} phone number(s), {total_emails} email address(es) extracted"
-    )
-    crawl_done.set()
+        crawl_done.set()
 
 
 def scrape_google_search_progressive(
@@ -399,48 +302,61 @@ def scrape_google_search_progressive(
     enrich_callback=None,
     progress_callback=None,
 ):
-    log = _log_fn or print
+    log        = _log_fn or print
+    checkpoint = get_checkpoint(scrape_run_id)
 
     for i, query in enumerate(queries):
-        if _is_cancel_requested(scrape_run_id):
+        if is_cancelled(scrape_run_id):
             log(f"[Google Search] Cancel requested — stopping before query {i+1}/{len(queries)}")
             return
 
+        if checkpoint.is_done("google", i):
+            log(f"[Google Search] Query {i+1}/{len(queries)} already done — skipping")
+            continue
+
         log(f"[Google Search] ── Query {i+1}/{len(queries)} ──────────────────────────")
-        log(
-            f"[Google Search] Searching: '{query} {location}' "
-            f"({max_pages} page(s) ≈ {max_pages * 10} results, "
-            f"AI Mode on, paid results on, "
-            f"leads enrichment {'on' if enrich_leads else 'off'})"
-        )
+        state = checkpoint.inflight("google", i)
 
-        payload = build_google_payload(
-            query, location,
-            max_pages=max_pages,
-            enrich_leads=enrich_leads,
-        )
-        try:
-            serp_result = _launch_actor(SERP_ACTOR_ID, payload, scrape_run_id)
-        except Exception as e:
-            log(f"[Google Search] Failed to launch SERP actor for query {i+1}: {e}")
-            continue
+        if state:
+            serp_run_id, serp_dataset_id = state["run_id"], state["dataset_id"]
+            log(f"[Google Search] Re-attaching to SERP run {serp_run_id} for '{query} {location}'")
+        else:
+            log(
+                f"[Google Search] Searching: '{query} {location}' "
+                f"({max_pages} page(s) ≈ {max_pages * 10} results, "
+                f"AI Mode on, paid results on, "
+                f"leads enrichment {'on' if enrich_leads else 'off'})"
+            )
 
-        if serp_result is None:
-            log("[Google Search] Cancelled while launching SERP actor — stopping")
-            return
+            payload = build_google_payload(
+                query, location,
+                max_pages=max_pages,
+                enrich_leads=enrich_leads,
+            )
+            try:
+                serp_result = _launch_actor(SERP_ACTOR_ID, payload, scrape_run_id)
+            except Exception as e:
+                log(f"[Google Search] Failed to launch SERP actor for query {i+1}: {e}")
+                continue
 
-        serp_run_id, serp_dataset_id = serp_result
-        log(f"[Google Search] SERP actor launched (run {serp_run_id}) — waiting for results...")
+            if serp_result is None:
+                log("[Google Search] Cancelled while launching SERP actor — stopping")
+                return
+
+            serp_run_id, serp_dataset_id = serp_result
+            checkpoint.start("google", i, serp_run_id, serp_dataset_id)
+            log(f"[Google Search] SERP actor launched (run {serp_run_id}) — waiting for results...")
 
         serp_pages = []
         serp_poll  = 0
+        serp_started = time.monotonic()
         serp_ok    = False
         serp_error_count = 0 
 
         while True:
-            if _is_cancel_requested(scrape_run_id):
+            if is_cancelled(scrape_run_id):
                 log("[Google Search] Cancel detected --- aborting SERP run")
-                _abort_apify_run(serp_run_id)
+                abort_actor(scrape_run_id, serp_run_id)
                 try:
                     serp_pages = _fetch_dataset(serp_dataset_id)
                 except Exception:
@@ -450,7 +366,7 @@ def scrape_google_search_progressive(
                 return
  
             try:
-                status = _poll_run_status(serp_run_id)
+                status = run_status(serp_run_id)
                 serp_error_count = 0
             except Exception as e:
                 serp_error_count += 1
@@ -458,23 +374,20 @@ def scrape_google_search_progressive(
                 if serp_error_count >= 5:
                     log(f"[Google Search] Max poll errors — skipping query {i+1}")
                     break
-                for _ in range(POLL_INTERVAL):
-                    if _is_cancel_requested(scrape_run_id):
-                        break
-                    time.sleep(1)
+                wait_cancelled(scrape_run_id, POLL_INTERVAL)
                 continue
  
             serp_poll += 1
  
             if serp_poll % 2 == 0:
-                count = _fetch_dataset_count(serp_dataset_id)
+                count = get_client().dataset_count(serp_dataset_id)
                 if count > 0 and progress_callback:
                     progress_callback(count)
  
                 # ── FIX: re-check cancel immediately after callback ──
-                if _is_cancel_requested(scrape_run_id):
+                if is_cancelled(scrape_run_id):
                     log("[Google Search] Cancel detected after progress callback --- aborting SERP run")
-                    _abort_apify_run(serp_run_id)
+                    abort_actor(scrape_run_id, serp_run_id)
                     try:
                         serp_pages = _fetch_dataset(serp_dataset_id)
                     except Exception:
@@ -485,7 +398,7 @@ def scrape_google_search_progressive(
  
                 if serp_poll % 4 == 0:
                     log(
-                        f"[Google Search] SERP running ({serp_poll * POLL_INTERVAL}s) --- "
+                        f"[Google Search] SERP running ({int(time.monotonic() - serp_started)}s) --- "
                         f"~{count} SERP page(s) collected so far..."
                     )
  
@@ -496,17 +409,16 @@ def scrape_google_search_progressive(
                 log(f"[Google Search] SERP actor ended with: {status}")
                 break
  
-            for _ in range(POLL_INTERVAL):
-                if _is_cancel_requested(scrape_run_id):
-                    break
-                time.sleep(1)
+            wait_for_actor(scrape_run_id, serp_run_id, POLL_INTERVAL)
         try:
             serp_pages = _fetch_dataset(serp_dataset_id)
         except Exception as e:
             log(f"[Google Search] Could not fetch SERP dataset: {e}")
             serp_pages = []
+            serp_ok    = False
 
         if not serp_ok:
+            # Left in flight, not done — a resume re-attaches to the SERP run
             if serp_pages:
                 log(f"[Google Search] SERP ended early — recovered {len(serp_pages)} page(s)")
                 yield {"serp_pages": serp_pages, "contacts_map": {}}
@@ -530,7 +442,7 @@ def scrape_google_search_progressive(
         crawl_done    = threading.Event()
         contacts_lock = threading.Lock()
 
-        if deep_scrape_sites and not _is_cancel_requested(scrape_run_id):
+        if deep_scrape_sites and not is_cancelled(scrape_run_id):
             urls_to_crawl = []
             seen_domains  = set()
 
@@ -600,6 +512,9 @@ def scrape_google_search_progressive(
             except Exception as e:
                 log(f"[Google Search] Final enrich callback error: {e}")
 
+        # SERP leads saved and crawl contacts applied — a resume skips this query
+        checkpoint.complete("google", i)
+
 
 
 
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .fuzzy_title import make_title_bucket_hash, prepare_title
+from .lead_record import LeadRecord
+from .lead_scorer import score_leads
+from .normalizer import content_hash_mode, normalize_craigslist_batch, normalize_facebook_batch
+
+CHUNK_SIZE  = 250    # items per task sent to a worker process
+MIN_OFFLOAD = 200    # smaller batches are cheaper to do in-process
+
+
+# ── Per-lead CPU work ─────────────────────────────────────────
+#
+# Everything below runs in worker processes, so it must stay free of
+# Django models and DB access — pure functions of the item only.
+
+def prepare_leads(leads: list[LeadRecord]) -> list[LeadRecord]:
+    """
+    Add the score, title bucket hash and title LSH prep to normalised
+    leads — the CPU work _lead_from_record and the fuzzy dedup would
+    otherwise redo on the ingest thread. The chunk is scored as a batch.
+    """
+    scores, reasons = score_leads(leads)
+    for lead, score, reason in zip(leads, scores, reasons):
+        title = lead.title
+        lead.score, lead.score_reason = score, reason
+        lead.title_ngram_hash = make_title_bucket_hash(title) if title else ""
+        lead.title_prepared   = prepare_title(title) if title else None
+    return leads
+
+
+def _craigslist_chunk(items: list, service_category: str, hash_mode: str) -> list[LeadRecord]:
+    out = prepare_leads(normalize_craigslist_batch(items, service_category, hash_mode))
+    for lead in out:
+        lead.raw = None   # the parent still has the item
+    return out
+
+
+def _facebook_chunk(items: list, service_category: str, location_str: str, zip_code, hash_mode: str) -> list[LeadRecord]:
+    out = prepare_leads(normalize_facebook_batch(items, service_category, location_str, zip_code, hash_mode))
+    for lead in out:
+        lead.raw = None
+    return out
+
+
+# ── Pool ──────────────────────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    n = getattr(settings, "PIPELINE_PROCESS_WORKERS", 0) or (os.cpu_count() or 2) - 1
+    return max(1, int(n))
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    One pool per process, shared by every run. Workers are spawned rather
+    than forked — the parent has DB connections and live threads.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _map_chunks(fn, items: list, *args) -> list[LeadRecord]:
+    """
+    Run fn over `items` in CHUNK_SIZE slices on the pool, keeping order,
+    and put each item back as its lead's raw payload. Falls back to doing
+    the work in-process if the pool has died.
+    """
+    if len(items) < MIN_OFFLOAD:
+        leads = fn(items, *args)
+    else:
+        try:
+            pool    = get_pool()
+            futures = [
+                pool.submit(fn, items[i:i + CHUNK_SIZE], *args)
+                for i in range(0, len(items), CHUNK_SIZE)
+            ]
+            leads = [lead for f in futures for lead in f.result()]
+        except BrokenProcessPool as e:
+            print(f"[Ingest pool] Worker pool broke ({e}) — normalising in-process")
+            shutdown_pool()
+            leads = fn(items, *args)
+
+    for lead, item in zip(leads, items):
+        lead.raw = item
+        lead.intern_strings()   # unpickled strings are fresh copies
+    return leads
+
+
+def normalize_craigslist_items(items: list, service_category: str) -> list[LeadRecord]:
+    """normalize_craigslist_batch() with score and title prep, on the pool."""
+    return _map_chunks(_craigslist_chunk, items, service_category, content_hash_mode())
+
+
+def normalize_facebook_items(
+    items: list,
+    service_category: str,
+    location_str: str,
+    zip_code: str | None = None,
+) -> list[LeadRecord]:
+    """normalize_facebook_batch() with score and title prep, on the pool."""
+    return _map_chunks(
+        _facebook_chunk, items, service_category, location_str, zip_code, content_hash_mode(),
+    )
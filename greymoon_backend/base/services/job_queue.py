@@ -0,0 +1,293 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from .cancellation import detach_run
+from .run_events import log_event
+
+LEASE_SECONDS  = 60     # a job whose lease runs out is treated as abandoned
+CLAIM_RETRIES  = 5      # optimistic claim attempts before giving up for this poll
+
+RESUMABLE_STATUSES = ("RUNNING", "FAILED")
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _lease_seconds() -> int:
+    return getattr(settings, "PIPELINE_JOB_LEASE", LEASE_SECONDS)
+
+
+_worker_process = False   # set by run_workers — jobs queued here are left to its slots
+
+
+def worker_name(slot=0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{slot}"
+
+
+def mark_worker_process() -> None:
+    """Called by run_workers: this process runs jobs from its own slots."""
+    global _worker_process
+    _worker_process = True
+
+
+def enqueue_pipeline(scrape_run_id, **kwargs):
+    """
+    Queue one run_pipeline call for the workers; returns the PipelineJob.
+    With PIPELINE_IN_PROCESS_WORKER on (the default, for deployments that
+    don't run `manage.py run_workers`) the queuing process also starts a
+    thread that claims and runs the job once the row is committed.
+    """
+    from base.models import PipelineJob
+    job = PipelineJob.objects.create(
+        run_id=scrape_run_id,
+        kwargs=kwargs,
+        max_attempts=getattr(settings, "PIPELINE_JOB_MAX_ATTEMPTS", 2),
+    )
+    if getattr(settings, "PIPELINE_IN_PROCESS_WORKER", False) and not _worker_process:
+        transaction.on_commit(lambda: run_in_process(job.pk))
+    return job
+
+
+def run_in_process(job_pk) -> threading.Thread:
+    """Claim and run one job on a new thread of this process."""
+    def _run():
+        try:
+            job = claim_job(worker_name("web"), job_pk=job_pk)
+            if job is not None:
+                run_job(job)
+        except Exception as e:
+            print(f"[Jobs] In-process run of job {job_pk} failed: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=_run, name=f"pipeline-job-{job_pk}")
+    thread.start()
+    return thread
+
+
+def cancel_queued(scrape_run_id) -> int:
+    """Drop a run's jobs that no worker has picked up yet."""
+    from base.models import PipelineJob
+    return PipelineJob.objects.filter(run_id=scrape_run_id, status="QUEUED").update(
+        status="CANCELLED", finished_at=_now(),
+    )
+
+
+# ── Resuming ──────────────────────────────────────────────────
+def _live(now) -> Q:
+    # Jobs still waiting, or held by a worker that keeps renewing its lease
+    return Q(status="QUEUED") | Q(status="RUNNING", lease_expires_at__gte=now)
+
+
+def stalled_runs():
+    """RUNNING runs that no live job is working on — their process died."""
+    from base.models import PipelineJob, ScrapeRun
+    live = PipelineJob.objects.filter(_live(_now())).values("run_id")
+    return ScrapeRun.objects.filter(status="RUNNING", cancel_requested=False).exclude(pk__in=live)
+
+
+def resume_run(scrape_run_id):
+    """
+    Queue an interrupted run to pick up from its checkpoint, with the
+    arguments of its last job. Returns the PipelineJob, or None if the run
+    is finished, cancelled or still has a live job.
+    """
+    from base.models import PipelineJob, ScrapeRun
+
+    run = ScrapeRun.objects.filter(pk=scrape_run_id).first()
+    if run is None or run.cancel_requested or run.status not in RESUMABLE_STATUSES:
+        return None
+
+    now = _now()
+    if PipelineJob.objects.filter(_live(now), run_id=run.pk).exists():
+        return None
+
+    # A job left RUNNING by a dead worker would otherwise be reclaimed too
+    PipelineJob.objects.filter(run_id=run.pk, status="RUNNING").update(
+        status="FAILED", error="Lease expired — superseded by a resume",
+        finished_at=now, lease_expires_at=None,
+    )
+
+    last = PipelineJob.objects.filter(run_id=run.pk).order_by("-created_at").first()
+    if last is not None:
+        kwargs = dict(last.kwargs)
+    else:
+        kwargs = {
+            "location_type":       run.location_type,
+            "location_value":      run.location_value,
+            "categories":          run.categories or [],
+            "sources":             run.sources or [],
+            "max_posts_per_group": run.max_posts_per_group,
+            "fb_group_urls":       [],
+            "google_max_pages":    run.google_max_pages,
+            "google_deep_scrape":  run.google_deep_scrape,
+            "max_leads":           run.max_leads,
+        }
+    kwargs["resume"] = True
+
+    ScrapeRun.objects.filter(pk=run.pk).update(
+        status="RUNNING",
+        finished_at=None,
+        current_stage="Queued",
+        stage_detail="Waiting for a worker to resume the run…",
+    )
+    return enqueue_pipeline(run.pk, **kwargs)
+
+
+# ── Claiming ──────────────────────────────────────────────────
+def _claimable(now) -> Q:
+    # Queued jobs, plus running ones whose worker stopped renewing its lease
+    return Q(status="QUEUED") | Q(status="RUNNING", lease_expires_at__lt=now)
+
+
+def _give_up(job_pk, run_pk, attempts: int) -> None:
+    from base.models import PipelineJob
+    from .pipeline import _mark_run_failed
+
+    reason = f"Worker lost after {attempts} attempt(s) — run abandoned."
+    PipelineJob.objects.filter(pk=job_pk).update(status="FAILED", error=reason, finished_at=_now())
+    _mark_run_failed(run_pk, reason)
+    print(f"[Jobs] Job {job_pk} failed: {reason}")
+
+
+def claim_job(worker_id: str, lease_seconds: int = None, job_pk=None):
+    """
+    Lease the oldest claimable job to `worker_id` — or only job `job_pk`,
+    if given — or return None.
+
+    On Postgres the candidate row is locked with FOR UPDATE SKIP LOCKED, so
+    concurrent workers never wait on each other. Elsewhere (SQLite) the
+    claim is a compare-and-set UPDATE on the row's previous lease token —
+    writes are serialised, so exactly one worker's UPDATE matches.
+    """
+    from base.models import PipelineJob
+
+    lease_seconds = lease_seconds or _lease_seconds()
+    jobs          = PipelineJob.objects.filter(pk=job_pk) if job_pk else PipelineJob.objects.all()
+
+    for _ in range(CLAIM_RETRIES):
+        now = _now()
+        lease = {
+            "status":           "RUNNING",
+            "worker_id":        worker_id,
+            "lease_token":      uuid.uuid4().hex,
+            "lease_expires_at": now + timedelta(seconds=lease_seconds),
+            "started_at":       now,
+            "attempts":         F("attempts") + 1,
+        }
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                job = (
+                    jobs.select_for_update(skip_locked=True)
+                    .filter(_claimable(now)).order_by("created_at").first()
+                )
+                if job is None:
+                    return None
+                if job.attempts >= job.max_attempts:
+                    _give_up(job.pk, job.run_id, job.attempts)
+                    continue
+                PipelineJob.objects.filter(pk=job.pk).update(**lease)
+        else:
+            job = jobs.filter(_claimable(now)).order_by("created_at").first()
+            if job is None:
+                return None
+            if job.attempts >= job.max_attempts:
+                _give_up(job.pk, job.run_id, job.attempts)
+                continue
+            won = PipelineJob.objects.filter(
+                pk=job.pk, status=job.status, lease_token=job.lease_token,
+            ).update(**lease)
+            if not won:
+                continue
+
+        job.refresh_from_db()
+        return job
+    return None
+
+
+def renew_lease(job, lease_seconds: int = None) -> bool:
+    """Extend the lease; False if another worker has taken the job over."""
+    from base.models import PipelineJob
+    expires = _now() + timedelta(seconds=lease_seconds or _lease_seconds())
+    return bool(
+        PipelineJob.objects.filter(pk=job.pk, lease_token=job.lease_token, status="RUNNING")
+        .update(lease_expires_at=expires)
+    )
+
+
+def finish_job(job, status: str = "DONE", error: str = "") -> None:
+    from base.models import PipelineJob
+    PipelineJob.objects.filter(pk=job.pk, lease_token=job.lease_token).update(
+        status=status, error=error[:2000], finished_at=_now(), lease_expires_at=None,
+    )
+
+
+# ── Running ───────────────────────────────────────────────────
+def run_job(job, lease_seconds: int = None) -> None:
+    """
+    Execute a claimed job, renewing its lease until run_pipeline returns.
+    If the lease is lost — another worker reclaimed the job after missed
+    renewals — the run is detached here, so this worker stops and leaves
+    the run, its checkpoint and its actors to the new owner.
+    """
+    from base.models import ScrapeRun
+    from .pipeline import _mark_run_failed, run_pipeline
+
+    lease_seconds = lease_seconds or _lease_seconds()
+    stop          = threading.Event()
+    lost          = threading.Event()
+
+    def _heartbeat():
+        try:
+            while not stop.wait(lease_seconds / 3):
+                if not renew_lease(job, lease_seconds):
+                    lost.set()
+                    log_event(
+                        job.run_id, "Worker — lease lost",
+                        f"Job {job.pk} was taken over by another worker; stopping on {job.worker_id}.",
+                        level="warning",
+                    )
+                    detach_run(job.run_id)
+                    return
+        except Exception as e:
+            log_event(
+                job.run_id, "Worker — lease renewal failed",
+                f"Job {job.pk} on {job.worker_id}: {e}", level="error",
+            )
+        finally:
+            connection.close()
+
+    if ScrapeRun.objects.filter(pk=job.run_id, cancel_requested=True).exists():
+        finish_job(job, "CANCELLED")
+        return
+
+    heartbeat = threading.Thread(target=_heartbeat, name=f"lease-{job.pk}", daemon=True)
+    heartbeat.start()
+    print(f"[Jobs] Job {job.pk} (run {job.run_id}) started on {job.worker_id}, attempt {job.attempts}")
+    try:
+        # A retry after a lost worker resumes from the run's checkpoint
+        kwargs = {**job.kwargs, "resume": job.kwargs.get("resume", False) or job.attempts > 1}
+        run_pipeline(scrape_run_id=job.run_id, **kwargs)
+        if lost.is_set():
+            print(f"[Jobs] Job {job.pk} stopped — lease lost to another worker")
+            return
+        finish_job(job, "DONE")
+        print(f"[Jobs] Job {job.pk} done")
+    except Exception as e:
+        if lost.is_set():
+            print(f"[Jobs] Job {job.pk} stopped — lease lost to another worker")
+            return
+        print(f"[Jobs] Job {job.pk} failed: {e}")
+        finish_job(job, "FAILED", error=str(e))
+        _mark_run_failed(job.run_id, str(e)[:500])
+    finally:
+        stop.set()
@@ -0,0 +1,215 @@
+import re
+
+from .platform_domains import SKIP_DOMAINS
+
+# ── Canonical contact keys ────────────────────────────────────
+#
+# The same contractor posts on Craigslist, in Facebook groups and has a
+# website Google finds. Leads that share a phone, an email or a business
+# domain are one LeadEntity. Keys are canonicalised at normalise time and
+# stored (indexed) on ServiceLead, so resolving a new lead is a handful of
+# index lookups, never a scan over other leads.
+
+_DIGITS = re.compile(r"\D+")
+
+# Webmail domains say nothing about the business behind an address
+FREEMAIL_DOMAINS = {
+    "gmail.com", "googlemail.com", "yahoo.com", "ymail.com", "hotmail.com",
+    "outlook.com", "live.com", "msn.com", "aol.com", "icloud.com", "me.com",
+    "mac.com", "comcast.net", "att.net", "sbcglobal.net", "verizon.net",
+    "proton.me", "protonmail.com", "gmx.com", "mail.com", "zoho.com",
+}
+
+# Platforms, directories and site builders — a lead on one is not that
+# company's website
+PLATFORM_DOMAINS = SKIP_DOMAINS | {
+    "fb.com", "instagr.am", "youtu.be", "lnkd.in",
+    "wixsite.com", "squarespace.com", "wordpress.com", "godaddysites.com",
+    "weebly.com", "blogspot.com",
+}
+
+# Public suffixes with two labels that show up in lead data; anything else
+# is treated as a one-label TLD (example.com, example.us)
+_TWO_LABEL_SUFFIXES = {
+    "co.uk", "org.uk", "me.uk", "com.au", "net.au", "org.au",
+    "co.nz", "com.mx", "com.br", "co.in", "co.za", "ca.us",
+}
+
+
+def canonical_phone(phone) -> str:
+    """E.164 (+15551234567) for a North American number; "" if it isn't one."""
+    if not phone:
+        return ""
+    digits = _DIGITS.sub("", str(phone))
+    if len(digits) == 11 and digits[0] == "1":
+        digits = digits[1:]
+    # NANP: area code and exchange never start with 0 or 1
+    if len(digits) != 10 or digits[0] in "01" or digits[3] in "01":
+        return ""
+    return f"+1{digits}"
+
+
+def canonical_email(email) -> str:
+    if not email or "@" not in email:
+        return ""
+    return str(email).strip().strip(".").lower()
+
+
+def registrable_domain(host_or_url) -> str:
+    """example.com from https://www.shop.example.com/x — "" for platforms and bare hosts."""
+    if not host_or_url:
+        return ""
+    host = str(host_or_url).strip().lower()
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split("?", 1)[0].split(":", 1)[0].rsplit("@", 1)[-1].strip(".")
+
+    labels = host.split(".")
+    if len(labels) < 2 or not all(labels):
+        return ""
+    keep   = 3 if ".".join(labels[-2:]) in _TWO_LABEL_SUFFIXES else 2
+    domain = ".".join(labels[-keep:])
+    if len(labels) < keep or domain in PLATFORM_DOMAINS:
+        return ""
+    return domain
+
+
+def entity_keys(phone=None, email=None, url=None) -> tuple[str, str, str]:
+    """
+    (phone_e164, email_norm, domain). The domain comes from the lead's own
+    URL when that is a business site, else from a non-webmail email.
+    """
+    email_norm = canonical_email(email)
+    domain     = registrable_domain(url)
+    if not domain and email_norm:
+        email_domain = registrable_domain(email_norm.rsplit("@", 1)[1])
+        if email_domain not in FREEMAIL_DOMAINS:
+            domain = email_domain
+    return canonical_phone(phone), email_norm, domain
+
+
+def set_entity_keys(record) -> None:
+    """Fill a LeadRecord's canonical key fields from its phone, email and url."""
+    record.phone_e164, record.email_norm, record.domain = entity_keys(
+        record.phone, record.email, record.url,
+    )
+
+
+# ── Union-find ────────────────────────────────────────────────
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, node):
+        parent = self.parent.setdefault(node, node)
+        while parent != node:
+            grand = self.parent[parent]
+            self.parent[node] = grand     # path halving
+            node, parent = parent, grand
+        return node
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+KEY_FIELDS = ("phone_e164", "email_norm", "domain")
+
+
+def link_lead_entities(rows) -> int:
+    """
+    Attach freshly written leads to LeadEntity clusters.
+
+    `rows` is an iterable of (lead pk, phone_e164, email_norm, domain).
+    Leads and keys are unioned in memory; every existing entity already
+    holding one of the keys is found with one indexed lookup per key
+    column and joins the union. Each resulting component keeps its
+    lowest entity id — other entities in it are merged into that one —
+    or gets a new entity if it touched none. Leads with no keys are left
+    unlinked. Call inside the transaction that wrote the leads.
+
+    Returns the number of leads linked.
+    """
+    from base.models import LeadEntity, ServiceLead
+    from django.db.models import Count
+
+    rows = [row for row in rows if any(row[1:])]
+    if not rows:
+        return 0
+
+    uf     = _UnionFind()
+    values = {field: set() for field in KEY_FIELDS}
+    for pk, *keys in rows:
+        uf.find(("lead", pk))
+        for field, value in zip(KEY_FIELDS, keys):
+            if value:
+                values[field].add(value)
+                uf.union(("lead", pk), (field, value))
+
+    # A lead being relinked (new contact keys) stays with its current entity
+    current = (
+        ServiceLead.objects
+        .filter(pk__in=[row[0] for row in rows], entity__isnull=False)
+        .values_list("pk", "entity_id")
+    )
+    for pk, entity_id in current:
+        uf.union(("entity", entity_id), ("lead", pk))
+
+    for field, wanted in values.items():
+        if not wanted:
+            continue
+        existing = (
+            ServiceLead.objects
+            .filter(**{f"{field}__in": wanted}, entity__isnull=False)
+            .values_list("entity_id", field).distinct()
+        )
+        for entity_id, value in existing:
+            uf.union(("entity", entity_id), (field, value))
+
+    # ── Components ─────────────────────────────────────────────
+    components = {}
+    for node in list(uf.parent):
+        comp = components.setdefault(uf.find(node), {"leads": [], "entities": [], "keys": {}})
+        kind, value = node
+        if kind == "lead":
+            comp["leads"].append(value)
+        elif kind == "entity":
+            comp["entities"].append(value)
+        else:
+            comp["keys"].setdefault(kind, value)
+
+    components = [c for c in components.values() if c["leads"]]
+
+    fresh = [c for c in components if not c["entities"]]
+    for comp, entity in zip(fresh, LeadEntity.objects.bulk_create(
+        [LeadEntity(**comp["keys"]) for comp in fresh]
+    )):
+        comp["entities"].append(entity.pk)
+
+    assignments = []
+    roots       = {}
+    for comp in components:
+        root, *merged = sorted(comp["entities"])
+        if merged:
+            ServiceLead.objects.filter(entity_id__in=merged).update(entity_id=root)
+            LeadEntity.objects.filter(pk__in=merged).delete()
+        roots[root] = comp["keys"]
+        assignments.extend(ServiceLead(pk=pk, entity_id=root) for pk in comp["leads"])
+
+    ServiceLead.objects.bulk_update(assignments, ["entity_id"], batch_size=500)
+
+    # ── Entity summaries ───────────────────────────────────────
+    counts   = dict(
+        ServiceLead.objects.filter(entity_id__in=roots)
+        .values_list("entity_id").annotate(n=Count("pk"))
+    )
+    entities = list(LeadEntity.objects.filter(pk__in=roots))
+    for entity in entities:
+        entity.lead_count = counts.get(entity.pk, 0)
+        for field, value in roots[entity.pk].items():
+            if not getattr(entity, field):
+                setattr(entity, field, value)
+    LeadEntity.objects.bulk_update(entities, ["lead_count", *KEY_FIELDS], batch_size=500)
+
+    return len(assignments)
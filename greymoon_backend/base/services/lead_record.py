@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from sys import intern
+from typing import Any
+
+
+def parse_datetime(value) -> datetime | None:
+    """ISO 8601 string (trailing Z allowed) to datetime; None if absent or unparseable."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_coord(value) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True, eq=False)
+class LeadRecord:
+    """
+    One normalised lead on its way from a normalizer through dedup and
+    scoring to a ServiceLead row. Values are parsed once at normalisation
+    — datetime, float coordinates — and the repeated source/category
+    strings are interned.
+
+    `raw` is the source payload, or a zero-argument callable that builds
+    it; `raw_json` materialises it on first read, so a lead dropped by
+    dedup never builds its payload.
+    """
+
+    post_id:             str
+    url:                 str
+    title:               str
+    post:                str
+    source:              str
+    service_category:    str
+    category:            str
+    phone:               str | None      = None
+    email:               str | None      = None
+    location:            str             = ""
+    state:               str             = ""
+    latitude:            float | None    = None
+    longitude:           float | None    = None
+    map_accuracy:        str             = ""
+    datetime:            datetime | None = None
+    zip_code:            str             = ""
+    fb_group_name:       str             = ""
+    fb_group_url:        str             = ""
+    content_hash:        str             = ""
+    legacy_content_hash: str | None      = None
+    raw:                 Any             = None
+
+    # Canonical contact keys (lead_entities.set_entity_keys)
+    phone_e164:          str             = ""
+    email_norm:          str             = ""
+    domain:              str             = ""
+
+    # Filled in by ingest_pool.prepare_leads when the batch is scored off-thread
+    score:               int | None      = None
+    score_reason:        dict | None     = None
+    title_ngram_hash:    str | None      = None
+    title_prepared:      tuple | None    = None
+
+    def __post_init__(self):
+        self.intern_strings()
+
+    def intern_strings(self) -> None:
+        """Share one copy of the low-cardinality strings across every lead."""
+        self.source           = intern(self.source)
+        self.service_category = intern(self.service_category or "")
+        self.category         = intern(self.category or "")
+
+    @property
+    def raw_json(self):
+        if callable(self.raw):
+            self.raw = self.raw()
+        return self.raw
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LeadRecord":
+        """From a normalised-lead dict in the old shape (or a raw item with the same keys)."""
+        known = {f.name for f in fields(cls)}
+        record = cls(
+            post_id=str(data.get("post_id") or ""),
+            url=data.get("url") or "",
+            title=data.get("title") or "",
+            post=data.get("post") or "",
+            source=data.get("source") or "CRAIGSLIST",
+            service_category=data.get("service_category") or "",
+            category=data.get("category") or "",
+            raw=data.get("raw_json"),
+        )
+        for key, value in data.items():
+            if key in known and key not in ("post_id", "url", "title", "post", "source",
+                                            "service_category", "category"):
+                setattr(record, key, value)
+        record.latitude  = parse_coord(data.get("latitude"))
+        record.longitude = parse_coord(data.get("longitude"))
+        record.datetime  = parse_datetime(data.get("datetime"))
+        return record
@@ -1,5 +1,8 @@
+import re
 from datetime import datetime, timezone
 
+from .lead_record import LeadRecord
+
 HIGH_VALUE_KEYWORDS = [
     "emergency",
     "urgent",
@@ -21,66 +24,143 @@ PREMIUM_CATEGORIES = [
     "waste_management",
 ]
 
+# ── Keyword automaton ─────────────────────────────────────────
+#
+# The keywords are compiled once into a single regex shaped like a prefix
+# trie (i(?:mmediately|nsured)|...), so a lead's text is scanned once
+# instead of once per keyword. At any one position the longest keyword
+# wins; _IMPLIED adds back the keywords inside it, so the matched set is
+# exactly the keywords that occur in the text. If the list ever holds two
+# keywords that can overlap ("ab", "bc"), matching switches to a
+# lookahead so overlapping hits are all seen.
+
+
+def _trie_pattern(words) -> str:
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        ends     = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends else body
+
+    return build(trie)
+
+
+def _can_overlap(words) -> bool:
+    return any(
+        a[i:] == b[:len(a) - i]
+        for a in words for b in words
+        for i in range(1, len(a)) if len(a) - i < len(b)
+    )
+
+
+def _compile_keywords(words) -> re.Pattern:
+    pattern = _trie_pattern(words)
+    return re.compile(f"(?=({pattern}))" if _can_overlap(words) else pattern)
+
+
+KEYWORD_RE = _compile_keywords(HIGH_VALUE_KEYWORDS)
+_KEYWORDS  = tuple(dict.fromkeys(HIGH_VALUE_KEYWORDS))
+_IMPLIED   = {w: {v for v in _KEYWORDS if v in w} for w in _KEYWORDS}
+_PREMIUM   = frozenset(PREMIUM_CATEGORIES)
+
+
+def _keywords(text: str) -> set[str]:
+    """The distinct keywords in `text`, case-insensitively."""
+    found = set()
+    for word in KEYWORD_RE.findall(text.lower()):
+        found |= _IMPLIED[word]
+    return found
+
+
+def score_leads(records, scored_at=None) -> tuple[list[int], list[dict]]:
+    """
+    Score a batch of leads — LeadRecords, or ServiceLead rows, which have
+    the same attribute names — and return (scores, reasons) as lists
+    parallel to `records`.
 
-def calculate_lead_score(item: dict) -> tuple[int, dict]:
-
-    score = 0
-    reasons = {}
-
-    source = item.get("source", "CRAIGSLIST")
-    title = (item.get("title") or "").lower()
-    description = (item.get("post") or "").lower()
-    combined_text = title + " " + description
-
-    if item.get("phone"):
-        score += 30
-        reasons["phone"] = 30
-
-    if item.get("email"):
-        score += 15
-        reasons["email"] = 15
-
-    if item.get("latitude") and item.get("longitude"):
-        score += 10
-        reasons["geolocation"] = 10
-    elif item.get("location"):
-        score += 3
-        reasons["location_text"] = 3
-
-    if item.get("service_category") in PREMIUM_CATEGORIES or \
-       item.get("category") in PREMIUM_CATEGORIES:
-        score += 10
-        reasons["premium_category"] = 10
-
-    matched_keywords = [w for w in HIGH_VALUE_KEYWORDS if w in combined_text]
-    if matched_keywords:
-        keyword_score = min(len(matched_keywords) * 5, 20)
-        score += keyword_score
-        reasons["keywords"] = keyword_score
-
-    post_date = item.get("datetime")
-    if post_date:
-        try:
-            dt = datetime.fromisoformat(str(post_date).replace("Z", "+00:00"))
-            age_hours = (datetime.now(timezone.utc) - dt).total_seconds() / 3600
-            if age_hours < 24:
-                score += 15
-                reasons["freshness_24h"] = 15
-            elif age_hours < 72:
-                score += 8
-                reasons["freshness_72h"] = 8
-        except Exception:
-            pass
-
-    if source == "FACEBOOK":
-        if item.get("phone") and item.get("location"):
-            score += 5
-            reasons["fb_contact_with_location"] = 5
-
-    elif source == "CRAIGSLIST":
-        if item.get("map_accuracy"):
+    Freshness is measured against `scored_at`: now by default, or a list
+    of datetimes parallel to `records` (rescore_leads passes each row's
+    created_at, so a rescore doesn't strip freshness from old leads).
+    """
+    now = datetime.now(timezone.utc)
+    if scored_at is None or isinstance(scored_at, datetime):
+        scored_at = [scored_at or now] * len(records)
+
+    scores, reasons_out = [], []
+
+    for item, at in zip(records, scored_at):
+        score = 0
+        reasons = {}
+
+        source = item.source
+
+        if item.phone:
+            score += 30
+            reasons["phone"] = 30
+
+        if item.email:
+            score += 15
+            reasons["email"] = 15
+
+        if item.latitude and item.longitude:
+            score += 10
+            reasons["geolocation"] = 10
+        elif item.location:
             score += 3
-            reasons["cl_map_accuracy"] = 3
+            reasons["location_text"] = 3
+
+        if item.service_category in _PREMIUM or item.category in _PREMIUM:
+            score += 10
+            reasons["premium_category"] = 10
+
+        # Newline-joined so no keyword can match across title and post
+        matched_keywords = _keywords(f"{item.title or ''}\n{item.post or ''}")
+        if matched_keywords:
+            keyword_score = min(len(matched_keywords) * 5, 20)
+            score += keyword_score
+            reasons["keywords"] = keyword_score
+
+        dt = item.datetime
+        if dt:
+            try:
+                age_hours = ((at or now) - dt).total_seconds() / 3600
+                if age_hours < 24:
+                    score += 15
+                    reasons["freshness_24h"] = 15
+                elif age_hours < 72:
+                    score += 8
+                    reasons["freshness_72h"] = 8
+            except Exception:
+                pass
+
+        if source == "FACEBOOK":
+            if item.phone and item.location:
+                score += 5
+                reasons["fb_contact_with_location"] = 5
+
+        elif source == "CRAIGSLIST":
+            if item.map_accuracy:
+                score += 3
+                reasons["cl_map_accuracy"] = 3
+
+        scores.append(min(score, 100))
+        reasons_out.append(reasons)
+
+    return scores, reasons_out
+
 
-    score = min(score, 100)
-    return score, reasons
\ No newline at end of file
+def calculate_lead_score(item) -> tuple[int, dict]:
+    """Score one LeadRecord (a lead dict is converted first)."""
+    if isinstance(item, dict):
+        item = LeadRecord.from_dict(item)
+    scores, reasons = score_leads([item])
+    return scores[0], reasons[0]
@@ -1,91 +1,111 @@
 
 
 import hashlib
-import re
 import json
 
-def _extract_emails(text: str) -> str | None:
-    if not text:
-        return None
-    matches = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
-    return matches[0] if matches else None
+from .lead_entities import set_entity_keys
+from .lead_record import LeadRecord, parse_coord, parse_datetime
+from .text_kernel import extract_contacts_many, extract_zip, normalize_title
 
+# ── Content hashing ───────────────────────────────────────────
+#
+#   fast    blake2b-128 over the fields joined with a separator
+#   legacy  sha256 over sorted-key JSON — what every row before the
+#           switch was stored with
+#   compat  stores the fast hash, and also hands _save_lead_batch the
+#           legacy one (LeadRecord.legacy_content_hash) so rows written
+#           before the switch still dedup. Run `manage.py rehash_leads`,
+#           then move to fast.
 
-def _extract_phones(text: str) -> str | None:
-    if not text:
-        return None
-    matches = re.findall(
-        r"(\+?1?\s?[\(\-]?\d{3}[\)\-\s]?\s?\d{3}[\-\s]?\d{4})", text
-    )
-    return matches[0].strip() if matches else None
+HASH_MODES        = ("compat", "fast", "legacy")
+DEFAULT_HASH_MODE = "compat"
+HASH_SEP          = "\x1f"
+
+
+def content_hash_mode() -> str:
+    from django.conf import settings
+    mode = getattr(settings, "CONTENT_HASH_MODE", DEFAULT_HASH_MODE)
+    return mode if mode in HASH_MODES else DEFAULT_HASH_MODE
 
 
 def _content_hash(data: dict) -> str:
     key = json.dumps(data, sort_keys=True, default=str)
     return hashlib.sha256(key.encode()).hexdigest()
 
-def normalize_craigslist(item: dict, service_category: str) -> dict:
-    description = item.get("post") or item.get("description") or ""
-    title = item.get("title") or ""
-
-    phone_from_field = None
-    phones = item.get("phoneNumbers", [])
-    if phones:
-        phone_from_field = phones[0] if isinstance(phones[0], str) else str(phones[0])
-
-    phone = phone_from_field or _extract_phones(description)
-    email = _extract_emails(description)
-
-    post_id = str(item.get("id") or item.get("postId") or "")
-    url = item.get("url") or ""
-
-    normalized = {
-        "post_id":          post_id or _content_hash({"url": url, "title": title}),
-        "url":              url,
-        "title":            title,
-        "post":             description,
-        "phone":            phone,
-        "email":            email,
-        "location":         item.get("location") or item.get("city") or "",
-        "category":         item.get("category") or service_category,
-        "service_category": service_category,
-        "state":            item.get("state") or "",
-        "latitude":         str(item.get("latitude") or ""),
-        "longitude":        str(item.get("longitude") or ""),
-        "map_accuracy":     str(item.get("mapAccuracy") or ""),
-        "datetime":         item.get("datetime") or item.get("date") or None,
-        "source":           "CRAIGSLIST",
-        "zip_code":         item.get("zip_code") or "",
-        "raw_json":         item,
-    }
-
-    normalized["content_hash"] = _content_hash({
-        "title_norm": _normalize_title(title),
-        "post":  description[:300],   # remove url from hash — url varies, content doesn't
-    })
-
-    return normalized
-
-
-import re
-
-def _normalize_title(title: str) -> str:
-    """Lowercase, strip punctuation/whitespace for fuzzy title comparison."""
-    if not title:
-        return ""
-    t = title.lower().strip()
-    t = re.sub(r'[\W_]+', ' ', t)   # replace non-alphanumeric with space
-    t = re.sub(r'\s+', ' ', t).strip()
-    return t
 
-def normalize_facebook(
-    item: dict,
-    service_category: str,
-    location_str: str,
-    zip_code: str | None = None,
-) -> dict:
+def fast_hash(*parts: str) -> str:
+    return hashlib.blake2b(HASH_SEP.join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _derived_post_id(mode: str, fields: dict) -> str:
+    """post_id for items Apify gave none — a hash of the identifying fields."""
+    if mode == "legacy":
+        return _content_hash(fields)
+    return fast_hash(*fields.values())
+
+
+def _set_content_hash(lead: LeadRecord, mode: str, title: str, post: str) -> None:
+    title_norm = normalize_title(title)
+    if mode == "legacy":
+        lead.content_hash = _content_hash({"title_norm": title_norm, "post": post})
+        return
+    lead.content_hash = fast_hash(title_norm, post)
+    if mode == "compat":
+        lead.legacy_content_hash = _content_hash({"title_norm": title_norm, "post": post})
+
+
+# ── Craigslist ────────────────────────────────────────────────
+def normalize_craigslist_batch(items: list, service_category: str, hash_mode: str = None) -> list[LeadRecord]:
+    """Normalise a whole Apify batch of Craigslist items, contacts scanned in one pass."""
+    mode         = hash_mode or content_hash_mode()
+    descriptions = [item.get("post") or item.get("description") or "" for item in items]
+    out          = []
+
+    for item, description, (phone, email) in zip(items, descriptions, extract_contacts_many(descriptions)):
+        title = item.get("title") or ""
+
+        phones = item.get("phoneNumbers")
+        if phones:
+            phone = phones[0] if isinstance(phones[0], str) else str(phones[0])
+
+        post_id = str(item.get("id") or item.get("postId") or "")
+        url = item.get("url") or ""
+
+        normalized = LeadRecord(
+            post_id=post_id or _derived_post_id(mode, {"url": url, "title": title}),
+            url=url,
+            title=title,
+            post=description,
+            phone=phone,
+            email=email,
+            location=item.get("location") or item.get("city") or "",
+            category=item.get("category") or service_category,
+            service_category=service_category,
+            state=item.get("state") or "",
+            latitude=parse_coord(item.get("latitude")),
+            longitude=parse_coord(item.get("longitude")),
+            map_accuracy=str(item.get("mapAccuracy") or ""),
+            datetime=parse_datetime(item.get("datetime") or item.get("date")),
+            source="CRAIGSLIST",
+            zip_code=item.get("zip_code") or "",
+            raw=item,
+        )
+
+        # url left out of the hash — url varies, content doesn't
+        _set_content_hash(normalized, mode, title, description[:300])
+        set_entity_keys(normalized)
+        out.append(normalized)
+
+    return out
+
 
-    text = (
+def normalize_craigslist(item: dict, service_category: str) -> LeadRecord:
+    return normalize_craigslist_batch([item], service_category)[0]
+
+
+# ── Facebook ──────────────────────────────────────────────────
+def _facebook_text(item: dict) -> str:
+    return (
         item.get("text")
         or item.get("postText")
         or item.get("message")
@@ -93,80 +113,90 @@ def normalize_facebook(
         or ""
     )
 
-    author     = item.get("authorName") or item.get("author") or "Unknown"
-    group_name = (
-        item.get("groupName") or item.get("group") or
-        item.get("groupTitle") or item.get("group_name") or ""
-    )
-    group_url = (
-        item.get("groupUrl") or item.get("group_url") or
-        item.get("groupLink") or item.get("inputUrl") or   # ADD inputUrl
-        item.get("input_url") or ""
-    )
-
-    post_url = (
-        item.get("url")
-        or item.get("postUrl")
-        or item.get("link")
-        or ""
-    )
-
-    post_id = str(
-        item.get("id")
-        or item.get("postId")
-        or item.get("fbId")
-        or ""
-    )
-    title = (
-        item.get("title")
-        or (text[:120].replace("\n", " ").strip() if text else f"Post by {author}")
-    )
 
-    phone = _extract_phones(text)
-    email = _extract_emails(text)
+def normalize_facebook_batch(
+    items: list,
+    service_category: str,
+    location_str: str,
+    zip_code: str | None = None,
+    hash_mode: str = None,
+) -> list[LeadRecord]:
+    """Normalise a whole Apify batch of Facebook posts, contacts scanned in one pass."""
+    mode  = hash_mode or content_hash_mode()
+    texts = [_facebook_text(item) for item in items]
+    out   = []
+
+    for item, text, (phone, email) in zip(items, texts, extract_contacts_many(texts)):
+        author     = item.get("authorName") or item.get("author") or "Unknown"
+        group_name = (
+            item.get("groupName") or item.get("group") or
+            item.get("groupTitle") or item.get("group_name") or ""
+        )
+        group_url = (
+            item.get("groupUrl") or item.get("group_url") or
+            item.get("groupLink") or item.get("inputUrl") or   # ADD inputUrl
+            item.get("input_url") or ""
+        )
+
+        post_url = (
+            item.get("url")
+            or item.get("postUrl")
+            or item.get("link")
+            or ""
+        )
+
+        post_id = str(
+            item.get("id")
+            or item.get("postId")
+            or item.get("fbId")
+            or ""
+        )
+        title = (
+            item.get("title")
+            or (text[:120].replace("\n", " ").strip() if text else f"Post by {author}")
+        )
+
+        post_date = (
+            item.get("datetime")
+            or item.get("date")
+            or item.get("time")
+            or item.get("timestamp")
+            or None
+        )
+
+        resolved_zip = zip_code or extract_zip(text) or ""
+
+        normalized = LeadRecord(
+            post_id=post_id or _derived_post_id(mode, {"url": post_url, "text": text[:200], "title": title}),
+            url=post_url,
+            title=title,
+            post=text,
+            phone=phone,
+            email=email,
+            location=location_str,
+            category=service_category,
+            service_category=service_category,
+            latitude=parse_coord(item.get("latitude")),
+            longitude=parse_coord(item.get("longitude")),
+            datetime=parse_datetime(post_date),
+            source="FACEBOOK",
+            zip_code=resolved_zip,
+            fb_group_name=group_name,
+            fb_group_url=group_url,
+            raw=item,
+        )
+
+        _set_content_hash(normalized, mode, title, text[:300])
+        set_entity_keys(normalized)
+        out.append(normalized)
+
+    return out
 
-    post_date = (
-        item.get("datetime")
-        or item.get("date")
-        or item.get("time")
-        or item.get("timestamp")
-        or None
-    )
 
-    resolved_zip = zip_code or _extract_zip_from_text(text) or ""
-
-    normalized = {
-        "post_id": post_id or _content_hash({"url": post_url, "text": text[:200], "title": title}),
-        "url":              post_url,
-        "title":            title,
-        "post":             text,
-        "phone":            phone,
-        "email":            email,
-        "location":         location_str,
-        "category":         service_category,
-        "service_category": service_category,
-        "state":            "",       
-        "latitude":         str(item.get("latitude") or ""),
-        "longitude":        str(item.get("longitude") or ""),
-        "map_accuracy":     "",
-        "datetime":         post_date,
-        "source":           "FACEBOOK",
-        "zip_code":         resolved_zip,
-        "fb_group_name":    group_name,
-        "fb_group_url":     group_url,
-        "raw_json":         item,
-    }
-
-    normalized["content_hash"] = _content_hash({
-        "title_norm": _normalize_title(title),
-        "post":  text[:300],
-    })
-    return normalized
-
-
-def _extract_zip_from_text(text: str) -> str | None:
-    """Pull the first 5-digit ZIP code from post text."""
-    if not text:
-        return None
-    match = re.search(r"\b(\d{5})(?:-\d{4})?\b", text)
-    return match.group(1) if match else None
\ No newline at end of file
+def normalize_facebook(
+    item: dict,
+    service_category: str,
+    location_str: str,
+    zip_code: str | None = None,
+) -> LeadRecord:
+    return normalize_facebook_batch([item], service_category, location_str, zip_code)[0]
@@ -1,15 +1,25 @@
 import threading
+from contextlib import nullcontext
 from datetime import datetime, timezone
+from django.conf import settings
 from .location_resolver import resolve_location, LocationResolutionError
 from .category_map import get_craigslist_codes, get_facebook_keywords
 from .craigslist_service import scrape_craigslist_progressive
 from .google_search_service import scrape_google_search_progressive
 from .fb_service import scrape_fb_groups_progressive, upsert_fb_groups
-from .normalizer import normalize_craigslist, normalize_facebook
+from .normalizer import normalize_craigslist_batch, normalize_facebook_batch
+from .ingest_pool import normalize_craigslist_items, normalize_facebook_items
 from .google_normalizer import normalize_google_serp_page
+from .lead_record import LeadRecord
 from .lead_scorer import calculate_lead_score
-import requests
-from django.conf import settings
+from .raw_payloads import raw_summary, store_raw_payloads
+from .lead_entities import entity_keys, link_lead_entities
+from .fuzzy_title import TitleLSHIndex
+from .run_progress import get_progress, flush_progress, close_progress
+from .run_events import log_event, flush_events
+from .cancellation import get_token, release_token, is_cancelled, is_detached, cancel_run
+from .run_checkpoint import get_checkpoint, open_checkpoint, release_checkpoint
+from .apify_client import get_client
 
 GOOGLE_CATEGORY_QUERIES = {
     "cleaning":         "house cleaning service contractor",
@@ -24,25 +34,12 @@ class LimitReached(Exception):
 
 
 def _log(scrape_run_id, stage: str, detail: str, level: str = "info", extra: dict = None):
-    ts    = datetime.now(timezone.utc).isoformat()
-    entry = {"ts": ts, "stage": stage, "detail": detail, "level": level}
-    if extra:
-        entry.update(extra)
     print(f"[Pipeline][{level.upper()}] {stage}: {detail}")
     if not scrape_run_id:
         return
     try:
-        from base.models import ScrapeRun
-        run = ScrapeRun.objects.filter(pk=scrape_run_id).first()
-        if not run:
-            return
-        log = run.activity_log or []
-        log.append(entry)
-        ScrapeRun.objects.filter(pk=scrape_run_id).update(
-            current_stage=stage,
-            stage_detail=detail,
-            activity_log=log,
-        )
+        log_event(scrape_run_id, stage, detail, level=level, extra=extra)
+        get_progress(scrape_run_id).set_stage(stage, detail)
     except Exception as e:
         print(f"[Pipeline] Could not write log entry: {e}")
 
@@ -51,35 +48,20 @@ def _emit_source_stats(scrape_run_id, source: str, saved: int, skipped: int, bat
     if not scrape_run_id:
         return
     try:
-        from base.models import ScrapeRun
-        ts = datetime.now(timezone.utc).isoformat()
-        entry = {
-            "ts":          ts,
-            "stage":       f"{source.title()} — live count",
-            "detail":      f"{saved} lead(s) saved ({skipped} duplicate(s) skipped)",
-            "level":       "success" if saved > 0 else "info",
-            "type":        "source_stats",
-            "source":      source,
-            "saved":       saved,
-            "skipped":     skipped,
-            "batch_saved": batch_saved,
-        }
-
-        run = ScrapeRun.objects.filter(pk=scrape_run_id).first()
-        if not run:
-            return
-
-        log = run.activity_log or []
-        log = [e for e in log if not (e.get("type") == "source_stats" and e.get("source") == source)]
-        log.append(entry)
-
-        source_stats = run.source_stats or {}
-        source_stats[source] = {"saved": saved, "skipped": skipped}
-
-        ScrapeRun.objects.filter(pk=scrape_run_id).update(
-            activity_log=log,
-            source_stats=source_stats,
+        log_event(
+            scrape_run_id,
+            f"{source.title()} — live count",
+            f"{saved} lead(s) saved ({skipped} duplicate(s) skipped)",
+            level="success" if saved > 0 else "info",
+            extra={
+                "type":        "source_stats",
+                "source":      source,
+                "saved":       saved,
+                "skipped":     skipped,
+                "batch_saved": batch_saved,
+            },
         )
+        get_progress(scrape_run_id).set_source_stats(source, saved, skipped)
     except Exception as e:
         print(f"[Pipeline] Could not emit source stats: {e}")
 
@@ -89,19 +71,20 @@ def _make_progress_callback(scrape_run_id, source_label: str, stats: dict, max_l
         if not scrape_run_id:
             return
         try:
-            from base.models import ScrapeRun
             already_saved = stats["leads_saved"]
             detail = (
                 f"~{apify_count} result(s) found by Apify "
                 f"| {already_saved} lead(s) saved to DB so far"
             )
-            ScrapeRun.objects.filter(pk=scrape_run_id).update(stage_detail=detail)
-            # ── Just set the flag — let the poll loop detect and abort ──
+            get_progress(scrape_run_id).set_detail(detail)
+            # ── Just set the token — the poll loop wakes and aborts ──
             if max_leads and already_saved >= max_leads:
-                ScrapeRun.objects.filter(pk=scrape_run_id).update(cancel_requested=True)
+                cancel_run(scrape_run_id, reason="limit")
         except Exception:
             pass
     return callback
+
+
 class _ServiceLogger:
     def __init__(self, scrape_run_id, default_stage="Background"):
         self._run_id  = scrape_run_id
@@ -128,18 +111,6 @@ class _ServiceLogger:
         _log(self._run_id, stage, detail, level=level)
 
 
-def _cancelled(scrape_run_id) -> bool:
-    if not scrape_run_id:
-        return False
-    try:
-        from base.models import ScrapeRun
-        return ScrapeRun.objects.filter(
-            pk=scrape_run_id, cancel_requested=True
-        ).exists()
-    except Exception:
-        return False
-
-
 def _abort_all_actors(scrape_run_id):
     if not scrape_run_id:
         return
@@ -152,48 +123,25 @@ def _abort_all_actors(scrape_run_id):
         if not run:
             return
 
-        ScrapeRun.objects.filter(pk=scrape_run_id).update(cancel_requested=True)
+        cancel_run(scrape_run_id, reason="limit")
 
-        headers = {"Authorization": f"Bearer {settings.APIFY_TOKEN}"}
+        client      = get_client()
         aborted_set = set()
 
         def _abort_ids(ids):
             for apify_id in ids:
-                try:
-                    requests.post(
-                        f"https://api.apify.com/v2/actor-runs/{apify_id}/abort",
-                        headers=headers,
-                        timeout=10,
-                    )
+                if client.abort_run(apify_id):
                     aborted_set.add(apify_id)
-                except Exception as e:
-                    print(f"[Pipeline] Could not abort actor {apify_id} on limit: {e}")
 
         def _sweep():
             newly = []
             for status_filter in ("RUNNING", "READY"):
                 try:
-                    resp = requests.get(
-                        "https://api.apify.com/v2/actor-runs",
-                        headers=headers,
-                        params={"status": status_filter, "limit": 100},
-                        timeout=15,
-                    )
-                    if resp.status_code != 200:
-                        continue
-                    for actor_run in resp.json().get("data", {}).get("items", []):
+                    for actor_run in client.list_runs(status_filter, limit=100):
                         aid = actor_run.get("id")
-                        if aid and aid not in aborted_set:
-                            try:
-                                requests.post(
-                                    f"https://api.apify.com/v2/actor-runs/{aid}/abort",
-                                    headers=headers,
-                                    timeout=10,
-                                )
-                                aborted_set.add(aid)
-                                newly.append(aid)
-                            except Exception:
-                                pass
+                        if aid and aid not in aborted_set and client.abort_run(aid):
+                            aborted_set.add(aid)
+                            newly.append(aid)
                 except Exception:
                     pass
             return newly
@@ -220,6 +168,7 @@ def _finalise_run(scrape_run_id, stats: dict):
         return
     try:
         from base.models import ScrapeRun
+        flush_progress(scrape_run_id)
         ScrapeRun.objects.filter(pk=scrape_run_id).update(
             status="SUCCEEDED",
             limit_stop=True,
@@ -239,16 +188,219 @@ def _inc_skipped(stats, source_key):
         )
 
 
+def _new_run_stats() -> dict:
+    """Counters and per-run dedup state threaded through every stage."""
+    return {
+        "leads_saved":    0,
+        "leads_skipped":  0,
+        "errors":         [],
+        "source_saved":   {},
+        "source_skipped": {},
+        "limit_stop":     False,
+        "title_indexes":  {},
+        "write_lock":     threading.RLock(),
+    }
+
+
+def _stats_lock(stats):
+    """The run's writer lock — shared by all source stages of one run."""
+    return stats.get("write_lock") or nullcontext()
+
+
+def _count_skipped(stats, source_key, n: int = 1):
+    with _stats_lock(stats):
+        stats["leads_skipped"] += n
+        stats.setdefault("source_skipped", {})
+        stats["source_skipped"][source_key] = (
+            stats["source_skipped"].get(source_key, 0) + n
+        )
+
+
+def _get_title_index(stats, source: str) -> TitleLSHIndex:
+    indexes = stats.setdefault("title_indexes", {})
+    index   = indexes.get(source)
+    if index is not None:
+        return index
+
+    index = TitleLSHIndex()
+    try:
+        from base.models import ServiceLead
+        titles = (
+            ServiceLead.objects.filter(source=source)
+            .values_list("title", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        for title in titles:
+            index.add(title)
+        print(f"[Fuzzy Dedup] Title index for {source} warm-loaded with {len(index)} title(s)")
+    except Exception as e:
+        print(f"[Fuzzy Dedup] Could not warm-load title index for {source}: {e}")
+    indexes[source] = index
+    return index
+
+
+def _is_unique_violation(e: Exception) -> bool:
+    return (
+        "unique_content_hash" in str(e)
+        or "UNIQUE constraint" in str(e)
+        or "unique constraint" in str(e).lower()
+        or "duplicate key" in str(e).lower()
+    )
+
+
+def _coord_text(value: float | None) -> str:
+    return "" if value is None else str(value)
+
+
+def _lead_from_record(record: LeadRecord):
+    from base.models import ServiceLead
+    from .fuzzy_title import make_title_bucket_hash
+
+    # Already computed when the batch was normalised on the ingest pool
+    if record.score is not None:
+        score, score_reason = record.score, record.score_reason
+    else:
+        score, score_reason = calculate_lead_score(record)
+
+    title = record.title or ""
+
+    return ServiceLead(
+        post_id=record.post_id or record.content_hash or "",
+        url=record.url or "",
+        title=title[:500],
+        datetime=record.datetime,
+        location=record.location or "",
+        category=record.category or "",
+        service_category=record.service_category or "",
+        state=record.state or "",
+        latitude=_coord_text(record.latitude),
+        longitude=_coord_text(record.longitude),
+        map_accuracy=record.map_accuracy or "",
+        content_hash=record.content_hash or "",
+        post=record.post or "",
+        phone=record.phone or "",
+        email=record.email or "",
+        phone_e164=record.phone_e164,
+        email_norm=record.email_norm,
+        domain=record.domain,
+        zip_code=record.zip_code or "",
+        source=record.source,
+        fb_group_name=record.fb_group_name or "",
+        fb_group_url=record.fb_group_url or "",
+        score=score,
+        score_reason=score_reason,
+        raw_summary=raw_summary(record.raw_json),
+        title_ngram_hash=(
+            record.title_ngram_hash if record.title_ngram_hash is not None
+            else make_title_bucket_hash(title) if title else ""
+        ),
+    )
+
+
+def _insert_leads_bulk(leads: list, payloads: dict) -> set[str]:
+    """
+    Write leads and their raw payloads ({post_id: payload}) in one
+    transaction, link them to their LeadEntity clusters, and return the
+    post_ids that actually landed. Rows that
+    lose a UNIQUE race (post_id or content_hash already written by someone
+    else) are silently dropped by ignore_conflicts, so the survivors are
+    read back to keep saved/skipped counts exact. A row only counts as
+    ours if it was created by this insert with the content_hash we wrote —
+    a row another writer saved under the same post_id gets neither our
+    payload nor our entity links.
+    """
+    from base.models import ServiceLead
+    from django.db import transaction
+
+    hashes  = {lead.post_id: lead.content_hash or "" for lead in leads}
+    started = datetime.now(timezone.utc)
+    with transaction.atomic():
+        ServiceLead.objects.bulk_create(leads, ignore_conflicts=True, batch_size=500)
+        landed = {
+            pid: pk
+            for pid, pk, content_hash in (
+                ServiceLead.objects
+                .filter(post_id__in=list(hashes), created_at__gte=started)
+                .values_list("post_id", "pk", "content_hash")
+            )
+            if (content_hash or "") == hashes[pid]
+        }
+        store_raw_payloads({pk: payloads.get(pid) for pid, pk in landed.items()})
+        link_lead_entities(
+            (landed[lead.post_id], lead.phone_e164, lead.email_norm, lead.domain)
+            for lead in leads if lead.post_id in landed
+        )
+        return set(landed)
+
+
+def _insert_leads_rowwise(leads: list, payloads: dict, stats, scrape_run_id) -> tuple[set[str], set[str]]:
+    """
+    Per-row fallback — slower, but isolates and reports a bad row.
+    Returns (inserted post_ids, post_ids that failed with a real error).
+    """
+    from django.db import transaction
+
+    inserted, failed = set(), set()
+    for lead in leads:
+        try:
+            with transaction.atomic():
+                lead.save(force_insert=True)
+                store_raw_payloads({lead.pk: payloads.get(lead.post_id)})
+                link_lead_entities([(lead.pk, lead.phone_e164, lead.email_norm, lead.domain)])
+            inserted.add(lead.post_id)
+        except Exception as e:
+            if _is_unique_violation(e):
+                continue
+            failed.add(lead.post_id)
+            err_msg = (
+                f"Save error for post_id={(lead.post_id or '?')[:20]}: "
+                f"{str(e)[:150]}"
+            )
+            print(f"[Pipeline] {err_msg}")
+            _log(scrape_run_id, "Pipeline --- save error", err_msg, level="error")
+            stats["errors"].append(err_msg)
+    return inserted, failed
+
+
 def _save_lead_batch(
     normalized_items,
     stats,
     scrape_run_id=None,
     source_key: str = None,
     max_leads: int = 0,
+    bulk: bool = True,
+):
+    """
+    Dedup and write one normalised batch. When source stages run
+    concurrently this is the run's single writer: the run's lock is held
+    for the whole batch, so dedup state, counters and the max_leads budget
+    are checked and updated atomically across sources.
+    """
+    with _stats_lock(stats):
+        _write_lead_batch(
+            normalized_items, stats, scrape_run_id,
+            source_key=source_key, max_leads=max_leads, bulk=bulk,
+        )
+
+
+def _write_lead_batch(
+    normalized_items,
+    stats,
+    scrape_run_id=None,
+    source_key: str = None,
+    max_leads: int = 0,
+    bulk: bool = True,
 ):
-    from base.models import ServiceLead, ScrapeRun
-    from .fuzzy_title import title_similarity, make_title_bucket_hash, _normalize_title
-    import re
+    """
+    Dedup a batch of LeadRecords in memory, then write the survivors.
+
+    With bulk=True (the default) survivors go out as bulk_create calls
+    inside a single transaction, instead of one implicit transaction per
+    row. Under max_leads only as many survivors as the remaining budget
+    are written per round; any lost to a UNIQUE race are topped up from
+    the rest of the batch, so the limit is hit exactly.
+    """
+    from base.models import ServiceLead
 
     FUZZY_THRESHOLD = 0.65
 
@@ -256,16 +408,15 @@ def _save_lead_batch(
         return
 
     if max_leads and stats["leads_saved"] >= max_leads:
-        if scrape_run_id:
-            try:
-                from base.models import ScrapeRun
-                ScrapeRun.objects.filter(pk=scrape_run_id).update(cancel_requested=True)
-            except Exception:
-                pass
+        cancel_run(scrape_run_id, reason="limit")
         raise LimitReached()
 
-    incoming_hashes = {i["content_hash"] for i in normalized_items if i.get("content_hash")}
-    incoming_ids    = {i["post_id"]       for i in normalized_items if i.get("post_id")}
+    # During a hash-scheme rollout rows may still carry the legacy hash
+    incoming_hashes = {
+        h for i in normalized_items
+        for h in (i.content_hash, i.legacy_content_hash) if h
+    }
+    incoming_ids    = {i.post_id for i in normalized_items if i.post_id}
 
     existing_hashes = set(
         ServiceLead.objects.filter(content_hash__in=incoming_hashes)
@@ -277,160 +428,128 @@ def _save_lead_batch(
         .values_list("post_id", flat=True)
     ) if incoming_ids else set()
 
-    batch_saved_count = 0
+    # Full source items by post_id — written to LeadRawPayload alongside the rows
+    payloads = {}
 
-    # Tracks titles saved within this batch to catch intra-batch duplicates
-    batch_title_cache: list[str] = []
-
-    for lead_data in normalized_items:
-        if max_leads and stats["leads_saved"] >= max_leads:
-            if scrape_run_id:
-                try:
-                    ScrapeRun.objects.filter(pk=scrape_run_id).update(cancel_requested=True)
-                except Exception:
-                    pass
-            raise LimitReached()
+    def _skip():
+        stats["leads_skipped"] += 1
+        _inc_skipped(stats, source_key)
 
+    def _accept(record):
+        """Run the dedup checks; return an unsaved ServiceLead or None."""
         try:
             # ── Check 1: content hash ──────────────────────────
-            content_hash = lead_data.get("content_hash")
-            if content_hash and content_hash in existing_hashes:
-                stats["leads_skipped"] += 1
-                _inc_skipped(stats, source_key)
-                continue
+            content_hash = record.content_hash
+            legacy_hash  = record.legacy_content_hash
+            if (
+                (content_hash and content_hash in existing_hashes)
+                or (legacy_hash and legacy_hash in existing_hashes)
+            ):
+                _skip()
+                return None
 
             # ── Check 2: post_id ───────────────────────────────
-            post_id = lead_data.get("post_id")
+            post_id = record.post_id
             if post_id and post_id in existing_ids:
-                stats["leads_skipped"] += 1
-                _inc_skipped(stats, source_key)
-                continue
+                _skip()
+                return None
 
             # ── Check 3: fuzzy title (Craigslist/Google only — FB titles are post text snippets) ──
-            incoming_title = lead_data.get("title", "")
-            is_fuzzy_dupe = False
-
-            if incoming_title and lead_data.get("source") != "FACEBOOK":
-                bucket_hash = make_title_bucket_hash(incoming_title)
+            incoming_title = record.title
+            title_index    = None
 
-                candidate_titles = list(
-                    ServiceLead.objects.filter(
-                        title_ngram_hash=bucket_hash,
-                        source=lead_data.get("source", "CRAIGSLIST"),
-                    ).values_list("title", flat=True)[:200]
+            if incoming_title and record.source != "FACEBOOK":
+                title_index = _get_title_index(stats, record.source)
+                match = title_index.find_similar(
+                    incoming_title, FUZZY_THRESHOLD, prepared=record.title_prepared,
                 )
+                if match:
+                    existing_title, sim = match
+                    print(
+                        f"[Fuzzy Dedup] Skipping '{incoming_title[:60]}' "
+                        f"— {sim:.0%} similar to '{existing_title[:60]}'"
+                    )
+                    _skip()
+                    return None
 
-                for existing_title in candidate_titles:
-                    sim = title_similarity(incoming_title, existing_title)
-                    if sim >= FUZZY_THRESHOLD:
-                        is_fuzzy_dupe = True
-                        print(
-                            f"[Fuzzy Dedup] Skipping '{incoming_title[:60]}' "
-                            f"— {sim:.0%} similar to '{existing_title[:60]}'"
-                        )
-                        break
-
-                if not is_fuzzy_dupe:
-                    for cached_title in batch_title_cache:
-                        sim = title_similarity(incoming_title, cached_title)
-                        if sim >= FUZZY_THRESHOLD:
-                            is_fuzzy_dupe = True
-                            break
-
-            if is_fuzzy_dupe:
-                stats["leads_skipped"] += 1
-                _inc_skipped(stats, source_key)
-                continue
-
-            if not lead_data.get("post_id"):
+            if not post_id:
                 import uuid as _uuid
-                lead_data = {**lead_data, "post_id": str(_uuid.uuid4())}
-                post_id = lead_data["post_id"]
-
-            # ── Save ───────────────────────────────────────────
-            score, score_reason = calculate_lead_score(lead_data)
+                record.post_id = str(_uuid.uuid4())
 
-            lead_dt = None
-            raw_dt  = lead_data.get("datetime")
-            if raw_dt:
-                try:
-                    lead_dt = datetime.fromisoformat(str(raw_dt).replace("Z", "+00:00"))
-                except Exception:
-                    pass
+            lead = _lead_from_record(record)
 
-            bucket_hash = make_title_bucket_hash(incoming_title) if incoming_title else ""
-
-            ServiceLead.objects.create(
-                post_id=post_id or content_hash or "",
-                url=lead_data.get("url") or "",
-                title=(lead_data.get("title") or "")[:500],
-                datetime=lead_dt,
-                location=lead_data.get("location") or "",
-                category=lead_data.get("category") or "",
-                service_category=lead_data.get("service_category") or "",
-                state=lead_data.get("state") or "",
-                latitude=lead_data.get("latitude") or "",
-                longitude=lead_data.get("longitude") or "",
-                map_accuracy=lead_data.get("map_accuracy") or "",
-                content_hash=content_hash or "",
-                post=lead_data.get("post") or "",
-                phone=lead_data.get("phone") or "",
-                email=lead_data.get("email") or "",
-                zip_code=lead_data.get("zip_code") or "",
-                source=lead_data.get("source", "CRAIGSLIST"),
-                fb_group_name=lead_data.get("fb_group_name") or "",
-                fb_group_url=lead_data.get("fb_group_url") or "",
-                score=score,
-                score_reason=score_reason,
-                raw_json=lead_data.get("raw_json"),
-                title_ngram_hash=bucket_hash,
+        except Exception as e:
+            err_msg = (
+                f"Save error for post_id={(record.post_id or '?')[:20]}: "
+                f"{str(e)[:150]}"
             )
+            print(f"[Pipeline] {err_msg}")
+            _log(scrape_run_id, "Pipeline --- save error", err_msg, level="error")
+            stats["errors"].append(err_msg)
+            return None
 
-            stats["leads_saved"] += 1
-            batch_saved_count += 1
-            batch_title_cache.append(incoming_title)
+        # Reserve the keys now so later items in this batch dedup against it
+        if content_hash:
+            existing_hashes.add(content_hash)
+        existing_ids.add(lead.post_id)
+        payloads[lead.post_id] = record.raw_json
+        if title_index is not None:
+            title_index.add(incoming_title, prepared=record.title_prepared)
+        return lead
 
-            if source_key:
-                stats.setdefault("source_saved", {})
-                stats["source_saved"][source_key] = (
-                    stats["source_saved"].get(source_key, 0) + 1
-                )
+    batch_saved_count = 0
+    pos, total = 0, len(normalized_items)
+
+    while pos < total:
+        budget = max_leads - stats["leads_saved"] if max_leads else None
+        if budget is not None and budget <= 0:
+            break
+
+        pending = []
+        while pos < total:
+            lead = _accept(normalized_items[pos])
+            pos += 1
+            if lead is not None:
+                pending.append(lead)
+                if budget is not None and len(pending) >= budget:
+                    break
+
+        if not pending:
+            continue
 
-            if content_hash:
-                existing_hashes.add(content_hash)
-            if post_id:
-                existing_ids.add(post_id)
+        failed = set()
+        if bulk:
+            try:
+                inserted = _insert_leads_bulk(pending, payloads)
+            except Exception as e:
+                print(f"[Pipeline] Bulk insert failed ({str(e)[:150]}) — retrying row by row")
+                inserted, failed = _insert_leads_rowwise(pending, payloads, stats, scrape_run_id)
+        else:
+            inserted, failed = _insert_leads_rowwise(pending, payloads, stats, scrape_run_id)
 
-            if scrape_run_id:
-                try:
-                    ScrapeRun.objects.filter(pk=scrape_run_id).update(
-                        leads_collected=stats["leads_saved"],
-                        leads_skipped=stats["leads_skipped"],
-                    )
-                except Exception:
-                    pass
+        # Anything neither written nor errored lost a UNIQUE race — a duplicate
+        saved_now = len(inserted)
+        lost_now  = len(pending) - saved_now - len(failed)
 
-        except LimitReached:
-            raise
+        stats["leads_saved"]   += saved_now
+        stats["leads_skipped"] += lost_now
+        batch_saved_count      += saved_now
 
-        except Exception as e:
-            if (
-                "unique_content_hash" in str(e)
-                or "UNIQUE constraint" in str(e)
-                or "unique constraint" in str(e).lower()
-                or "duplicate key" in str(e).lower()
-            ):
-                stats["leads_skipped"] += 1
-                _inc_skipped(stats, source_key)
-                continue
+        if source_key:
+            stats.setdefault("source_saved", {})
+            stats["source_saved"][source_key] = (
+                stats["source_saved"].get(source_key, 0) + saved_now
+            )
+            if lost_now:
+                stats.setdefault("source_skipped", {})
+                stats["source_skipped"][source_key] = (
+                    stats["source_skipped"].get(source_key, 0) + lost_now
+                )
 
-            err_msg = (
-                f"Save error for post_id={lead_data.get('post_id','?')[:20]}: "
-                f"{str(e)[:150]}"
+        if scrape_run_id:
+            get_progress(scrape_run_id).set_counts(
+                stats["leads_saved"], stats["leads_skipped"]
             )
-            print(f"[Pipeline] {err_msg}")
-            _log(scrape_run_id, "Pipeline --- save error", err_msg, level="error")
-            stats["errors"].append(err_msg)
 
     if source_key and scrape_run_id and batch_saved_count > 0:
         src_saved   = stats.get("source_saved",   {}).get(source_key, 0)
@@ -439,15 +558,29 @@ def _save_lead_batch(
             scrape_run_id, source_key, src_saved, src_skipped, batch_saved_count
         )
 
+    # Limit hit with part of the batch still unprocessed — same signal the
+    # row-by-row loop used to give
+    if max_leads and stats["leads_saved"] >= max_leads and pos < total:
+        cancel_run(scrape_run_id, reason="limit")
+        raise LimitReached()
+
 
-def _enrich_saved_google_leads(contacts_map: dict, scrape_run_id, log):
+def _enrich_saved_google_leads(contacts_map: dict, stats, scrape_run_id, log):
+    """
+    Fill phone/email on saved Google leads from crawled sites. The leads
+    are looked up first; the updates and entity relinks then go out in one
+    transaction under the run's writer lock, like _write_lead_batch, so
+    they never race the other source stages' writes.
+    """
     if not contacts_map:
         return
     try:
         from base.models import ServiceLead
+        from django.db import transaction
         from django.db.models import Q
 
-        updated = 0
+        updates = []
+        relink  = []
 
         for norm_key, contacts in contacts_map.items():
             phones = contacts.get("phones", [])
@@ -480,14 +613,28 @@ def _enrich_saved_google_leads(contacts_map: dict, scrape_run_id, log):
                 if emails and not lead.email:
                     update_fields["email"] = emails[0]
                 if update_fields:
-                    ServiceLead.objects.filter(pk=lead.pk).update(**update_fields)
-                    updated += 1
+                    keys = entity_keys(
+                        update_fields.get("phone") or lead.phone,
+                        update_fields.get("email") or lead.email,
+                        lead.url,
+                    )
+                    update_fields.update(zip(("phone_e164", "email_norm", "domain"), keys))
+                    updates.append((lead.pk, update_fields))
+                    relink.append((lead.pk, *keys))
 
-        if updated:
-            log(
-                f"[Google Website Crawl] Enriched {updated} saved lead(s) "
-                f"with contact data from crawled sites"
-            )
+        if not updates:
+            return
+
+        with _stats_lock(stats), transaction.atomic():
+            for pk, update_fields in updates:
+                ServiceLead.objects.filter(pk=pk).update(**update_fields)
+            # New contact keys can join the lead to (or merge) other entities
+            link_lead_entities(relink)
+
+        log(
+            f"[Google Website Crawl] Enriched {len(updates)} saved lead(s) "
+            f"with contact data from crawled sites"
+        )
     except Exception as e:
         log(f"[Google Website Crawl] Enrichment update error: {e}")
 
@@ -498,6 +645,7 @@ def _process_and_save_fb_batch(
     max_leads: int = 0,
     categories: list = None,  # ADD
     location_str: str = "",   # ADD
+    process_pool: bool = False,
 ):
     from base.models import ScrapedFbPost
 
@@ -538,14 +686,18 @@ def _process_and_save_fb_batch(
             )
             fresh_items = fresh_items[:remaining]
 
-    normalized = [
-        normalize_facebook(
-            item,
+    if process_pool:
+        normalized = normalize_facebook_items(
+            fresh_items,
+            service_category=categories[0] if categories else "",
+            location_str=location_str,
+        )
+    else:
+        normalized = normalize_facebook_batch(
+            fresh_items,
             service_category=categories[0] if categories else "",
             location_str=location_str,
         )
-        for item in fresh_items
-    ]
 
     _save_lead_batch(
         normalized, stats, scrape_run_id,
@@ -569,7 +721,8 @@ def _process_and_save_fb_batch(
         )
 
     if new_post_records:
-        ScrapedFbPost.objects.bulk_create(new_post_records, ignore_conflicts=True)
+        with _stats_lock(stats):
+            ScrapedFbPost.objects.bulk_create(new_post_records, ignore_conflicts=True)
 
     fb_saved   = stats.get("source_saved",   {}).get("facebook", 0)
     fb_skipped = stats.get("source_skipped", {}).get("facebook", 0)
@@ -582,6 +735,67 @@ def _process_and_save_fb_batch(
     )
 
 
+def _run_source_stages(stages: list, stats: dict, scrape_run_id, concurrent: bool = False) -> str | None:
+    """
+    Run each (name, fn) source stage — one after another, or each on its
+    own thread when `concurrent` is set. Returns the name of the stage that
+    hit max_leads first, or None.
+    """
+    limit_hit = []
+
+    def _run(name, fn):
+        if is_cancelled(scrape_run_id):
+            if not stats["limit_stop"]:
+                _log(
+                    scrape_run_id, f"{name} — skipped",
+                    f"Cancelled before {name} could start.", level="warning",
+                )
+            return
+        try:
+            fn()
+        except LimitReached:
+            with _stats_lock(stats):
+                first = not stats["limit_stop"]
+                stats["limit_stop"] = True
+            if first:
+                limit_hit.append(name)
+            cancel_run(scrape_run_id, reason="limit")
+        except Exception as e:
+            _log(scrape_run_id, f"{name} — error", str(e), level="error")
+            stats["errors"].append(f"{name}: {str(e)}")
+
+    def _run_in_thread(name, fn):
+        from django.db import connection
+        try:
+            _run(name, fn)
+        finally:
+            connection.close()
+
+    if not concurrent or len(stages) < 2:
+        for name, fn in stages:
+            _run(name, fn)
+            if stats["limit_stop"]:
+                break
+    else:
+        _log(
+            scrape_run_id, "Sources running concurrently",
+            ", ".join(name for name, _ in stages),
+        )
+        threads = [
+            threading.Thread(
+                target=_run_in_thread, args=(name, fn),
+                name=f"source-{name.split()[0].lower()}", daemon=True,
+            )
+            for name, fn in stages
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    return limit_hit[0] if limit_hit else None
+
+
 def run_pipeline(
     location_type,
     location_value,
@@ -593,18 +807,87 @@ def run_pipeline(
     google_max_pages=3,
     google_deep_scrape=True,
     max_leads: int = 0,
+    concurrent_sources: bool = None,
+    resume: bool = False,
+    process_pool: bool = None,
+    cl_max_age: int = None,
+    fb_newer_than: str = None,
+):
+    """
+    Run every requested source stage for one ScrapeRun. With resume=True
+    the run picks up from its checkpoint: in-flight actors are re-attached,
+    datasets are read from the last saved offset and done batches skipped.
+    With process_pool=True, CL and FB batches are normalised, hashed and
+    scored on the ingest process pool; dedup and writes stay here.
+    cl_max_age (days) and fb_newer_than (YYYY-MM-DD) narrow the posting
+    window — the scheduler sets them from a spec's last successful run.
+    """
+    if concurrent_sources is None:
+        concurrent_sources = getattr(settings, "PIPELINE_CONCURRENT_SOURCES", False)
+    if process_pool is None:
+        process_pool = getattr(settings, "PIPELINE_PROCESS_POOL", False)
+
+    get_token(scrape_run_id)
+    open_checkpoint(scrape_run_id, resume=resume)
+    try:
+        return _run_pipeline(
+            location_type,
+            location_value,
+            categories,
+            sources,
+            scrape_run_id=scrape_run_id,
+            max_posts_per_group=max_posts_per_group,
+            fb_group_urls=fb_group_urls,
+            google_max_pages=google_max_pages,
+            google_deep_scrape=google_deep_scrape,
+            max_leads=max_leads,
+            concurrent_sources=concurrent_sources,
+            resume=resume,
+            process_pool=process_pool,
+            cl_max_age=cl_max_age,
+            fb_newer_than=fb_newer_than,
+        )
+    finally:
+        # Final flush of the buffered progress and events, on every exit path
+        close_progress(scrape_run_id)
+        flush_events()
+        release_token(scrape_run_id)
+        release_checkpoint(scrape_run_id)
+        print(f"[Apify] Calls so far — {get_client().metrics.summary()}")
+
+
+def _run_pipeline(
+    location_type,
+    location_value,
+    categories,
+    sources,
+    scrape_run_id=None,
+    max_posts_per_group=50,
+    fb_group_urls=None,
+    google_max_pages=3,
+    google_deep_scrape=True,
+    max_leads: int = 0,
+    concurrent_sources: bool = False,
+    resume: bool = False,
+    process_pool: bool = False,
+    cl_max_age: int = None,
+    fb_newer_than: str = None,
 ):
     from base.models import ScrapeRun
 
-    stats = {
-        "leads_saved":    0,
-        "leads_skipped":  0,
-        "errors":         [],
-        "source_saved":   {},
-        "source_skipped": {},
-        "limit_stop":     False,
-    }
-    svc_log = _ServiceLogger(scrape_run_id)
+    stats      = _new_run_stats()
+    svc_log    = _ServiceLogger(scrape_run_id)
+    checkpoint = get_checkpoint(scrape_run_id)
+
+    # ── Resume — carry the counters of the interrupted attempt ──
+    if resume and not checkpoint.is_empty():
+        stats.update(checkpoint.saved_stats())
+        _log(
+            scrape_run_id, "Resuming",
+            f"Continuing from the last checkpoint — "
+            f"{stats['leads_saved']} lead(s) already saved.",
+        )
+    checkpoint.bind_stats(stats)
 
     if location_value:
         _log(
@@ -650,114 +933,21 @@ def run_pipeline(
             f"{', '.join(categories)} → {len(cl_codes)} CL code(s)",
         )
 
-    # ── Craigslist ─────────────────────────────────────────────
-    if "craigslist" in sources and cl_cities and cl_codes:
-        total_batches = -(-len(cl_cities) // 3)
-        _log(
-            scrape_run_id, "Craigslist — starting",
-            f"Scraping {len(cl_cities)} region(s) across {len(cl_codes)} "
-            f"categor{'y' if len(cl_codes) == 1 else 'ies'} "
-            f"in ~{total_batches} batch(es).",
-        )
-
-        try:
-            from base.models import ServiceLead
-            existing_cl_ids = set(
-                ServiceLead.objects.filter(source="CRAIGSLIST")
-                .values_list("post_id", flat=True)
-            )
-        except Exception:
-            existing_cl_ids = set()
-
-        batch_num = 0
-        try:
-            for batch_items in scrape_craigslist_progressive(
-                cl_cities, cl_codes,
-                scrape_run_id=scrape_run_id,
-                _log_fn=svc_log,
-                progress_callback=_make_progress_callback(
-                    scrape_run_id, "Craigslist", stats, max_leads=max_leads
-                ),
-            ):
-                batch_num += 1
-                fresh = [
-                    item for item in batch_items
-                    if str(item.get("id") or "") not in existing_cl_ids
-                ]
-                skipped_known = len(batch_items) - len(fresh)
-                if skipped_known:
-                    stats["leads_skipped"] += skipped_known
-                    stats.setdefault("source_skipped", {})
-                    stats["source_skipped"]["craigslist"] = (
-                        stats["source_skipped"].get("craigslist", 0) + skipped_known
-                    )
-
-                _log(
-                    scrape_run_id,
-                    f"Craigslist — batch {batch_num}/{total_batches}",
-                    f"Received {len(batch_items)} listing(s) "
-                    f"({len(fresh)} new). Saving…",
-                )
-
-                if max_leads and stats["leads_saved"] >= max_leads:
-                    raise LimitReached()
-
-                normalized = [
-                    normalize_craigslist(
-                        item, categories[0] if categories else "general"
-                    )
-                    for item in fresh
-                ]
-                _save_lead_batch(
-                    normalized, stats, scrape_run_id,
-                    source_key="craigslist", max_leads=max_leads,
-                )
-
-                for item in fresh:
-                    pid = str(item.get("id") or "")
-                    if pid:
-                        existing_cl_ids.add(pid)
-
-                cl_saved   = stats.get("source_saved",   {}).get("craigslist", 0)
-                cl_skipped = stats.get("source_skipped", {}).get("craigslist", 0)
-
-                _log(
-                    scrape_run_id,
-                    f"Craigslist — batch {batch_num} saved",
-                    f"{len(normalized)} processed — "
-                    f"{cl_saved} CL leads saved, "
-                    f"{cl_skipped} duplicate(s).",
-                    level="success",
-                )
-
-            _log(
-                scrape_run_id, "Craigslist — complete",
-                f"All {batch_num} batch(es) done. "
-                f"{stats.get('source_saved', {}).get('craigslist', 0)} CL lead(s) saved.",
-                level="success",
-            )
-
-        except LimitReached:
-            _log(
-                scrape_run_id, "Craigslist — limit reached",
-                f"max_leads={max_leads} reached after "
-                f"{stats['leads_saved']} lead(s) — stopping.",
-                level="success",
-            )
-            stats["limit_stop"] = True
-            _finalise_run(scrape_run_id, stats)
-            # Abort actors in background so we don't block the return
-            threading.Thread(
-                target=_abort_all_actors,
-                args=(scrape_run_id,),
-                daemon=True,
-            ).start()
-            return stats
-
-        except Exception as e:
-            _log(scrape_run_id, "Craigslist — error", str(e), level="error")
-            stats["errors"].append(f"Craigslist: {str(e)}")
+    # ── Source stages ──────────────────────────────────────────
+    stages = []
 
+    if "craigslist" in sources and cl_cities and cl_codes:
+        stages.append(("Craigslist", lambda: _run_craigslist_pipeline(
+            cl_cities=cl_cities,
+            cl_codes=cl_codes,
+            categories=categories,
+            stats=stats,
+            scrape_run_id=scrape_run_id,
+            svc_log=svc_log,
+            max_leads=max_leads,
+            process_pool=process_pool,
+            max_age=cl_max_age,
+        )))
     elif "craigslist" in sources:
         _log(
             scrape_run_id, "Craigslist — skipped",
@@ -765,7 +955,6 @@ def run_pipeline(
             level="warning",
         )
 
-    # ── Facebook ───────────────────────────────────────────────
     if "facebook" in sources:
         manual_group_urls = [u.strip() for u in (fb_group_urls or []) if u.strip()]
 
@@ -775,41 +964,20 @@ def run_pipeline(
                 "No group URLs provided. Add group URLs to scrape Facebook.",
                 level="warning",
             )
-        elif _cancelled(scrape_run_id):
-            _log(
-                scrape_run_id, "Facebook — skipped",
-                "Cancelled before Facebook could start.", level="warning",
-            )
         else:
-            try:
-                _run_facebook_pipeline(
-                    manual_group_urls=manual_group_urls,
-                    max_posts_per_group=max_posts_per_group,
-                    stats=stats,
-                    scrape_run_id=scrape_run_id,
-                    svc_log=svc_log,
-                    max_leads=max_leads,
-                    categories=categories,        # ADD
-                    location_data=location_data,  # ADD
-                )
-            except LimitReached:
-                _log(
-                    scrape_run_id, "Craigslist — limit reached",
-                    f"max_leads={max_leads} reached after "
-                    f"{stats['leads_saved']} lead(s) — stopping.",
-                    level="success",
-                )
-                stats["limit_stop"] = True
-                _finalise_run(scrape_run_id, stats)
-                # Abort actors in background so we don't block the return
-                threading.Thread(
-                    target=_abort_all_actors,
-                    args=(scrape_run_id,),
-                    daemon=True,
-                ).start()
-                return stats
-
-    # ── Google ─────────────────────────────────────────────────
+            stages.append(("Facebook", lambda: _run_facebook_pipeline(
+                manual_group_urls=manual_group_urls,
+                max_posts_per_group=max_posts_per_group,
+                stats=stats,
+                scrape_run_id=scrape_run_id,
+                svc_log=svc_log,
+                max_leads=max_leads,
+                categories=categories,        # ADD
+                location_data=location_data,  # ADD
+                process_pool=process_pool,
+                newer_than=fb_newer_than,
+            )))
+
     if "google" in sources:
         if not location_data:
             _log(
@@ -817,43 +985,49 @@ def run_pipeline(
                 "No location set — Google Search requires a location.",
                 level="warning",
             )
-        elif _cancelled(scrape_run_id):
-            _log(
-                scrape_run_id, "Google Search — skipped",
-                "Cancelled before Google Search could start.", level="warning",
-            )
         else:
-            try:
-                _run_google_pipeline(
-                    categories=categories,
-                    location_data=location_data,
-                    google_max_pages=google_max_pages,
-                    google_deep_scrape=google_deep_scrape,
-                    stats=stats,
-                    scrape_run_id=scrape_run_id,
-                    svc_log=svc_log,
-                    max_leads=max_leads,
-                )
-            except LimitReached:
-                _log(
-                    scrape_run_id, "Craigslist — limit reached",
-                    f"max_leads={max_leads} reached after "
-                    f"{stats['leads_saved']} lead(s) — stopping.",
-                    level="success",
-                )
-                stats["limit_stop"] = True
-                _finalise_run(scrape_run_id, stats)
-                # Abort actors in background so we don't block the return
-                threading.Thread(
-                    target=_abort_all_actors,
-                    args=(scrape_run_id,),
-                    daemon=True,
-                ).start()
-                return stats
+            stages.append(("Google Search", lambda: _run_google_pipeline(
+                categories=categories,
+                location_data=location_data,
+                google_max_pages=google_max_pages,
+                google_deep_scrape=google_deep_scrape,
+                stats=stats,
+                scrape_run_id=scrape_run_id,
+                svc_log=svc_log,
+                max_leads=max_leads,
+            )))
+
+    limit_source = _run_source_stages(stages, stats, scrape_run_id, concurrent=concurrent_sources)
+
+    if limit_source:
+        _log(
+            scrape_run_id, f"{limit_source} — limit reached",
+            f"max_leads={max_leads} reached after "
+            f"{stats['leads_saved']} lead(s) — stopping.",
+            level="success",
+        )
+        _finalise_run(scrape_run_id, stats)
+        # Abort actors in background so we don't block the return
+        threading.Thread(
+            target=_abort_all_actors,
+            args=(scrape_run_id,),
+            daemon=True,
+        ).start()
+        return stats
 
     # ── Finalise ───────────────────────────────────────────────
+    if is_detached(scrape_run_id):
+        # Another worker took the job over — the run's row is its to finish
+        _log(
+            scrape_run_id, "Stopped on this worker",
+            f"Another worker took over the run after {stats['leads_saved']} lead(s) saved here.",
+            level="warning",
+        )
+        return stats
+
     if scrape_run_id:
         try:
+            flush_progress(scrape_run_id)
             run = ScrapeRun.objects.get(pk=scrape_run_id)
             if run.status == "RUNNING":
                 run.status = "SUCCEEDED" if not stats["errors"] else "PARTIAL"
@@ -883,6 +1057,100 @@ def run_pipeline(
     return stats
 
 
+def _run_craigslist_pipeline(
+    *,
+    cl_cities,
+    cl_codes,
+    categories,
+    stats,
+    scrape_run_id,
+    svc_log,
+    max_leads: int = 0,
+    process_pool: bool = False,
+    max_age: int = None,
+):
+    total_batches = -(-len(cl_cities) // 3)
+    _log(
+        scrape_run_id, "Craigslist — starting",
+        f"Scraping {len(cl_cities)} region(s) across {len(cl_codes)} "
+        f"categor{'y' if len(cl_codes) == 1 else 'ies'} "
+        f"in ~{total_batches} batch(es)."
+        + (f" Incremental — postings from the last {max_age} day(s) only." if max_age else ""),
+    )
+
+    try:
+        from base.models import ServiceLead
+        existing_cl_ids = set(
+            ServiceLead.objects.filter(source="CRAIGSLIST")
+            .values_list("post_id", flat=True)
+        )
+    except Exception:
+        existing_cl_ids = set()
+
+    batch_num = 0
+    for batch_items in scrape_craigslist_progressive(
+        cl_cities, cl_codes,
+        scrape_run_id=scrape_run_id,
+        _log_fn=svc_log,
+        progress_callback=_make_progress_callback(
+            scrape_run_id, "Craigslist", stats, max_leads=max_leads
+        ),
+        max_age=max_age,
+    ):
+        batch_num += 1
+        fresh = [
+            item for item in batch_items
+            if str(item.get("id") or "") not in existing_cl_ids
+        ]
+        skipped_known = len(batch_items) - len(fresh)
+        if skipped_known:
+            _count_skipped(stats, "craigslist", skipped_known)
+
+        _log(
+            scrape_run_id,
+            f"Craigslist — chunk {batch_num}",
+            f"Received {len(batch_items)} listing(s) "
+            f"({len(fresh)} new). Saving…",
+        )
+
+        if max_leads and stats["leads_saved"] >= max_leads:
+            raise LimitReached()
+
+        service_category = categories[0] if categories else "general"
+        if process_pool:
+            normalized = normalize_craigslist_items(fresh, service_category)
+        else:
+            normalized = normalize_craigslist_batch(fresh, service_category)
+        _save_lead_batch(
+            normalized, stats, scrape_run_id,
+            source_key="craigslist", max_leads=max_leads,
+        )
+
+        for item in fresh:
+            pid = str(item.get("id") or "")
+            if pid:
+                existing_cl_ids.add(pid)
+
+        cl_saved   = stats.get("source_saved",   {}).get("craigslist", 0)
+        cl_skipped = stats.get("source_skipped", {}).get("craigslist", 0)
+
+        _log(
+            scrape_run_id,
+            f"Craigslist — chunk {batch_num} saved",
+            f"{len(normalized)} processed — "
+            f"{cl_saved} CL leads saved, "
+            f"{cl_skipped} duplicate(s).",
+            level="success",
+        )
+
+    _log(
+        scrape_run_id, "Craigslist — complete",
+        f"All {batch_num} chunk(s) done. "
+        f"{stats.get('source_saved', {}).get('craigslist', 0)} CL lead(s) saved.",
+        level="success",
+    )
+
+
 def _run_facebook_pipeline(
     *,
     manual_group_urls,
@@ -893,6 +1161,8 @@ def _run_facebook_pipeline(
     max_leads: int = 0,
     categories: list = None,     # ADD
     location_data: dict = None,
+    process_pool: bool = False,
+    newer_than: str = None,
 ):
     all_group_urls: list[str] = []
     seen: set[str] = set()
@@ -938,6 +1208,7 @@ def _run_facebook_pipeline(
         progress_callback=_make_progress_callback(
             scrape_run_id, "Facebook", stats, max_leads=max_leads
         ),
+        newer_than=newer_than,
     ):
         chunk_num += 1
 
@@ -945,7 +1216,7 @@ def _run_facebook_pipeline(
         if max_leads and stats["leads_saved"] >= max_leads:
             raise LimitReached()
 
-        if _cancelled(scrape_run_id):
+        if is_cancelled(scrape_run_id):
             fb_saved = stats.get("source_saved", {}).get("facebook", 0)
             _log(
                 scrape_run_id, "Facebook — cancelled",
@@ -989,8 +1260,9 @@ def _run_facebook_pipeline(
             max_leads=max_leads,
             categories=categories or [],                                                              # ADD
             location_str=(location_data or {}).get("facebook_location_str", ""),                     # ADD
+            process_pool=process_pool,
         )
-        if _cancelled(scrape_run_id):
+        if is_cancelled(scrape_run_id):
             fb_saved = stats.get("source_saved", {}).get("facebook", 0)
             _log(
                 scrape_run_id, "Facebook — cancelled",
@@ -1063,7 +1335,7 @@ def _run_google_pipeline(
         scrape_run_id=scrape_run_id,
         _log_fn=svc_log,
         enrich_callback=lambda cm: _enrich_saved_google_leads(
-            cm, scrape_run_id, svc_log
+            cm, stats, scrape_run_id, svc_log
         ),
         progress_callback=_make_progress_callback(
             scrape_run_id, "Google", stats, max_leads=max_leads
@@ -1086,13 +1358,9 @@ def _run_google_pipeline(
                 contacts_map=contacts_map,
             )
             for lead in page_leads:
-                url = lead.get("url", "")
+                url = lead.url
                 if url and url in existing_google_urls:
-                    stats["leads_skipped"] += 1
-                    stats.setdefault("source_skipped", {})
-                    stats["source_skipped"]["google"] = (
-                        stats["source_skipped"].get("google", 0) + 1
-                    )
+                    _count_skipped(stats, "google")
                     continue
                 all_leads.append(lead)
                 if url:
@@ -1132,9 +1400,9 @@ def _run_google_pipeline(
         )
 
         if contacts_map:
-            _enrich_saved_google_leads(contacts_map, scrape_run_id, svc_log)
+            _enrich_saved_google_leads(contacts_map, stats, scrape_run_id, svc_log)
 
-        if _cancelled(scrape_run_id):
+        if is_cancelled(scrape_run_id):
             _log(
                 scrape_run_id, "Google Search — cancelled",
                 f"Cancelled after query {query_num}. "
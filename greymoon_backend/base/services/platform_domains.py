@@ -0,0 +1,16 @@
+# ── Directory and social hosts ────────────────────────────────
+#
+# Sites that list or host many businesses. A Google result on one is not
+# a contractor's own website (so it is neither crawled nor saved as a
+# lead), and a lead URL on one says nothing about which business it is
+# (so it never becomes an entity's domain key).
+
+SKIP_DOMAINS = {
+    "yelp.com", "angi.com", "thumbtack.com", "homeadvisor.com",
+    "homedepot.com", "lowes.com", "amazon.com", "indeed.com",
+    "linkedin.com", "facebook.com", "instagram.com", "youtube.com",
+    "bbb.org", "angieslist.com", "taskrabbit.com", "craigslist.org",
+    "nextdoor.com", "google.com", "twitter.com", "x.com",
+    "yellowpages.com", "tiktok.com", "pinterest.com", "reddit.com",
+    "mapquest.com", "manta.com", "houzz.com", "porch.com", "bark.com",
+}
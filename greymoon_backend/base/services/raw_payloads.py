@@ -0,0 +1,59 @@
+import json
+import zlib
+
+COMPRESS_LEVEL = 6
+
+# The few raw keys the lead cards show — kept on the lead row as raw_summary
+SUMMARY_KEYS = (
+    "authorName", "author", "authorUrl",
+    "groupName", "group", "groupUrl",
+    "likesCount", "commentsCount", "sharesCount",
+)
+
+
+def compress_payload(payload) -> tuple[bytes, int]:
+    """(zlib-compressed compact JSON, uncompressed size)."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return zlib.compress(raw, COMPRESS_LEVEL), len(raw)
+
+
+def decompress_payload(data):
+    if not data:
+        return None
+    return json.loads(zlib.decompress(bytes(data)))
+
+
+def raw_summary(payload) -> dict | None:
+    if not isinstance(payload, dict):
+        return None
+    summary = {k: payload[k] for k in SUMMARY_KEYS if payload.get(k) not in (None, "")}
+    return summary or None
+
+
+def store_raw_payloads(payloads: dict) -> int:
+    """
+    Write {lead pk: payload} to LeadRawPayload; None payloads are skipped
+    and a lead that already has one keeps it. Returns the rows sent.
+    """
+    from base.models import LeadRawPayload
+
+    rows = []
+    for pk, payload in payloads.items():
+        if payload is None:
+            continue
+        data, size = compress_payload(payload)
+        rows.append(LeadRawPayload(lead_id=pk, data=data, size=size))
+    if rows:
+        LeadRawPayload.objects.bulk_create(rows, ignore_conflicts=True, batch_size=500)
+    return len(rows)
+
+
+def load_raw_payload(lead_pk):
+    """A lead's full source item, or None if it has none stored."""
+    from base.models import LeadRawPayload
+
+    data = (
+        LeadRawPayload.objects.filter(lead_id=lead_pk)
+        .values_list("data", flat=True).first()
+    )
+    return decompress_payload(data)
@@ -0,0 +1,142 @@
+import copy
+import threading
+
+from .cancellation import is_detached
+
+STAT_KEYS = ("leads_saved", "leads_skipped", "source_saved", "source_skipped")
+
+
+class RunCheckpoint:
+    """
+    Resume state for one ScrapeRun, written to ScrapeRun.checkpoint on
+    every change:
+
+        {"sources": {"craigslist": {"done":     ["0", "2"],
+                                    "inflight": {"1": {"run_id": …, "dataset_id": …, "offset": 500}}},
+                     "facebook":   {…}, "google": {…}},
+         "stats":   {"leads_saved": …, "leads_skipped": …, …}}
+
+    Keys are batch (or query) indexes. The batch lists are rebuilt from the
+    same job arguments on resume, so an index names the same batch again.
+    A batch is marked in flight the moment its actor is launched, advanced
+    only after the pipeline has saved a page, and done once its last page
+    is saved. Resuming re-attaches to the recorded run, reads the dataset
+    from the stored offset and skips done batches.
+
+    With no scrape_run_id nothing is persisted.
+    """
+
+    def __init__(self, scrape_run_id, data: dict = None):
+        self.scrape_run_id = scrape_run_id
+        self._lock   = threading.Lock()
+        self._data   = copy.deepcopy(data) if data else {}
+        self._data.setdefault("sources", {})
+        self._stats  = None
+
+    def _source(self, source: str) -> dict:
+        return self._data["sources"].setdefault(source, {"done": [], "inflight": {}})
+
+    # ── Reads ─────────────────────────────────────────────────
+    def is_done(self, source: str, key) -> bool:
+        with self._lock:
+            return str(key) in self._source(source)["done"]
+
+    def inflight(self, source: str, key) -> dict | None:
+        with self._lock:
+            state = self._source(source)["inflight"].get(str(key))
+            return dict(state) if state else None
+
+    def saved_stats(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._data.get("stats") or {})
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not any(
+                s["done"] or s["inflight"] for s in self._data["sources"].values()
+            )
+
+    # ── Updates ───────────────────────────────────────────────
+    def bind_stats(self, stats: dict) -> None:
+        """Snapshot these run counters with every save, so a resume carries them on."""
+        self._stats = stats
+
+    def start(self, source: str, key, run_id: str, dataset_id: str, offset: int = 0) -> None:
+        with self._lock:
+            self._source(source)["inflight"][str(key)] = {
+                "run_id":     run_id,
+                "dataset_id": dataset_id,
+                "offset":     offset,
+            }
+        self.save()
+
+    def advance(self, source: str, key, offset: int) -> None:
+        with self._lock:
+            state = self._source(source)["inflight"].get(str(key))
+            if state is None or offset <= state["offset"]:
+                return
+            state["offset"] = offset
+        self.save()
+
+    def complete(self, source: str, key) -> None:
+        with self._lock:
+            src = self._source(source)
+            src["inflight"].pop(str(key), None)
+            if str(key) not in src["done"]:
+                src["done"].append(str(key))
+        self.save()
+
+    def save(self) -> None:
+        # A detached run's checkpoint belongs to the worker that took it over
+        if not self.scrape_run_id or is_detached(self.scrape_run_id):
+            return
+        with self._lock:
+            if self._stats is not None:
+                self._data["stats"] = {k: copy.copy(self._stats[k]) for k in STAT_KEYS}
+            snapshot = copy.deepcopy(self._data)
+        try:
+            from base.models import ScrapeRun
+            ScrapeRun.objects.filter(pk=self.scrape_run_id).update(checkpoint=snapshot)
+        except Exception as e:
+            print(f"[Checkpoint] Could not save checkpoint for run {self.scrape_run_id}: {e}")
+
+
+_registry: dict = {}
+_registry_lock = threading.Lock()
+
+
+def get_checkpoint(scrape_run_id) -> RunCheckpoint:
+    """The run's live checkpoint — a throwaway one if the run has none open."""
+    with _registry_lock:
+        checkpoint = _registry.get(scrape_run_id) if scrape_run_id else None
+    return checkpoint or RunCheckpoint(None)
+
+
+def open_checkpoint(scrape_run_id, resume: bool = False) -> RunCheckpoint:
+    """
+    Register the run's checkpoint for this process. A fresh run starts
+    from an empty one (and clears any left in the row); a resume loads
+    what the previous attempt recorded.
+    """
+    data = {}
+    if resume and scrape_run_id:
+        try:
+            from base.models import ScrapeRun
+            data = (
+                ScrapeRun.objects.filter(pk=scrape_run_id)
+                .values_list("checkpoint", flat=True).first()
+            ) or {}
+        except Exception as e:
+            print(f"[Checkpoint] Could not load checkpoint for run {scrape_run_id}: {e}")
+    checkpoint = RunCheckpoint(scrape_run_id, data)
+    if not resume:
+        checkpoint.save()
+    if scrape_run_id:
+        with _registry_lock:
+            _registry[scrape_run_id] = checkpoint
+    return checkpoint
+
+
+def release_checkpoint(scrape_run_id) -> None:
+    with _registry_lock:
+        _registry.pop(scrape_run_id, None)
@@ -0,0 +1,219 @@
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+FLUSH_INTERVAL     = 0.25   # seconds between bulk inserts
+MAX_EVENTS_PER_RUN = 2000   # older events are trimmed — the log is a ring buffer
+TRIM_EVERY         = 200    # events written for a run between trims
+
+
+class RunSignal:
+    """
+    Per-run change counter that stream readers can block on. Bumped after
+    events or progress for a run are written, so a reader in the same
+    process wakes straight away; readers in another process simply time
+    out and re-read the tables.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._versions: dict = {}
+
+    def version(self, scrape_run_id) -> int:
+        with self._cond:
+            return self._versions.get(scrape_run_id, 0)
+
+    def notify(self, scrape_run_id) -> None:
+        with self._cond:
+            self._versions[scrape_run_id] = self._versions.get(scrape_run_id, 0) + 1
+            self._cond.notify_all()
+
+    def wait(self, scrape_run_id, version: int, timeout: float) -> int:
+        """Wait until the run's version differs from `version`; return the current one."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._versions.get(scrape_run_id, 0) != version, timeout,
+            )
+            return self._versions.get(scrape_run_id, 0)
+
+
+run_signal = RunSignal()
+
+
+class RunEventWriter:
+    """
+    Buffered, append-only writer for RunEvent rows.
+
+    emit() only enqueues; one background thread bulk-inserts whatever has
+    queued up every FLUSH_INTERVAL seconds and trims each run back to
+    MAX_EVENTS_PER_RUN. seq is assigned at flush, from the run's
+    RunEventCounter in the same transaction as the insert. The counter
+    row stays locked until commit, so when the web process and a worker
+    both write events for a run, the one holding lower seqs has always
+    committed first — a reader that has seen seq N can page on
+    `seq > N` without missing anything flushed after it read.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, max_events: int = MAX_EVENTS_PER_RUN):
+        self.interval   = interval
+        self.max_events = max_events
+
+        self._queue: queue.Queue = queue.Queue()
+        self._since_trim: dict = {}
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def emit(self, scrape_run_id, stage: str, detail: str, level: str = "info", extra: dict = None) -> dict:
+        entry = {
+            "seq":    None,   # assigned when the entry is written
+            "ts":     datetime.now(timezone.utc),
+            "stage":  stage,
+            "detail": detail,
+            "level":  level,
+            "extra":  extra or None,
+        }
+        self._ensure_thread()
+        self._queue.put((scrape_run_id, entry))
+        return entry
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    # ── Writer thread ─────────────────────────────────────────
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="run-event-writer", daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch, waiters = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, batch: list):
+        from base.models import RunEvent
+        from django.db import close_old_connections, transaction
+
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                next_seq = _allocate_seqs(batch)
+                rows = []
+                for scrape_run_id, e in batch:
+                    if scrape_run_id not in next_seq:
+                        continue
+                    e["seq"] = next_seq[scrape_run_id]
+                    next_seq[scrape_run_id] += 1
+                    rows.append(RunEvent(
+                        run_id=scrape_run_id,
+                        seq=e["seq"],
+                        ts=e["ts"],
+                        stage=(e["stage"] or "")[:200],
+                        detail=e["detail"] or "",
+                        level=e["level"],
+                        extra=e["extra"],
+                    ))
+                RunEvent.objects.bulk_create(rows, batch_size=500)
+        except Exception as e:
+            print(f"[Events] Could not write {len(batch)} run event(s): {e}")
+            return
+
+        touched: dict = {}
+        for scrape_run_id, _ in batch:
+            touched[scrape_run_id] = touched.get(scrape_run_id, 0) + 1
+        for scrape_run_id, n in touched.items():
+            run_signal.notify(scrape_run_id)
+            self._since_trim[scrape_run_id] = self._since_trim.get(scrape_run_id, 0) + n
+            if self._since_trim[scrape_run_id] >= TRIM_EVERY:
+                self._since_trim[scrape_run_id] = 0
+                self._trim(scrape_run_id)
+
+    def _trim(self, scrape_run_id):
+        from base.models import RunEvent
+        try:
+            cutoff = (
+                RunEvent.objects.filter(run_id=scrape_run_id)
+                .order_by("-seq")
+                .values_list("seq", flat=True)[self.max_events:self.max_events + 1]
+            )
+            cutoff = list(cutoff)
+            if cutoff:
+                RunEvent.objects.filter(run_id=scrape_run_id, seq__lte=cutoff[0]).delete()
+        except Exception as e:
+            print(f"[Events] Could not trim events for run {scrape_run_id}: {e}")
+
+
+def _allocate_seqs(batch: list) -> dict:
+    """
+    Reserve seqs for a batch; returns {run pk: first seq}, leaving out
+    runs that no longer exist. Call inside the transaction that inserts
+    the events — the counter rows stay locked until it commits. Runs are
+    locked in pk order so two writers can't deadlock.
+    """
+    from base.models import RunEvent, RunEventCounter, ScrapeRun
+    from django.db import IntegrityError, transaction
+    from django.db.models import F, Max
+
+    counts: dict = {}
+    for scrape_run_id, _ in batch:
+        counts[scrape_run_id] = counts.get(scrape_run_id, 0) + 1
+
+    first = {}
+    for scrape_run_id in sorted(counts):
+        n = counts[scrape_run_id]
+        if not RunEventCounter.objects.filter(run_id=scrape_run_id).update(last_seq=F("last_seq") + n):
+            if not ScrapeRun.objects.filter(pk=scrape_run_id).exists():
+                continue
+            # First events for the run — start after any written before counters existed
+            start = RunEvent.objects.filter(run_id=scrape_run_id).aggregate(m=Max("seq"))["m"] or 0
+            try:
+                with transaction.atomic():
+                    RunEventCounter.objects.create(run_id=scrape_run_id, last_seq=start + n)
+            except IntegrityError:
+                # Another writer created it first
+                RunEventCounter.objects.filter(run_id=scrape_run_id).update(last_seq=F("last_seq") + n)
+        last = RunEventCounter.objects.filter(run_id=scrape_run_id).values_list("last_seq", flat=True).get()
+        first[scrape_run_id] = last - n + 1
+    return first
+
+
+_writer = RunEventWriter()
+
+
+def log_event(scrape_run_id, stage: str, detail: str, level: str = "info", extra: dict = None) -> dict | None:
+    if not scrape_run_id:
+        return None
+    return _writer.emit(scrape_run_id, stage, detail, level=level, extra=extra)
+
+
+def flush_events(timeout: float = 5.0) -> None:
+    _writer.flush(timeout)
@@ -0,0 +1,129 @@
+import threading
+
+from .run_events import run_signal
+
+FLUSH_INTERVAL = 0.5    # seconds — max staleness of ScrapeRun progress fields
+FLUSH_EVERY    = 100    # leads (saved + skipped) between forced flushes
+
+
+class RunProgress:
+    """
+    In-memory progress for one ScrapeRun.
+
+    Counters, stage and source stats are kept here and written to the
+    ScrapeRun row in one UPDATE — straight away once FLUSH_EVERY leads
+    have been counted, otherwise by a one-shot timer armed on the first
+    change after a flush, so the row is never more than FLUSH_INTERVAL
+    behind. close() cancels the timer and does a final flush.
+    """
+
+    def __init__(self, scrape_run_id, interval: float = FLUSH_INTERVAL, every: int = FLUSH_EVERY):
+        self.scrape_run_id = scrape_run_id
+        self.interval      = interval
+        self.every         = every
+
+        self._lock       = threading.Lock()   # guards the in-memory state
+        self._flush_lock = threading.Lock()   # keeps DB writes in order
+        self._dirty: dict = {}
+        self._pending_leads = 0
+        self._saved   = 0
+        self._skipped = 0
+        self._source_stats: dict = {}
+        self._timer = None
+
+    # ── Updates ───────────────────────────────────────────────
+    def set_counts(self, saved: int, skipped: int) -> None:
+        with self._lock:
+            self._pending_leads += abs(saved - self._saved) + abs(skipped - self._skipped)
+            self._saved, self._skipped = saved, skipped
+            self._dirty["leads_collected"] = saved
+            self._dirty["leads_skipped"]   = skipped
+            flush_now = self._pending_leads >= self.every
+            if not flush_now:
+                self._arm_timer()
+        if flush_now:
+            self.flush()
+
+    def set_stage(self, stage: str, detail: str) -> None:
+        with self._lock:
+            self._dirty["current_stage"] = stage
+            self._dirty["stage_detail"]  = detail
+            self._arm_timer()
+
+    def set_detail(self, detail: str) -> None:
+        with self._lock:
+            self._dirty["stage_detail"] = detail
+            self._arm_timer()
+
+    def set_source_stats(self, source: str, saved: int, skipped: int) -> None:
+        with self._lock:
+            self._source_stats[source] = {"saved": saved, "skipped": skipped}
+            self._dirty["source_stats"] = dict(self._source_stats)
+            self._arm_timer()
+
+    # ── Flushing ──────────────────────────────────────────────
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                fields, self._dirty = self._dirty, {}
+                self._pending_leads = 0
+            if not fields:
+                return
+            try:
+                from base.models import ScrapeRun
+                ScrapeRun.objects.filter(pk=self.scrape_run_id).update(**fields)
+            except Exception as e:
+                print(f"[Progress] Could not flush run progress: {e}")
+                return
+            run_signal.notify(self.scrape_run_id)
+
+    def _arm_timer(self):
+        # Caller holds self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            from django.db import connection
+            connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
+        self.flush()
+
+
+_registry: dict = {}
+_registry_lock = threading.Lock()
+
+
+def get_progress(scrape_run_id) -> RunProgress | None:
+    if not scrape_run_id:
+        return None
+    with _registry_lock:
+        progress = _registry.get(scrape_run_id)
+        if progress is None:
+            progress = _registry[scrape_run_id] = RunProgress(scrape_run_id)
+        return progress
+
+
+def flush_progress(scrape_run_id) -> None:
+    with _registry_lock:
+        progress = _registry.get(scrape_run_id)
+    if progress:
+        progress.flush()
+
+
+def close_progress(scrape_run_id) -> None:
+    with _registry_lock:
+        progress = _registry.pop(scrape_run_id, None)
+    if progress:
+        progress.close()
@@ -0,0 +1,249 @@
+import math
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+
+from .craigslist_service import DEFAULT_MAX_AGE
+
+TICK_INTERVAL  = 30     # seconds between scheduler checks
+WINDOW_OVERLAP = 60     # minutes re-read before the last run, so nothing slips between runs
+CRON_HORIZON   = 5      # years searched for the next fire time
+
+CRON_ALIASES = {
+    "@hourly":  "0 * * * *",
+    "@daily":   "0 0 * * *",
+    "@weekly":  "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# ── Cron ──────────────────────────────────────────────────────
+def _parse_field(text: str, lo: int, hi: int) -> set[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"bad step in '{text}'")
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end   = hi if step > 1 else start
+        if not lo <= start <= end <= hi:
+            raise ValueError(f"'{text}' is outside {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expr: str) -> tuple:
+    """
+    Parse a 5-field cron expression (or @hourly/@daily/@weekly/@monthly)
+    into (minutes, hours, days, months, weekdays, days_any, weekdays_any).
+    Raises ValueError if it is malformed.
+    """
+    expr   = CRON_ALIASES.get((expr or "").strip().lower(), expr or "")
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron needs 5 fields, got {len(fields)}: '{expr}'")
+    try:
+        minutes, hours, days, months, weekdays = (
+            _parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, CRON_FIELDS)
+        )
+    except ValueError as e:
+        raise ValueError(f"invalid cron '{expr}': {e}") from None
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+    return minutes, hours, days, months, weekdays, fields[2].startswith("*"), fields[4].startswith("*")
+
+
+def next_fire(expr: str, after: datetime) -> datetime:
+    """First minute strictly after `after` that the cron expression matches (UTC)."""
+    minutes, hours, days, months, weekdays, days_any, weekdays_any = parse_cron(expr)
+
+    def day_matches(t):
+        in_month = t.day in days
+        in_week  = (t.weekday() + 1) % 7 in weekdays
+        # Cron rule: with both fields restricted, either one may match
+        if days_any or weekdays_any:
+            return in_month and in_week
+        return in_month or in_week
+
+    t     = after.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = t + timedelta(days=366 * CRON_HORIZON)
+    while t < limit:
+        if t.month not in months:
+            t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+        elif not day_matches(t):
+            t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+        elif t.hour not in hours:
+            t = (t + timedelta(hours=1)).replace(minute=0)
+        elif t.minute not in minutes:
+            t += timedelta(minutes=1)
+        else:
+            return t
+    raise ValueError(f"cron '{expr}' never fires")
+
+
+# ── Incremental windows ───────────────────────────────────────
+def incremental_window(spec, now: datetime = None) -> dict:
+    """
+    run_pipeline arguments that limit a scheduled run to postings since the
+    spec's last successful run (less WINDOW_OVERLAP): the Craigslist maxAge
+    in days and the Facebook onlyPostsNewerThan date. Empty for a first
+    run, or one overdue by more than the default window — those get the
+    full default window.
+    """
+    now  = now or _now()
+    last = (
+        spec.runs.filter(status="SUCCEEDED", limit_stop=False)
+        .order_by("-created_at").first()
+    )
+    if last is None:
+        return {}
+
+    overlap = timedelta(minutes=getattr(settings, "SCHEDULE_WINDOW_OVERLAP", WINDOW_OVERLAP))
+    since   = last.created_at - overlap
+    days    = max(1, math.ceil((now - since).total_seconds() / 86400))
+    if days >= DEFAULT_MAX_AGE:
+        return {}
+    return {
+        "cl_max_age":    days,
+        "fb_newer_than": since.date().isoformat(),
+    }
+
+
+# ── Firing ────────────────────────────────────────────────────
+def fire(spec, now: datetime = None):
+    """Create and queue one run of `spec`; returns the ScrapeRun."""
+    from base.models import ScrapeRun
+    from .job_queue import enqueue_pipeline
+    from .location_resolver import resolve_location, LocationResolutionError
+    from .run_events import log_event, flush_events
+
+    now     = now or _now()
+    display = "Facebook Groups"
+    if spec.location_value:
+        try:
+            display = resolve_location(spec.location_type, spec.location_value)["display"]
+        except LocationResolutionError:
+            display = spec.location_value
+
+    window = incremental_window(spec, now)
+    run = ScrapeRun.objects.create(
+        run_id=str(uuid.uuid4()),
+        status="RUNNING",
+        location_type=spec.location_type or "custom",
+        location_value=spec.location_value or "",
+        location_display=display,
+        max_posts_per_group=spec.max_posts_per_group,
+        categories=spec.categories,
+        sources=spec.sources,
+        current_stage="Queued",
+        stage_detail=f"Scheduled by '{spec.name}' — waiting for a worker…",
+        google_max_pages=spec.google_max_pages,
+        google_deep_scrape=spec.google_deep_scrape,
+        max_leads=spec.max_leads,
+        schedule=spec,
+    )
+    enqueue_pipeline(
+        run.pk,
+        location_type=spec.location_type or "custom",
+        location_value=spec.location_value or "",
+        categories=spec.categories,
+        sources=spec.sources,
+        max_posts_per_group=spec.max_posts_per_group,
+        fb_group_urls=spec.fb_group_urls or [],
+        google_max_pages=spec.google_max_pages,
+        google_deep_scrape=spec.google_deep_scrape,
+        max_leads=spec.max_leads,
+        **window,
+    )
+
+    log_event(
+        run.pk, "Scheduled",
+        f"Fired by schedule '{spec.name}' ({spec.cron}) — "
+        + (
+            f"incremental: Craigslist last {window['cl_max_age']} day(s), "
+            f"Facebook posts since {window['fb_newer_than']}."
+            if window else "full window (no recent successful run)."
+        ),
+    )
+    flush_events()
+    return run
+
+
+def tick(now: datetime = None) -> list:
+    """
+    Fire every enabled spec that is due and move its next_run_at on.
+    Safe to call from several worker processes at once: advancing
+    next_run_at is a compare-and-set, so only one of them fires a spec.
+    A spec whose previous run is still going skips this slot.
+    """
+    from base.models import ScheduledScrape
+
+    now   = now or _now()
+    fired = []
+
+    # New or edited specs: work out when they first fire
+    for spec in ScheduledScrape.objects.filter(enabled=True, next_run_at__isnull=True):
+        try:
+            first = next_fire(spec.cron, now)
+        except ValueError as e:
+            print(f"[Scheduler] '{spec.name}': {e} — not scheduled")
+            continue
+        ScheduledScrape.objects.filter(pk=spec.pk, next_run_at__isnull=True).update(next_run_at=first)
+
+    for spec in ScheduledScrape.objects.filter(enabled=True, next_run_at__lte=now):
+        try:
+            following = next_fire(spec.cron, now)
+        except ValueError as e:
+            print(f"[Scheduler] '{spec.name}': {e} — skipped")
+            continue
+
+        won = ScheduledScrape.objects.filter(pk=spec.pk, next_run_at=spec.next_run_at).update(
+            next_run_at=following, last_fired_at=now,
+        )
+        if not won:
+            continue    # another worker took this slot
+
+        if spec.runs.filter(status="RUNNING").exists():
+            print(f"[Scheduler] '{spec.name}': previous run still going — skipping this slot")
+            continue
+
+        try:
+            run = fire(spec, now)
+            fired.append(run)
+            print(f"[Scheduler] '{spec.name}' fired run {run.run_id}; next at {following:%Y-%m-%d %H:%M} UTC")
+        except Exception as e:
+            print(f"[Scheduler] '{spec.name}' could not fire: {e}")
+    return fired
+
+
+def run_scheduler(stop, interval: float = None) -> None:
+    """Call tick() every `interval` seconds until the `stop` event is set."""
+    from django.db import connection
+
+    interval = interval or getattr(settings, "SCHEDULER_INTERVAL", TICK_INTERVAL)
+    try:
+        while not stop.is_set():
+            try:
+                tick()
+            except Exception as e:
+                print(f"[Scheduler] Tick failed: {e}")
+            stop.wait(interval)
+    finally:
+        connection.close()
@@ -0,0 +1,243 @@
+"""
+synthetic_leads.py
+──────────────────
+Seeded generator of realistic raw actor items for benchmarks — Craigslist
+listings, Facebook group posts and Google SERP pages — with controlled
+rates of exact reposts and near-duplicates.
+
+Every generated CL/FB item comes with a ground-truth label: None for an
+original, or the index of the original it duplicates. Labels are returned
+alongside the items rather than stored on them, so they never leak into
+raw_json or the content hash.
+
+    gen = SyntheticLeadGenerator(seed=7, dup_rate=0.1, near_dup_rate=0.1)
+    items, truth = gen.craigslist(10_000)
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+TRADES = [
+    ("plumber",      ["leaky sink", "clogged drain", "water heater", "burst pipe", "toilet install"]),
+    ("electrician",  ["panel upgrade", "outlet wiring", "ceiling fan", "breaker trips", "ev charger"]),
+    ("handyman",     ["drywall patch", "door hanging", "fence gate", "shelf mounting", "deck boards"]),
+    ("house cleaner", ["move out clean", "deep clean", "weekly cleaning", "carpet shampoo", "window wash"]),
+    ("landscaper",   ["tree trimming", "sod install", "mulch beds", "sprinkler fix", "leaf cleanup"]),
+    ("roofer",       ["shingle repair", "roof leak", "gutter guards", "flashing fix", "storm damage"]),
+    ("painter",      ["interior walls", "cabinet refinish", "exterior trim", "fence stain", "garage floor"]),
+    ("hvac tech",    ["ac not cooling", "furnace tune up", "duct cleaning", "thermostat swap", "heat pump"]),
+]
+OPENERS   = ["Need", "Looking for", "Seeking", "Hiring", "Want", "ISO"]
+TITLES    = [
+    "{opener} {trade} for {job} on {street}{urgency}",
+    "{Job} - {trade} needed near {street}{urgency}",
+    "{Trade} wanted: {job} ({street})",
+    "{Job} help at {street}, {city}{urgency}",
+    "Who can do {job}? {street}{urgency}",
+]
+URGENCY   = ["", "", "", "ASAP", "this weekend", "urgent", "same day", "next week"]
+CITIES    = [
+    ("Austin", "TX", "78701", 30.27, -97.74), ("Round Rock", "TX", "78664", 30.51, -97.68),
+    ("Houston", "TX", "77002", 29.76, -95.37), ("Dallas", "TX", "75201", 32.78, -96.80),
+    ("Denver", "CO", "80202", 39.74, -104.99), ("Phoenix", "AZ", "85004", 33.45, -112.07),
+    ("Tampa", "FL", "33602", 27.95, -82.46), ("Raleigh", "NC", "27601", 35.78, -78.64),
+]
+STREETS   = ["Oak", "Maple", "Cedar", "Elm", "Pecan", "Willow", "Birch", "Juniper", "Aspen", "Magnolia"]
+FIRST     = ["Maria", "James", "Linh", "Ahmed", "Grace", "Carlos", "Priya", "Tom", "Keisha", "Noah"]
+SYLLABLES = ["ka", "ro", "mi", "tel", "van", "dor", "shi", "lux", "pen", "zar", "qui", "bel"]
+
+CRAIGSLIST_ACTOR = "ivanvs~craigslist-scraper"
+FACEBOOK_ACTOR   = "apify~facebook-groups-scraper"
+SERP_ACTOR       = "apify~google-search-scraper"
+CRAWL_ACTOR      = "apify~website-content-crawler"
+
+BLANK_ITEM_EVERY = 97    # real datasets carry empty and #error-only items too
+
+
+def _with_blank_items(items: list) -> list:
+    """Every BLANK_ITEM_EVERY-th slot an item Apify's clean=true would drop."""
+    out = []
+    for i, item in enumerate(items, 1):
+        out.append(item)
+        if i % BLANK_ITEM_EVERY == 0:
+            out.append({} if (i // BLANK_ITEM_EVERY) % 2 else {"#error": "page load failed"})
+    return out
+
+
+class SyntheticLeadGenerator:
+    def __init__(self, seed: int = 0, dup_rate: float = 0.1, near_dup_rate: float = 0.1):
+        if dup_rate + near_dup_rate >= 1:
+            raise ValueError("dup_rate + near_dup_rate must be below 1")
+        self.rng           = random.Random(seed)
+        self.dup_rate      = dup_rate
+        self.near_dup_rate = near_dup_rate
+        self.now           = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        self._serial       = 0
+
+    # ── Building blocks ───────────────────────────────────────
+    def _next_id(self) -> int:
+        self._serial += 1
+        return self._serial
+
+    def _word(self) -> str:
+        return "".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 3)))
+
+    def _phone(self) -> str:
+        return f"({self.rng.randint(201, 989)}) {self.rng.randint(200, 999)}-{self.rng.randint(0, 9999):04d}"
+
+    def _listing(self) -> dict:
+        """The human content of one original request."""
+        trade, jobs = self.rng.choice(TRADES)
+        job         = self.rng.choice(jobs)
+        city        = self.rng.choice(CITIES)
+        street      = f"{self.rng.randint(100, 9999)} {self.rng.choice(STREETS)} {self._word().title()}"
+        urgency     = self.rng.choice(URGENCY)
+        title       = self.rng.choice(TITLES).format(
+            opener=self.rng.choice(OPENERS),
+            trade=trade, Trade=trade.capitalize(),
+            job=job, Job=job.capitalize(),
+            street=street, city=city[0],
+            urgency=f" {urgency}" if urgency else "",
+        )
+        contact     = self.rng.random()
+        body = (
+            f"Hi, {self.rng.choice(FIRST)} here. We have a {job} at our place near {street}, "
+            f"{city[0]}. Looking for a licensed {trade} who can come out {urgency or 'soon'}. "
+            f"Project ref {self._word()}-{self.rng.randint(10, 99)}."
+        )
+        if contact < 0.55:
+            body += f" Call or text {self._phone()}."
+        elif contact < 0.75:
+            body += f" Email me at {self._word()}{self.rng.randint(1, 99)}@example.com."
+        return {
+            "title": title,
+            "body":  body,
+            "city":  city,
+            "when":  self.now - timedelta(hours=self.rng.uniform(0, 240)),
+        }
+
+    def _perturb(self, title: str) -> str:
+        """A near-duplicate title — the kind of edit people make on a repost."""
+        edits = [
+            lambda t: t.upper(),
+            lambda t: t + "!!",
+            lambda t: "REPOST: " + t,
+            lambda t: t.replace("-", " ", 1),
+            lambda t: t.replace(",", "", 1) + " !",
+            lambda t: t + " - please call",
+        ]
+        for edit in self.rng.sample(edits, self.rng.randint(1, 2)):
+            title = edit(title)
+        return title
+
+    def _plan(self, n: int, make):
+        """
+        n items from make(listing, title, body) with a ground-truth list.
+        Reposts copy an earlier original verbatim; near-duplicates perturb
+        its title and body a little.
+        """
+        items, truth, originals = [], [], []
+        for _ in range(n):
+            roll = self.rng.random()
+            if originals and roll < self.dup_rate:
+                src, listing = self.rng.choice(originals)
+                items.append(make(listing, listing["title"], listing["body"]))
+                truth.append(src)
+            elif originals and roll < self.dup_rate + self.near_dup_rate:
+                src, listing = self.rng.choice(originals)
+                body = listing["body"].replace("Hi, ", "Hello! ", 1) + " Thanks!"
+                items.append(make(listing, self._perturb(listing["title"]), body))
+                truth.append(src)
+            else:
+                listing = self._listing()
+                originals.append((len(items), listing))
+                items.append(make(listing, listing["title"], listing["body"]))
+                truth.append(None)
+        return items, truth
+
+    # ── Sources ───────────────────────────────────────────────
+    def craigslist(self, n: int) -> tuple[list[dict], list]:
+        def make(listing, title, body):
+            pid  = 7_800_000_000 + self._next_id()
+            city = listing["city"]
+            return {
+                "id":           str(pid),
+                "url":          f"https://{city[0].lower().replace(' ', '')}.craigslist.org/hss/d/{pid}.html",
+                "title":        title,
+                "post":         body,
+                "location":     city[0],
+                "state":        city[1],
+                "zip_code":     city[2],
+                "latitude":     round(city[3] + self.rng.uniform(-0.1, 0.1), 5),
+                "longitude":    round(city[4] + self.rng.uniform(-0.1, 0.1), 5),
+                "mapAccuracy":  self.rng.choice([5, 10, 22]),
+                "category":     "hss",
+                "datetime":     listing["when"].isoformat(),
+                "phoneNumbers": [],
+            }
+        return self._plan(n, make)
+
+    def facebook(self, n: int, groups: int = 5) -> tuple[list[dict], list]:
+        group_urls = [f"https://www.facebook.com/groups/{self._word()}{i}/" for i in range(groups)]
+
+        def make(listing, title, body):
+            pid   = self._next_id()
+            group = self.rng.choice(group_urls)
+            return {
+                "postId":     f"fb{pid}",
+                "url":        f"{group}posts/{pid}/",
+                "text":       f"{title}\n{body}",
+                "authorName": self.rng.choice(FIRST),
+                "groupName":  f"{listing['city'][0]} Neighbors",
+                "inputUrl":   group,
+                "time":       listing["when"].isoformat(),
+            }
+        return self._plan(n, make)
+
+    def google_serp(self, n_pages: int, results_per_page: int = 10) -> list[dict]:
+        """SERP pages; every organic result is a distinct business site."""
+        pages = []
+        for _ in range(n_pages):
+            trade, _ = self.rng.choice(TRADES)
+            city     = self.rng.choice(CITIES)
+            results  = []
+            for _ in range(results_per_page):
+                name   = f"{self._word().title()} {trade.title()} Co"
+                domain = f"{self._word()}{self._next_id()}.com"
+                desc   = f"{name} serves {city[0]}, {city[1]}. Licensed and insured."
+                if self.rng.random() < 0.5:
+                    desc += f" Call {self._phone()}."
+                results.append({"title": name, "url": f"https://www.{domain}/", "description": desc})
+            pages.append({
+                "searchQuery":    {"term": f"{trade} {city[0]} {city[1]}"},
+                "organicResults": results,
+                "paidResults":    [],
+                "businessLeads":  [],
+            })
+        return pages
+
+    def crawled_pages(self, serp_pages: list[dict]) -> list[dict]:
+        """A website-content-crawler result for each organic site."""
+        pages = []
+        for page in serp_pages:
+            for result in page.get("organicResults") or []:
+                contact = f"Call us at {self._phone()} or write to office@{result['url'].split('/')[2][4:]}"
+                pages.append({"url": result["url"] + "contact", "text": f"{result['title']}. {contact}."})
+        return pages
+
+    def actor_fixtures(self, n: int, runs: int = 2) -> dict:
+        """
+        {actor_id: [[items], …]} in the apify_mock fixture layout — about
+        n CL and n FB items split over `runs` actor runs, plus SERP and
+        crawler datasets. The CL and crawler datasets, read with clean=true,
+        carry some blank items.
+        """
+        per_run = max(1, n // runs)
+        serp    = self.google_serp(max(1, n // 50))
+        return {
+            CRAIGSLIST_ACTOR: [_with_blank_items(self.craigslist(per_run)[0]) for _ in range(runs)],
+            FACEBOOK_ACTOR:   [self.facebook(per_run)[0] for _ in range(runs)],
+            SERP_ACTOR:       [serp],
+            CRAWL_ACTOR:      [_with_blank_items(self.crawled_pages(serp))],
+        }
+
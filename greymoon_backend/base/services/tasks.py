@@ -1,7 +1,7 @@
-import threading
-from .pipeline import run_pipeline
+from .job_queue import enqueue_pipeline as _enqueue
 
-def start_pipeline_thread(
+
+def enqueue_pipeline(
     location_type,
     location_value,
     categories,
@@ -13,20 +13,19 @@ def start_pipeline_thread(
     google_deep_scrape=True,
     max_leads=0,
 ):
-    def _run():
-        run_pipeline(
-            location_type=location_type,
-            location_value=location_value,
-            categories=categories,
-            sources=sources,
-            scrape_run_id=scrape_run_id,
-            max_posts_per_group=max_posts_per_group,
-            fb_group_urls=fb_group_urls or [],
-            google_max_pages=google_max_pages,
-            google_deep_scrape=google_deep_scrape,
-            max_leads=max_leads,
-        )
-
-    t = threading.Thread(target=_run, daemon=False)
-    t.start()
-    return t
\ No newline at end of file
+    """
+    Queue a run for `manage.py run_workers` (or for an in-process thread while
+    PIPELINE_IN_PROCESS_WORKER is on); the request thread returns at once.
+    """
+    return _enqueue(
+        scrape_run_id,
+        location_type=location_type,
+        location_value=location_value,
+        categories=categories,
+        sources=sources,
+        max_posts_per_group=max_posts_per_group,
+        fb_group_urls=fb_group_urls or [],
+        google_max_pages=google_max_pages,
+        google_deep_scrape=google_deep_scrape,
+        max_leads=max_leads,
+    )
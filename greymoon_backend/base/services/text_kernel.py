@@ -0,0 +1,106 @@
+import re
+from functools import lru_cache
+
+# ── Patterns ──────────────────────────────────────────────────
+#
+# Shared by every normalizer and the website crawler. Emails and phones
+# are one alternation, so a text is scanned once for both. Digits that
+# belong to an address are never read as a phone: the email branch is
+# tried first, and a number running straight into "…@" is rejected.
+
+_EMAIL = r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"
+_PHONE = r"\+?1?\s?[\(\-]?\d{3}[\)\-\s]?\s?\d{3}[\-\s]?\d{4}"
+
+# Crawled pages: tel: links first, then loosely formatted numbers
+_TEL_FORMATTED  = r"""href=["']tel:[\+]?1?[\-\s\.]?(?P<tel>\(?\d{3}\)?[\-\s\.]?\d{3}[\-\s\.]\d{4})"""
+_TEL_RAW        = r"""href=["']tel:[\+]?1?(?P<tel_raw>\d{10})["']"""
+_PAGE_PHONE     = r"\+?1?[\s\.\-]?[\(\-]?\d{3}[\)\.\-\s][\.\-\s]?\d{3}[\.\-\s]\d{4}"
+_NOT_IN_EMAIL   = r"(?![a-zA-Z0-9_.+-]*@[a-zA-Z0-9-]+\.)"
+
+CONTACT_RE      = re.compile(f"(?P<email>{_EMAIL})|(?P<phone>{_PHONE}){_NOT_IN_EMAIL}")
+PHONE_RE        = re.compile(_PHONE)
+PAGE_CONTACT_RE = re.compile(
+    f"{_TEL_FORMATTED}|{_TEL_RAW}|(?P<email>{_EMAIL})|(?P<phone>{_PAGE_PHONE}){_NOT_IN_EMAIL}"
+)
+EMAIL_SKIP_RE   = re.compile("|".join(map(re.escape, (
+    "noreply", "no-reply", ".png", ".jpg", ".gif", ".svg",
+    ".css", ".js", "example.com", "sentry.io",
+    "wixpress.com", "squarespace.com", "wordpress.com",
+))))
+ZIP_RE          = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_NON_WORD       = re.compile(r"[\W_]+")
+
+PAGE_CONTACT_LIMIT = 5       # phones/emails kept per crawled page
+TITLE_CACHE_SIZE   = 65536
+
+
+# ── Contacts ──────────────────────────────────────────────────
+def extract_contacts(text: str) -> tuple[str | None, str | None]:
+    """(first phone, first email) in `text`, from one scan that stops once both are found."""
+    if not text:
+        return None, None
+    if "@" not in text:
+        m = PHONE_RE.search(text)
+        return (m.group().strip() if m else None), None
+
+    phone = email = None
+    for m in CONTACT_RE.finditer(text):
+        if m.lastgroup == "email":
+            email = email or m.group()
+        else:
+            phone = phone or m.group().strip()
+        if phone and email:
+            break
+    return phone, email
+
+
+def extract_contacts_many(texts) -> list[tuple[str | None, str | None]]:
+    """extract_contacts() over a batch of texts, in order."""
+    return [extract_contacts(t) for t in texts]
+
+
+def extract_page_contacts(text: str, limit: int = PAGE_CONTACT_LIMIT) -> dict:
+    """
+    {"phones": [...], "emails": [...]} from a crawled page — tel: links
+    ahead of numbers found in the text, emails lower-cased with asset
+    and no-reply addresses dropped, each list de-duplicated in order.
+    """
+    if not text:
+        return {"phones": [], "emails": []}
+
+    tel, text_phones, emails = [], [], []
+    for m in PAGE_CONTACT_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "tel":
+            tel.append(m.group("tel"))
+        elif kind == "tel_raw":
+            d = m.group("tel_raw")
+            tel.append(f"({d[:3]}) {d[3:6]}-{d[6:]}")
+        elif kind == "email":
+            email = m.group().lower()
+            if not EMAIL_SKIP_RE.search(email):
+                emails.append(email)
+        else:
+            text_phones.append(m.group().strip())
+
+    return {
+        "phones": list(dict.fromkeys(tel + text_phones))[:limit],
+        "emails": list(dict.fromkeys(emails))[:limit],
+    }
+
+
+def extract_zip(text: str) -> str | None:
+    """First 5-digit ZIP code (ZIP+4 allowed) in `text`."""
+    if not text:
+        return None
+    m = ZIP_RE.search(text)
+    return m.group(1) if m else None
+
+
+# ── Titles ────────────────────────────────────────────────────
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def normalize_title(title: str) -> str:
+    """Lowercase, punctuation and whitespace runs collapsed to one space — for dedup and hashing."""
+    if not title:
+        return ""
+    return _NON_WORD.sub(" ", title.lower()).strip()
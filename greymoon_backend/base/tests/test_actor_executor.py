@@ -0,0 +1,142 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from base.models import ScrapeRun
+from base.services.actor_executor import ActorBatchExecutor, BatchIncomplete
+from base.services.run_checkpoint import open_checkpoint, release_checkpoint
+
+
+def _worker(outcomes):
+    """A worker that emits its batch, then finishes the way outcomes[b_idx] says."""
+    def run(b_idx, batch, emit):
+        emit(batch)
+        outcome = outcomes.get(b_idx)
+        if outcome == "incomplete":
+            raise BatchIncomplete("actor run FAILED")
+        if outcome == "error":
+            raise RuntimeError("boom")
+    return run
+
+
+def _execute(batches, outcomes, on_done, cancelled=lambda run_id: False):
+    executor = ActorBatchExecutor("craigslist", concurrency=2, log=lambda msg: None)
+    with mock.patch("base.services.actor_executor.is_cancelled", side_effect=cancelled):
+        return list(executor.run(batches, _worker(outcomes), on_done=on_done))
+
+
+class ActorBatchExecutorTests(SimpleTestCase):
+
+    def test_on_done_only_for_batches_that_finished(self):
+        done = []
+        out  = _execute([["a"], ["b"], ["c"]], {1: "incomplete", 2: "error"}, done.append)
+
+        # Everything emitted is still yielded for saving
+        self.assertEqual(sorted(out), [(0, ["a"]), (1, ["b"]), (2, ["c"])])
+        self.assertEqual(done, [0])
+
+    def test_cancelled_batch_is_not_done(self):
+        calls = {"n": 0}
+
+        def cancelled(run_id):
+            # Not cancelled while launching, cancelled by the time the worker returns
+            calls["n"] += 1
+            return calls["n"] > 1
+
+        done = []
+        out  = _execute([["a"]], {}, done.append, cancelled)
+
+        self.assertEqual(out, [(0, ["a"])])
+        self.assertEqual(done, [])
+
+    def test_worker_blocks_on_full_queue_and_stops_with_consumer(self):
+        state    = {"emitted": 0, "error": None}
+        finished = threading.Event()
+
+        def worker(b_idx, batch, emit):
+            try:
+                for page in range(100):
+                    emit([page])
+                    state["emitted"] += 1
+            except BatchIncomplete as e:
+                state["error"] = str(e)
+            finally:
+                finished.set()
+
+        executor = ActorBatchExecutor("craigslist", concurrency=1, log=lambda msg: None)
+        with mock.patch("base.services.actor_executor.is_cancelled", return_value=False):
+            results = executor.run([["a"]], worker)
+            self.assertEqual(next(results), (0, [0]))
+            results.close()
+
+            self.assertTrue(finished.wait(5))
+        # Never more than the queue's worth ahead of the consumer
+        self.assertLessEqual(state["emitted"], 4)
+        self.assertEqual(state["error"], "consumer stopped")
+
+
+class CheckpointResumeTests(TestCase):
+
+    def setUp(self):
+        self.run = ScrapeRun.objects.create(run_id="run-1")
+        self.addCleanup(release_checkpoint, self.run.pk)
+
+    def test_resume_retries_failed_batch(self):
+        checkpoint = open_checkpoint(self.run.pk)
+        for key in range(3):
+            checkpoint.start("craigslist", key, f"actor-{key}", f"ds-{key}")
+
+        _execute(
+            [["a"], ["b"], ["c"]], {1: "incomplete", 2: "error"},
+            lambda pos: checkpoint.complete("craigslist", pos),
+        )
+
+        resumed = open_checkpoint(self.run.pk, resume=True)
+        self.assertTrue(resumed.is_done("craigslist", 0))
+        self.assertFalse(resumed.is_done("craigslist", 1))
+        self.assertFalse(resumed.is_done("craigslist", 2))
+        self.assertEqual(resumed.inflight("craigslist", 1)["run_id"], "actor-1")
+        self.assertIsNone(resumed.inflight("craigslist", 0))
+
+
+class GoogleQueryCheckpointTests(TestCase):
+
+    def setUp(self):
+        self.run = ScrapeRun.objects.create(run_id="run-g")
+        self.addCleanup(release_checkpoint, self.run.pk)
+
+    def _scrape(self, status, fetch=None):
+        from base.services import google_search_service as google
+
+        fetch = fetch or (lambda dataset_id: [{"organicResults": []}])
+        with mock.patch.object(google, "_launch_actor", return_value=("serp-1", "ds-1")), \
+             mock.patch.object(google, "run_status", return_value=status), \
+             mock.patch.object(google, "_fetch_dataset", side_effect=fetch), \
+             mock.patch.object(google, "wait_for_actor", return_value=False):
+            return list(google.scrape_google_search_progressive(
+                ["plumber"], "Austin, TX", deep_scrape_sites=False,
+                scrape_run_id=self.run.pk, _log_fn=lambda msg: None,
+            ))
+
+    def test_succeeded_query_is_done(self):
+        checkpoint = open_checkpoint(self.run.pk)
+        self._scrape("SUCCEEDED")
+        self.assertTrue(checkpoint.is_done("google", 0))
+
+    def test_failed_query_stays_in_flight(self):
+        checkpoint = open_checkpoint(self.run.pk)
+        for status in ("FAILED", "ABORTED", "TIMED-OUT"):
+            with self.subTest(status=status):
+                # Partial pages are still handed over for saving
+                self.assertEqual(len(self._scrape(status)), 1)
+                self.assertFalse(checkpoint.is_done("google", 0))
+                self.assertEqual(checkpoint.inflight("google", 0)["run_id"], "serp-1")
+
+    def test_unread_dataset_stays_in_flight(self):
+        def fetch(dataset_id):
+            raise RuntimeError("502")
+
+        checkpoint = open_checkpoint(self.run.pk)
+        self.assertEqual(self._scrape("SUCCEEDED", fetch), [])
+        self.assertFalse(checkpoint.is_done("google", 0))
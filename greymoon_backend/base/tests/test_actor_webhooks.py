@@ -0,0 +1,86 @@
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from base.models import ActorRunStatus
+from base.services import actor_webhooks
+from base.services.actor_webhooks import ActorRunRegistry, launch_webhooks, run_status, wait_for_actor
+
+
+@override_settings(APIFY_WEBHOOK_URL="https://example.test/api/apify/webhook/",
+                   APIFY_WEBHOOK_SECRET="s3cret", APIFY_WEBHOOK_FALLBACK_POLL=30)
+class ActorWebhookTests(TestCase):
+
+    def setUp(self):
+        # A fresh registry stands in for a worker process that never saw the webhook
+        patcher = mock.patch.object(actor_webhooks, "actor_runs", ActorRunRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_webhook_view_stores_status(self):
+        resp = APIClient().post(
+            reverse("apify_webhook") + "?secret=s3cret",
+            {"eventType": "ACTOR.RUN.SUCCEEDED", "eventData": {"actorRunId": "run-1"}},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(ActorRunStatus.objects.get(pk="run-1").status, "SUCCEEDED")
+
+    def test_webhook_view_rejects_bad_secret(self):
+        resp = APIClient().post(
+            reverse("apify_webhook") + "?secret=nope",
+            {"eventType": "ACTOR.RUN.FAILED", "eventData": {"actorRunId": "run-1"}},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(ActorRunStatus.objects.exists())
+
+    def test_run_status_reads_status_stored_by_another_process(self):
+        ActorRunStatus.objects.create(apify_run_id="run-2", status="FAILED")
+        with mock.patch.object(actor_webhooks, "get_client") as client:
+            self.assertEqual(run_status("run-2"), "FAILED")
+        client.assert_not_called()
+
+    def test_wait_returns_at_once_when_status_already_stored(self):
+        ActorRunStatus.objects.create(apify_run_id="run-3", status="SUCCEEDED")
+        started = time.monotonic()
+        self.assertFalse(wait_for_actor(None, "run-3", interval=5))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_wait_polls_shared_row_at_the_short_interval(self):
+        # No in-process receiver: the row is checked every interval, not every 30s
+        with mock.patch.object(actor_webhooks, "delivered_status",
+                               side_effect=[None, None, "SUCCEEDED"]) as delivered:
+            started = time.monotonic()
+            self.assertFalse(wait_for_actor(None, "run-4", interval=0.05))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(delivered.call_count, 3)
+
+
+@override_settings(APIFY_WEBHOOK_URL="https://example.test/api/apify/webhook/", APIFY_WEBHOOK_SECRET="")
+class WebhookWithoutSecretTests(TestCase):
+
+    def test_receiver_rejects_every_call(self):
+        for query in ("", "?secret="):
+            resp = APIClient().post(
+                reverse("apify_webhook") + query,
+                {"eventType": "ACTOR.RUN.SUCCEEDED", "eventData": {"actorRunId": "run-1"}},
+                format="json",
+            )
+            self.assertEqual(resp.status_code, 403)
+        self.assertFalse(ActorRunStatus.objects.exists())
+
+    def test_no_webhooks_attached_and_stored_rows_ignored(self):
+        self.assertIsNone(launch_webhooks())
+        ActorRunStatus.objects.create(apify_run_id="run-5", status="SUCCEEDED")
+        with mock.patch.object(actor_webhooks, "get_client") as client:
+            client.return_value.run_status.return_value = "RUNNING"
+            self.assertEqual(run_status("run-5"), "RUNNING")
+
+    @override_settings(APIFY_WEBHOOK_SECRET="s3cret")
+    def test_secret_is_sent_with_the_webhook(self):
+        [hook] = launch_webhooks()
+        self.assertEqual(hook["requestUrl"], "https://example.test/api/apify/webhook/?secret=s3cret")
@@ -0,0 +1,79 @@
+from django.test import SimpleTestCase
+
+from base.services.apify_client import ApifyClient, clean_items
+from base.services.apify_mock import _project
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class _DatasetClient(ApifyClient):
+    """Answers GET /datasets/{id}/items from a list, the way Apify pages it."""
+
+    def __init__(self, items):
+        super().__init__(token="test")
+        self.items    = items
+        self.requests = []
+
+    def request(self, method, path, *, label, params=None, **kwargs):
+        params = params or {}
+        self.requests.append(params)
+        offset = int(params.get("offset", 0))
+        limit  = int(params.get("limit", len(self.items)))
+        page   = self.items[offset:offset + limit]
+        return _Response(_project(page, clean=params.get("clean") == "true"))
+
+
+def _dataset():
+    # 10 real items with blanks at raw positions 2, 5 and 6
+    items = [{"id": i} for i in range(10)]
+    items.insert(2, {})
+    items.insert(5, {"#error": "timeout"})
+    items.insert(6, {})
+    return items
+
+
+class IterDatasetPagesTests(SimpleTestCase):
+
+    def test_clean_read_gets_every_item_and_counts_raw_offsets(self):
+        client = _DatasetClient(_dataset())
+
+        pages = list(client.iter_dataset_pages("ds", page_size=4, clean=True))
+
+        self.assertEqual([i["id"] for _, items in pages for i in items], list(range(10)))
+        self.assertEqual([offset for offset, _ in pages], [4, 8, 12, 13])
+        self.assertTrue(all("clean" not in params for params in client.requests))
+
+    def test_resume_from_saved_offset_continues_at_raw_position(self):
+        client = _DatasetClient(_dataset())
+        offset, _ = next(client.iter_dataset_pages("ds", page_size=4, clean=True))
+
+        rest = [i["id"] for _, items in client.iter_dataset_pages("ds", offset=offset, page_size=4, clean=True)
+                for i in items]
+
+        self.assertEqual(rest, [3, 4, 5, 6, 7, 8, 9])
+
+    def test_end_offset_caps_raw_items_read(self):
+        client = _DatasetClient(_dataset())
+
+        pages = list(client.iter_dataset_pages("ds", page_size=4, end_offset=6))
+
+        self.assertEqual(pages[-1][0], 6)
+        self.assertEqual(sum(len(items) for _, items in pages), 6)
+
+    def test_resumed_read_keeps_the_same_end(self):
+        client = _DatasetClient(_dataset())
+
+        pages = list(client.iter_dataset_pages("ds", offset=4, page_size=4, end_offset=6))
+
+        self.assertEqual([offset for offset, _ in pages], [6])
+        self.assertEqual(sum(len(items) for _, items in pages), 2)
+
+    def test_mock_clean_drops_empty_and_hidden_only_items(self):
+        self.assertEqual(_project(_dataset()[:7], clean=True), [{"id": i} for i in range(4)])
+        self.assertEqual(clean_items([{"a": 1, "#b": 2}, {"#c": 3}, {}]), [{"a": 1}])
@@ -0,0 +1,66 @@
+from django.test import SimpleTestCase
+
+from base.services.fuzzy_title import TitleLSHIndex, _bucket_key, prepare_title, title_similarity
+from base.services.text_kernel import normalize_title
+
+BASE = "Experienced house cleaner available weekends in Austin"
+
+
+def _index(*titles):
+    index = TitleLSHIndex()
+    for title in titles:
+        index.add(title)
+    return index
+
+
+class TitleLSHIndexTests(SimpleTestCase):
+
+    def test_near_duplicates_are_candidates(self):
+        index = _index(BASE)
+        for title in (
+            "EXPERIENCED HOUSE CLEANER AVAILABLE WEEKENDS IN AUSTIN",
+            "REPOST: Experienced house cleaner available weekends in Austin",
+            "Experienced house cleaner available weekends in Austin!!!",
+            "Experienced house cleaners available on weekends in Austin",
+        ):
+            with self.subTest(title=title):
+                # Threshold 0 — any candidate at all is returned
+                self.assertIsNotNone(index.find_similar(title, 0.0))
+
+    def test_near_duplicate_in_another_bucket_is_found_by_lsh(self):
+        typo = "Experienced house claener available weekends in Austin"
+        self.assertNotEqual(_bucket_key(normalize_title(typo)), _bucket_key(normalize_title(BASE)))
+
+        self.assertIsNotNone(_index(BASE).find_similar(typo, 0.0))
+
+    def test_unrelated_titles_are_not_candidates(self):
+        index = _index(BASE)
+        for title in (
+            "Need a plumber for a leaking kitchen sink",
+            "Selling used mountain bike, great condition",
+        ):
+            with self.subTest(title=title):
+                self.assertIsNone(index.find_similar(title, 0.0))
+
+    def test_similarity_threshold_decides_the_match(self):
+        index = _index(BASE)
+        title = "Experienced house cleaners available on weekends in Austin"
+        sim   = title_similarity(BASE, title)
+
+        self.assertEqual(index.find_similar(title, sim), (normalize_title(BASE), sim))
+        self.assertIsNone(index.find_similar(title, sim + 0.01))
+
+    def test_exact_normalised_match(self):
+        index = _index(BASE)
+        self.assertEqual(index.find_similar(BASE.upper() + "!", 0.99), (normalize_title(BASE), 1.0))
+        index.add(BASE.lower())
+        self.assertEqual(len(index), 1)
+
+    def test_prepared_title_matches_like_the_raw_one(self):
+        index = _index(BASE)
+        title = "REPOST: Experienced house cleaner available weekends in Austin"
+
+        self.assertEqual(
+            index.find_similar(title, 0.65, prepared=prepare_title(title)),
+            index.find_similar(title, 0.65),
+        )
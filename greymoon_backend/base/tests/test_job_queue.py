@@ -0,0 +1,135 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from base.models import PipelineJob, ScrapeRun
+from base.services.cancellation import LEASE_LOST, abort_actor, get_token, is_detached, release_token
+from base.services import job_queue
+from base.services.job_queue import _now, claim_job, enqueue_pipeline, renew_lease, run_job
+from base.services.run_events import flush_events
+
+
+@override_settings(PIPELINE_IN_PROCESS_WORKER=False)
+class ClaimJobTests(TestCase):
+
+    def setUp(self):
+        self.run = ScrapeRun.objects.create(run_id="run-1")
+
+    def test_claims_oldest_queued_job_once(self):
+        first  = enqueue_pipeline(self.run.pk, sources=["craigslist"])
+        second = enqueue_pipeline(self.run.pk, sources=["facebook"])
+
+        job = claim_job("w1", lease_seconds=60)
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual((job.status, job.worker_id, job.attempts), ("RUNNING", "w1", 1))
+        self.assertTrue(job.lease_token)
+
+        self.assertEqual(claim_job("w2", lease_seconds=60).pk, second.pk)
+        self.assertIsNone(claim_job("w3", lease_seconds=60))
+
+    def test_expired_lease_is_reclaimed(self):
+        enqueue_pipeline(self.run.pk)
+        stale = claim_job("w1", lease_seconds=60)
+        PipelineJob.objects.filter(pk=stale.pk).update(lease_expires_at=_now() - timedelta(seconds=1))
+
+        taken = claim_job("w2", lease_seconds=60)
+        self.assertEqual(taken.pk, stale.pk)
+        self.assertEqual((taken.worker_id, taken.attempts), ("w2", 2))
+        self.assertNotEqual(taken.lease_token, stale.lease_token)
+
+        # The first worker can no longer renew
+        self.assertFalse(renew_lease(stale, 60))
+        self.assertTrue(renew_lease(taken, 60))
+
+    def test_gives_up_after_max_attempts(self):
+        job = enqueue_pipeline(self.run.pk)
+        PipelineJob.objects.filter(pk=job.pk).update(
+            status="RUNNING", attempts=job.max_attempts,
+            lease_expires_at=_now() - timedelta(seconds=1),
+        )
+
+        self.assertIsNone(claim_job("w1", lease_seconds=60))
+        job.refresh_from_db()
+        self.run.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+        self.assertEqual(self.run.status, "FAILED")
+
+
+@override_settings(PIPELINE_IN_PROCESS_WORKER=False)
+class RunJobLeaseLossTests(TransactionTestCase):
+
+    def setUp(self):
+        self.run = ScrapeRun.objects.create(run_id="run-1")
+        enqueue_pipeline(self.run.pk)
+        self.job = claim_job("w1", lease_seconds=60)
+
+    def test_lost_lease_detaches_run(self):
+        seen = {}
+
+        def fake_pipeline(scrape_run_id, **kwargs):
+            token = get_token(scrape_run_id)
+            # Another worker takes the job over
+            PipelineJob.objects.filter(pk=self.job.pk).update(worker_id="w2", lease_token="other")
+            seen["stopped"]  = token.wait(5)
+            seen["reason"]   = token.reason
+            seen["detached"] = is_detached(scrape_run_id)
+            with mock.patch("base.services.apify_client.get_client") as get_client:
+                abort_actor(scrape_run_id, "actor-run-1")
+            seen["aborted"] = get_client.called
+            release_token(scrape_run_id)
+
+        with mock.patch("base.services.pipeline.run_pipeline", side_effect=fake_pipeline):
+            run_job(self.job, lease_seconds=0.3)
+        flush_events()
+
+        self.assertEqual(seen, {
+            "stopped": True, "reason": LEASE_LOST, "detached": True, "aborted": False,
+        })
+        job = PipelineJob.objects.get(pk=self.job.pk)
+        run = ScrapeRun.objects.get(pk=self.run.pk)
+        # The new owner's job and the run are left alone
+        self.assertEqual((job.status, job.worker_id), ("RUNNING", "w2"))
+        self.assertEqual(run.status, "RUNNING")
+        self.assertFalse(run.cancel_requested)
+        self.assertTrue(run.events.filter(stage="Worker — lease lost").exists())
+
+    def test_renewed_lease_finishes_job(self):
+        with mock.patch("base.services.pipeline.run_pipeline") as pipeline:
+            run_job(self.job, lease_seconds=60)
+
+        pipeline.assert_called_once()
+        self.assertEqual(PipelineJob.objects.get(pk=self.job.pk).status, "DONE")
+
+
+@override_settings(PIPELINE_IN_PROCESS_WORKER=True)
+class InProcessFallbackTests(TransactionTestCase):
+
+    def setUp(self):
+        self.run = ScrapeRun.objects.create(run_id="run-1")
+
+    def _enqueue(self):
+        threads = []
+        real    = job_queue.run_in_process
+        with mock.patch.object(job_queue, "run_in_process", side_effect=lambda pk: threads.append(real(pk))), \
+             mock.patch("base.services.pipeline.run_pipeline") as pipeline:
+            job = enqueue_pipeline(self.run.pk, sources=["craigslist"])
+            for thread in threads:
+                thread.join(10)
+        return job, threads, pipeline
+
+    def test_queued_job_runs_without_a_worker(self):
+        job, threads, pipeline = self._enqueue()
+
+        self.assertEqual(len(threads), 1)
+        pipeline.assert_called_once_with(scrape_run_id=self.run.pk, sources=["craigslist"], resume=False)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker_id.rsplit(":", 1)[1]), ("DONE", "web"))
+
+    def test_worker_process_leaves_jobs_to_its_slots(self):
+        with mock.patch.object(job_queue, "_worker_process", True):
+            job, threads, pipeline = self._enqueue()
+
+        self.assertEqual(threads, [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, "QUEUED")
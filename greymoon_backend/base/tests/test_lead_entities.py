@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase, TestCase
+
+from base.models import LeadEntity, ServiceLead
+from base.services.lead_entities import entity_keys, link_lead_entities, registrable_domain
+
+
+class EntityKeyTests(SimpleTestCase):
+
+    def test_business_domain(self):
+        self.assertEqual(registrable_domain("https://www.shop.acme-roofing.com/contact"), "acme-roofing.com")
+        self.assertEqual(registrable_domain("http://plumbers.co.uk/"), "plumbers.co.uk")
+
+    def test_directory_and_social_hosts_are_not_domains(self):
+        for url in (
+            "https://www.linkedin.com/company/acme",
+            "https://instagram.com/acme",
+            "https://m.youtube.com/@acme",
+            "https://www.bbb.org/us/tx/acme",
+            "https://www.yellowpages.com/houston-tx/acme",
+            "https://acme.wixsite.com/home",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(registrable_domain(url), "")
+
+    def test_keys(self):
+        self.assertEqual(
+            entity_keys("(713) 555-0142", " Bob@Acme-Roofing.com ", "https://www.linkedin.com/in/bob"),
+            ("+17135550142", "bob@acme-roofing.com", "acme-roofing.com"),
+        )
+        # Webmail says nothing about the business
+        self.assertEqual(entity_keys(None, "bob@gmail.com", None), ("", "bob@gmail.com", ""))
+        self.assertEqual(entity_keys("555-0142"), ("", "", ""))
+
+
+class LinkLeadEntitiesTests(TestCase):
+
+    def _lead(self, n, phone="", email="", domain=""):
+        return ServiceLead.objects.create(
+            post_id=f"p{n}", title=f"lead {n}",
+            phone_e164=phone, email_norm=email, domain=domain,
+        )
+
+    def _link(self, *leads):
+        return link_lead_entities(
+            (lead.pk, lead.phone_e164, lead.email_norm, lead.domain) for lead in leads
+        )
+
+    def test_shared_keys_form_one_entity(self):
+        a = self._lead(1, phone="+17135550142")
+        b = self._lead(2, phone="+17135550142", email="bob@acme.com")
+        c = self._lead(3, email="bob@acme.com", domain="acme.com")
+        d = self._lead(4, domain="other.com")
+        e = self._lead(5)
+
+        self.assertEqual(self._link(a, b, c, d, e), 4)
+
+        entities = {lead.pk: lead.entity_id for lead in ServiceLead.objects.all()}
+        self.assertEqual(entities[a.pk], entities[b.pk])
+        self.assertEqual(entities[a.pk], entities[c.pk])
+        self.assertNotEqual(entities[a.pk], entities[d.pk])
+        self.assertIsNone(entities[e.pk])
+
+        entity = LeadEntity.objects.get(pk=entities[a.pk])
+        self.assertEqual(entity.lead_count, 3)
+        self.assertEqual(entity.phone_e164, "+17135550142")
+        self.assertEqual(entity.domain, "acme.com")
+
+    def test_new_lead_joins_existing_entity(self):
+        a = self._lead(1, phone="+17135550142")
+        self._link(a)
+        b = self._lead(2, phone="+17135550142")
+        self._link(b)
+
+        a.refresh_from_db()
+        b.refresh_from_db()
+        self.assertEqual(a.entity_id, b.entity_id)
+        self.assertEqual(LeadEntity.objects.count(), 1)
+        self.assertEqual(LeadEntity.objects.get().lead_count, 2)
+
+    def test_bridging_lead_merges_entities(self):
+        a = self._lead(1, phone="+17135550142")
+        b = self._lead(2, email="bob@acme.com")
+        self._link(a)
+        self._link(b)
+        first, second = sorted(LeadEntity.objects.values_list("pk", flat=True))
+
+        bridge = self._lead(3, phone="+17135550142", email="bob@acme.com")
+        self._link(bridge)
+
+        self.assertEqual(list(LeadEntity.objects.values_list("pk", flat=True)), [first])
+        self.assertEqual(
+            set(ServiceLead.objects.values_list("entity_id", flat=True)), {first},
+        )
+        self.assertEqual(LeadEntity.objects.get().lead_count, 3)
+        self.assertFalse(LeadEntity.objects.filter(pk=second).exists())
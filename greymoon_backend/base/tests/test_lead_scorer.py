@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase
+
+from base.services.lead_record import LeadRecord
+from base.services.lead_scorer import (
+    HIGH_VALUE_KEYWORDS,
+    _compile_keywords,
+    _keywords,
+    calculate_lead_score,
+    score_leads,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(**fields):
+    base = dict(
+        post_id="p1", url="", title="", post="", source="CRAIGSLIST",
+        service_category="", category="",
+    )
+    base.update(fields)
+    return LeadRecord(**base)
+
+
+class KeywordTests(SimpleTestCase):
+
+    def test_matches_substring_search(self):
+        texts = [
+            "EMERGENCY plumber, licensed and insured, same day service",
+            "Need help asap!! immediately please\nnext day is fine too",
+            "certifiedbonded",
+            "nothing to see here",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    _keywords(text),
+                    {w for w in HIGH_VALUE_KEYWORDS if w in text.lower()},
+                )
+
+    def test_nested_and_overlapping_keywords(self):
+        words = ["ab", "bc", "abc", "b"]
+        pattern = _compile_keywords(words)
+        found = {m for m in pattern.findall("xabcx")}
+        # A match at every position, the longest one there ("b" is implied by "bc")
+        self.assertEqual(found, {"abc", "bc"})
+
+
+class ScoreLeadsTests(SimpleTestCase):
+
+    def test_score_and_reasons(self):
+        record = _record(
+            title="Emergency roof repair", post="Licensed and insured",
+            phone="7135550142", email="a@b.com",
+            latitude=29.7, longitude=-95.3, service_category="sks",
+            datetime=NOW - timedelta(hours=2), map_accuracy="10",
+        )
+        scores, reasons = score_leads([record], scored_at=NOW)
+
+        self.assertEqual(reasons[0], {
+            "phone": 30, "email": 15, "geolocation": 10, "premium_category": 10,
+            "keywords": 15, "freshness_24h": 15, "cl_map_accuracy": 3,
+        })
+        self.assertEqual(scores[0], 98)
+
+    def test_keyword_score_capped_and_total_capped(self):
+        record = _record(
+            source="FACEBOOK", title=" ".join(HIGH_VALUE_KEYWORDS),
+            phone="7135550142", email="a@b.com", location="Houston",
+            latitude=29.7, longitude=-95.3, category="hss",
+            datetime=NOW,
+        )
+        scores, reasons = score_leads([record], scored_at=NOW)
+
+        self.assertEqual(reasons[0]["keywords"], 20)
+        self.assertEqual(reasons[0]["fb_contact_with_location"], 5)
+        self.assertEqual(scores[0], 100)
+
+    def test_keyword_does_not_span_title_and_post(self):
+        scores, reasons = score_leads([_record(title="same", post="day")], scored_at=NOW)
+        self.assertEqual(reasons[0], {})
+        self.assertEqual(scores[0], 0)
+
+    def test_freshness_per_record(self):
+        posted = [NOW - timedelta(hours=30)] * 2
+        records = [_record(datetime=dt) for dt in posted]
+        scores, reasons = score_leads(records, scored_at=[NOW, NOW - timedelta(hours=20)])
+
+        self.assertEqual(reasons, [{"freshness_72h": 8}, {"freshness_24h": 15}])
+        self.assertEqual(scores, [8, 15])
+
+    def test_calculate_lead_score_accepts_dict(self):
+        score, reasons = calculate_lead_score({
+            "post_id": "p1", "url": "", "title": "urgent", "post": "",
+            "source": "CRAIGSLIST", "service_category": "", "category": "",
+            "phone": "7135550142",
+        })
+        self.assertEqual(reasons, {"phone": 30, "keywords": 5})
+        self.assertEqual(score, 35)
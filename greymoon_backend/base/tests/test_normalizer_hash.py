@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from base.models import ServiceLead
+from base.services.normalizer import fast_hash, normalize_craigslist_batch
+from base.services.pipeline import _new_run_stats, _save_lead_batch
+
+TITLE = "Deep Cleaning - 3 Bedroom House!!"
+POST  = "Call Maria at 512-555-0100 for a quote"
+
+# sha256 of {"post": POST, "title_norm": "deep cleaning 3 bedroom house"} as
+# sorted-key JSON — the value rows written before the switch carry
+LEGACY_HASH = "16306193ca75409f935d764745261cf69e244f6e719bbe577695559eac0c5b73"
+FAST_HASH   = "3b0f2489af35c9ba089b686b9959d35d"
+
+
+def _record(mode, post_id="1", title=TITLE, post=POST):
+    item = {"id": post_id, "title": title, "post": post}
+    return normalize_craigslist_batch([item], "cleaning", hash_mode=mode)[0]
+
+
+def _row(post_id, content_hash, title=None, post=POST):
+    return ServiceLead.objects.create(
+        post_id=post_id, title=title or f"saved {post_id}", post=post,
+        content_hash=content_hash, source="CRAIGSLIST",
+    )
+
+
+class ContentHashModeTests(SimpleTestCase):
+
+    def test_legacy_hash_matches_baseline(self):
+        self.assertEqual(_record("legacy").content_hash, LEGACY_HASH)
+        self.assertEqual(_record("compat").legacy_content_hash, LEGACY_HASH)
+
+    def test_compat_stores_the_fast_hash(self):
+        record = _record("compat")
+        self.assertEqual(record.content_hash, FAST_HASH)
+        self.assertEqual(fast_hash("deep cleaning 3 bedroom house", POST), FAST_HASH)
+
+    def test_fast_mode_carries_no_legacy_hash(self):
+        record = _record("fast")
+        self.assertEqual(record.content_hash, FAST_HASH)
+        self.assertFalse(record.legacy_content_hash)
+
+
+class CompatDedupTests(TestCase):
+
+    def _save(self, records):
+        stats = _new_run_stats()
+        _save_lead_batch(records, stats, source_key="craigslist")
+        return stats
+
+    def test_compat_lookup_matches_either_hash(self):
+        for existing in (LEGACY_HASH, FAST_HASH):
+            with self.subTest(existing=existing):
+                ServiceLead.objects.all().delete()
+                # Different post_id and title, so only the hash can match
+                _row("old", existing)
+
+                stats = self._save([_record("compat", post_id="new")])
+
+                self.assertEqual((stats["leads_saved"], stats["leads_skipped"]), (0, 1))
+                self.assertFalse(ServiceLead.objects.filter(post_id="new").exists())
+
+    def test_batch_against_mixed_legacy_and_fast_rows(self):
+        other = "Window washing for offices downtown"
+        third = "Pressure washing driveways and decks"
+        _row("old-legacy", LEGACY_HASH)
+        _row("old-fast", _record("fast", title=other).content_hash)
+
+        stats = self._save([
+            _record("compat", post_id="a"),
+            _record("compat", post_id="b", title=other),
+            _record("compat", post_id="c", title=third),
+        ])
+
+        self.assertEqual((stats["leads_saved"], stats["leads_skipped"]), (1, 2))
+        saved = ServiceLead.objects.get(post_id="c")
+        self.assertEqual(saved.content_hash, _record("fast", title=third).content_hash)
+
+
+class RehashLeadsTests(TestCase):
+
+    def test_rehashes_legacy_rows_and_keeps_taken_ones(self):
+        other  = "Window washing for offices downtown"
+        free   = _row("legacy-free", _record("legacy", title=other).content_hash, title=other)
+        taken  = _row("legacy-taken", LEGACY_HASH, title=TITLE)
+        holder = _row("fast-holder", FAST_HASH, title=TITLE)
+
+        out = StringIO()
+        call_command("rehash_leads", stdout=out)
+
+        for row in (free, taken, holder):
+            row.refresh_from_db()
+        self.assertEqual(free.content_hash, _record("fast", title=other).content_hash)
+        # Its fast hash already belongs to another row — left on the legacy one
+        self.assertEqual(taken.content_hash, LEGACY_HASH)
+        self.assertEqual(holder.content_hash, FAST_HASH)
+        self.assertIn("1 kept their legacy hash", out.getvalue())
+
+    def test_dry_run_only_counts(self):
+        _row("legacy", LEGACY_HASH, title=TITLE)
+
+        out = StringIO()
+        call_command("rehash_leads", "--dry-run", stdout=out)
+
+        self.assertIn("1 lead(s) still on the legacy hash", out.getvalue())
+        self.assertEqual(ServiceLead.objects.get().content_hash, LEGACY_HASH)
@@ -0,0 +1,53 @@
+import threading
+
+from django.test import TestCase
+
+from base.models import ServiceLead
+from base.services.pipeline import _enrich_saved_google_leads, _new_run_stats
+
+
+class _RecordingLock:
+    """An RLock that remembers whether it was held."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.entered = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.entered += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+class EnrichSavedGoogleLeadsTests(TestCase):
+
+    def setUp(self):
+        self.lead = ServiceLead.objects.create(
+            post_id="g-1", url="https://acmeclean.com/about",
+            title="Acme Clean", source="GOOGLE",
+        )
+
+    def test_updates_contacts_and_entity_keys_under_writer_lock(self):
+        stats = _new_run_stats()
+        stats["write_lock"] = lock = _RecordingLock()
+        contacts = {"https://acmeclean.com": {"phones": ["(303) 555-1234"], "emails": ["Hi@AcmeClean.com"]}}
+
+        _enrich_saved_google_leads(contacts, stats, None, lambda *a: None)
+
+        self.lead.refresh_from_db()
+        self.assertEqual(lock.entered, 1)
+        self.assertEqual(self.lead.phone, "(303) 555-1234")
+        self.assertEqual(self.lead.phone_e164, "+13035551234")
+        self.assertEqual(self.lead.email_norm, "hi@acmeclean.com")
+        self.assertIsNotNone(self.lead.entity_id)
+
+    def test_nothing_to_enrich_takes_no_lock(self):
+        stats = _new_run_stats()
+        stats["write_lock"] = lock = _RecordingLock()
+
+        _enrich_saved_google_leads({"https://other.com": {"phones": ["3035551234"]}}, stats, None, lambda *a: None)
+
+        self.assertEqual(lock.entered, 0)
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
+
+from base.models import LeadRawPayload, ServiceLead
+from base.services.pipeline import _insert_leads_bulk
+
+
+def _lead(post_id, content_hash, phone=""):
+    return ServiceLead(
+        post_id=post_id, title=f"lead {post_id}",
+        content_hash=content_hash, phone=phone, phone_e164=phone,
+    )
+
+
+class InsertLeadsBulkTests(TestCase):
+
+    def test_new_rows_get_payloads_and_entities(self):
+        inserted = _insert_leads_bulk(
+            [_lead("p1", "h1", "+17135550142"), _lead("p2", "h2", "+17135550142")],
+            {"p1": {"id": 1}, "p2": {"id": 2}},
+        )
+
+        self.assertEqual(inserted, {"p1", "p2"})
+        rows = {row.post_id: row for row in ServiceLead.objects.all()}
+        self.assertEqual(rows["p1"].raw_payload.payload, {"id": 1})
+        self.assertEqual(rows["p2"].raw_payload.payload, {"id": 2})
+        self.assertIsNotNone(rows["p1"].entity_id)
+        self.assertEqual(rows["p1"].entity_id, rows["p2"].entity_id)
+
+    def test_rows_from_other_writers_are_not_ours(self):
+        # Saved earlier under the same post_id
+        earlier = ServiceLead.objects.create(post_id="p1", title="earlier", content_hash="other-1")
+        # Saved by a concurrent writer while this batch was being written
+        racing = ServiceLead.objects.create(post_id="p2", title="racing", content_hash="other-2")
+        ServiceLead.objects.filter(pk=racing.pk).update(
+            created_at=datetime.now(timezone.utc) + timedelta(minutes=1),
+        )
+
+        inserted = _insert_leads_bulk(
+            [
+                _lead("p1", "h1", "+17135550142"),
+                _lead("p2", "h2", "+17135550142"),
+                _lead("p3", "h3", "+17135550142"),
+            ],
+            {"p1": {"id": 1}, "p2": {"id": 2}, "p3": {"id": 3}},
+        )
+
+        self.assertEqual(inserted, {"p3"})
+        self.assertEqual(
+            list(LeadRawPayload.objects.values_list("lead__post_id", flat=True)), ["p3"],
+        )
+        for row in (earlier, racing):
+            row.refresh_from_db()
+            self.assertIsNone(row.entity_id)
+
+    def test_content_hash_conflict_is_skipped(self):
+        ServiceLead.objects.create(post_id="p0", title="same post", content_hash="h1")
+
+        inserted = _insert_leads_bulk([_lead("p1", "h1"), _lead("p2", "")], {})
+
+        self.assertEqual(inserted, {"p2"})
+        self.assertFalse(ServiceLead.objects.filter(post_id="p1").exists())
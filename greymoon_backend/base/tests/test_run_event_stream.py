@@ -0,0 +1,58 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from base.models import ScrapeRun
+from base.views import SSE_TICKET_MAX_AGE
+
+
+class RunEventStreamAuthTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("ops", "ops@example.com", "pw")
+        ScrapeRun.objects.create(run_id="r1", status="SUCCEEDED")
+        ScrapeRun.objects.create(run_id="r2", status="SUCCEEDED")
+
+    def _ticket(self, run_id="r1"):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(f"/api/scrape/runs/{run_id}/events/ticket/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["expires_in"], SSE_TICKET_MAX_AGE)
+        return response.json()["ticket"]
+
+    def _stream(self, query="", **headers):
+        return self.client.get(f"/api/scrape/runs/r1/events/{query}", headers=headers)
+
+    def test_ticket_requires_login(self):
+        self.assertEqual(APIClient().post("/api/scrape/runs/r1/events/ticket/").status_code, 401)
+
+    def test_ticket_for_unknown_run(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.post("/api/scrape/runs/nope/events/ticket/").status_code, 404)
+
+    def test_ticket_opens_its_run(self):
+        response = self._stream(f"?ticket={self._ticket()}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn("event: end", b"".join(response.streaming_content).decode())
+
+    def test_ticket_for_another_run_is_rejected(self):
+        self.assertEqual(self._stream(f"?ticket={self._ticket('r2')}").status_code, 401)
+
+    def test_expired_ticket_is_rejected(self):
+        ticket = self._ticket()
+        later  = time.time() + SSE_TICKET_MAX_AGE + 1
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            self.assertEqual(self._stream(f"?ticket={ticket}").status_code, 401)
+
+    def test_access_token_not_accepted_in_url(self):
+        token = str(AccessToken.for_user(self.user))
+        self.assertEqual(self._stream(f"?token={token}").status_code, 401)
+        self.assertEqual(self._stream(f"?ticket={token}").status_code, 401)
+        self.assertEqual(self._stream(Authorization=f"Bearer {token}").status_code, 200)
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from base.models import RunEvent, RunEventCounter, ScrapeRun
+from base.services.run_events import RunEventWriter
+
+
+def _entry(stage):
+    return {
+        "seq": None, "ts": datetime.now(timezone.utc), "stage": stage,
+        "detail": "", "level": "info", "extra": None,
+    }
+
+
+class RunEventSeqTests(TestCase):
+
+    def setUp(self):
+        self.run   = ScrapeRun.objects.create(run_id="r1")
+        self.other = ScrapeRun.objects.create(run_id="r2")
+
+    def _seqs(self, run):
+        return list(run.events.order_by("seq").values_list("stage", "seq"))
+
+    def test_seq_assigned_at_flush_in_write_order(self):
+        web, worker = RunEventWriter(), RunEventWriter()
+        late = _entry("emitted first, flushed second")
+
+        worker._write([(self.run.pk, _entry("a")), (self.other.pk, _entry("x")), (self.run.pk, _entry("b"))])
+        web._write([(self.run.pk, late)])
+
+        self.assertEqual(self._seqs(self.run), [("a", 1), ("b", 2), ("emitted first, flushed second", 3)])
+        self.assertEqual(self._seqs(self.other), [("x", 1)])
+        self.assertEqual(late["seq"], 3)
+        self.assertEqual(RunEventCounter.objects.get(run=self.run).last_seq, 3)
+
+    def test_continues_after_events_written_before_counters(self):
+        legacy = 1_760_000_000_000_000   # microsecond timestamp seqs
+        RunEvent.objects.create(run=self.run, seq=legacy, ts=datetime.now(timezone.utc), stage="old")
+
+        RunEventWriter()._write([(self.run.pk, _entry("new"))])
+
+        self.assertEqual(self._seqs(self.run), [("old", legacy), ("new", legacy + 1)])
+
+    def test_events_for_deleted_run_are_dropped(self):
+        gone = ScrapeRun.objects.create(run_id="gone")
+        gone_pk = gone.pk
+        gone.delete()
+
+        RunEventWriter()._write([(gone_pk, _entry("lost")), (self.run.pk, _entry("kept"))])
+
+        self.assertEqual(self._seqs(self.run), [("kept", 1)])
+        self.assertFalse(RunEvent.objects.filter(run_id=gone_pk).exists())
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase
+
+from base.services.scheduler import next_fire, parse_cron
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class ParseCronTests(SimpleTestCase):
+
+    def test_ranges_steps_and_stars(self):
+        minutes, hours, days, months, weekdays, days_any, weekdays_any = parse_cron("*/15 9-17 * * 1-5")
+
+        self.assertEqual(minutes, {0, 15, 30, 45})
+        self.assertEqual(hours, set(range(9, 18)))
+        self.assertEqual(days, set(range(1, 32)))
+        self.assertEqual(months, set(range(1, 13)))
+        self.assertEqual(weekdays, {1, 2, 3, 4, 5})
+        self.assertEqual((days_any, weekdays_any), (True, False))
+
+    def test_lists_and_stepped_ranges(self):
+        minutes, hours, days, *_ = parse_cron("0,30 8,20 1-10/3 * *")
+
+        self.assertEqual(minutes, {0, 30})
+        self.assertEqual(hours, {8, 20})
+        self.assertEqual(days, {1, 4, 7, 10})
+
+    def test_step_from_a_start_runs_to_the_end(self):
+        self.assertEqual(parse_cron("5/20 * * * *")[0], {5, 25, 45})
+
+    def test_sunday_as_seven(self):
+        self.assertEqual(parse_cron("0 0 * * 5-7")[4], {5, 6, 0})
+
+    def test_aliases(self):
+        self.assertEqual(parse_cron("@daily"), parse_cron("0 0 * * *"))
+        self.assertEqual(parse_cron(" @Weekly "), parse_cron("0 0 * * 0"))
+
+    def test_invalid_expressions(self):
+        for expr in (
+            "", "* * * *", "* * * * * *", "60 * * * *", "* 24 * * *", "* * 0 * *",
+            "* * * 13 *", "* * * * 8", "*/0 * * * *", "5-1 * * * *", "a * * * *",
+        ):
+            with self.subTest(expr=expr), self.assertRaises(ValueError):
+                parse_cron(expr)
+
+
+class NextFireTests(SimpleTestCase):
+
+    def test_is_strictly_after(self):
+        self.assertEqual(next_fire("*/15 * * * *", _utc(2026, 10, 18, 10, 7, 30)), _utc(2026, 10, 18, 10, 15))
+        self.assertEqual(next_fire("*/15 * * * *", _utc(2026, 10, 18, 10, 15)), _utc(2026, 10, 18, 10, 30))
+
+    def test_rolls_over_hour_day_month_and_year(self):
+        self.assertEqual(next_fire("0 * * * *", _utc(2026, 10, 18, 23, 59)), _utc(2026, 10, 19, 0, 0))
+        self.assertEqual(next_fire("@monthly", _utc(2026, 1, 31, 12, 0)), _utc(2026, 2, 1, 0, 0))
+        self.assertEqual(next_fire("@monthly", _utc(2026, 12, 15)), _utc(2027, 1, 1, 0, 0))
+        self.assertEqual(next_fire("30 9 * 2 *", _utc(2026, 3, 1)), _utc(2027, 2, 1, 9, 30))
+
+    def test_skips_months_without_the_day(self):
+        self.assertEqual(next_fire("0 0 31 * *", _utc(2026, 4, 1)), _utc(2026, 5, 31, 0, 0))
+        self.assertEqual(next_fire("0 0 29 2 *", _utc(2026, 1, 1)), _utc(2028, 2, 29, 0, 0))
+
+    def test_day_of_month_or_day_of_week(self):
+        after = _utc(2026, 10, 18)   # a Sunday
+
+        # Both restricted: whichever comes first — Friday the 23rd before the 13th
+        self.assertEqual(next_fire("0 12 13 * 5", after), _utc(2026, 10, 23, 12, 0))
+        # Only one restricted: that one alone decides
+        self.assertEqual(next_fire("0 12 13 * *", after), _utc(2026, 11, 13, 12, 0))
+        self.assertEqual(next_fire("0 12 * * 1", after), _utc(2026, 10, 19, 12, 0))
+        self.assertEqual(next_fire("0 12 */2 * 1", after), _utc(2026, 10, 19, 12, 0))
+
+    def test_converts_to_utc(self):
+        after = datetime(2026, 10, 18, 10, 0, tzinfo=timezone(timedelta(hours=-5)))   # 15:00 UTC
+        self.assertEqual(next_fire("0 14 * * *", after), _utc(2026, 10, 19, 14, 0))
+
+    def test_never_fires(self):
+        with self.assertRaises(ValueError):
+            next_fire("0 0 30 2 *", _utc(2026, 1, 1))
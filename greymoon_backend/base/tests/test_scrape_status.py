@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from base.models import RunEvent, ScrapeRun
+
+
+class ScrapeStatusLogTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("ops", "ops@example.com", "pw"))
+        run = ScrapeRun.objects.create(run_id="r1")
+        RunEvent.objects.bulk_create(
+            RunEvent(run=run, seq=seq, ts=datetime.now(timezone.utc), stage=f"step {seq}")
+            for seq in range(1, 11)
+        )
+
+    def _get(self, query="", **headers):
+        return self.client.get(f"/api/scrape/status/{query}", headers=headers)
+
+    def _stages(self, response):
+        return [e["stage"] for e in response.json()["activity_log"]]
+
+    def test_first_poll_gets_only_the_tail(self):
+        with mock.patch("base.views.ACTIVITY_LOG_TAIL", 3):
+            response = self._get()
+
+        self.assertEqual(self._stages(response), ["step 8", "step 9", "step 10"])
+        self.assertEqual(response.json()["cursor"], 10)
+        self.assertFalse(response.json()["incremental"])
+
+    def test_since_returns_the_delta(self):
+        response = self._get("?since=8")
+
+        self.assertEqual(self._stages(response), ["step 9", "step 10"])
+        self.assertTrue(response.json()["incremental"])
+
+    def test_unchanged_poll_is_not_modified(self):
+        etag = self._get("?since=10")["ETag"]
+
+        self.assertEqual(self._get("?since=10", **{"If-None-Match": etag}).status_code, 304)
+        RunEvent.objects.create(run_id=ScrapeRun.objects.get().pk, seq=11, ts=datetime.now(timezone.utc), stage="new")
+        self.assertEqual(self._get("?since=10", **{"If-None-Match": etag}).status_code, 200)
@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+
+from base.services.text_kernel import CONTACT_RE, extract_contacts, extract_contacts_many, extract_page_contacts
+
+
+class ContactScanTests(SimpleTestCase):
+
+    def test_phone_next_to_email(self):
+        for text in (
+            "Call 512-555-0100 or email maria@cleanco.com",
+            "Reach me: maria@cleanco.com, 512-555-0100",
+            "512-555-0100 maria@cleanco.com",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(extract_contacts(text), ("512-555-0100", "maria@cleanco.com"))
+
+    def test_digits_in_email_local_part_are_not_a_phone(self):
+        self.assertEqual(extract_contacts("joe.5125550100@mail.com"), (None, "joe.5125550100@mail.com"))
+        self.assertEqual(
+            extract_contacts("Email 5125550100@gmail.com or call (512) 555-0199"),
+            ("(512) 555-0199", "5125550100@gmail.com"),
+        )
+        self.assertEqual(
+            [m.lastgroup for m in CONTACT_RE.finditer("5125550100@gmail.com")], ["email"],
+        )
+
+    def test_first_of_several_contacts(self):
+        text = "Call 512-555-0100, text 737-555-0111, mail a@b.com or c@d.com"
+
+        self.assertEqual(extract_contacts(text), ("512-555-0100", "a@b.com"))
+        self.assertEqual(
+            [(m.lastgroup, m.group().strip()) for m in CONTACT_RE.finditer(text)],
+            [("phone", "512-555-0100"), ("phone", "737-555-0111"), ("email", "a@b.com"), ("email", "c@d.com")],
+        )
+
+    def test_stray_at_sign_or_no_contacts(self):
+        self.assertEqual(extract_contacts("Call 512-555-0100 @ any time"), ("512-555-0100", None))
+        self.assertEqual(extract_contacts("No contacts here"), (None, None))
+        self.assertEqual(extract_contacts(""), (None, None))
+
+    def test_many_keeps_order(self):
+        self.assertEqual(
+            extract_contacts_many(["a@b.com", "", "512-555-0100"]),
+            [(None, "a@b.com"), (None, None), ("512-555-0100", None)],
+        )
+
+
+class PageContactScanTests(SimpleTestCase):
+
+    def test_every_contact_on_the_page(self):
+        text = (
+            '<a href="tel:5125550100">Call</a> or 737-555-0111, '
+            "Maria@CleanCo.com, 8005550100@faxmail.net, maria@cleanco.com"
+        )
+
+        self.assertEqual(extract_page_contacts(text), {
+            "phones": ["(512) 555-0100", "737-555-0111"],
+            "emails": ["maria@cleanco.com", "8005550100@faxmail.net"],
+        })
@@ -1,21 +1,24 @@
 from django.urls import path
 from .views import (
-    manual_scrape, cancel_scrape, scrape_status, scrape_history,
-    list_services, update_lead_status,
+    manual_scrape, cancel_scrape, resume_scrape, scrape_status, scrape_history,
+    list_services, lead_detail, update_lead_status,
     get_cities, get_categories,
     list_scraped_groups, list_group_leads, delete_scraped_group,
     add_fb_groups, scrape_selected_groups, export_leads, run_leads, export_run_leads,
+    run_event_stream, run_event_stream_ticket, apify_webhook,
 )
 
 urlpatterns = [
     path("scrape/start/",   manual_scrape,   name="scrape_start"),
     path("scrape/cancel/",  cancel_scrape,   name="scrape_cancel"),
+    path("scrape/resume/",  resume_scrape,   name="scrape_resume"),
     path("scrape/status/",  scrape_status,   name="scrape_status"),
     path("scrape/history/", scrape_history,  name="scrape_history"),
 
     path("leads/",                         list_services,      name="leads_list"),
     path("leads/<str:post_id>/status/",    update_lead_status, name="lead_status_update"),
     path("leads/export/", export_leads, name="leads_export"),
+    path("leads/<str:post_id>/",           lead_detail,        name="lead_detail"),
 
     path("fb-groups/",         list_scraped_groups,   name="fb_groups_list"),
     path("fb-groups/add/",     add_fb_groups,         name="fb_groups_add"),
@@ -28,4 +31,8 @@ urlpatterns = [
 
     path("scrape/runs/<str:run_id>/leads/",        run_leads,        name="run_leads"),
     path("scrape/runs/<str:run_id>/export/",       export_run_leads, name="export_run_leads"),
+    path("scrape/runs/<str:run_id>/events/",       run_event_stream, name="run_event_stream"),
+    path("scrape/runs/<str:run_id>/events/ticket/", run_event_stream_ticket, name="run_event_stream_ticket"),
+
+    path("apify/webhook/", apify_webhook, name="apify_webhook"),
 ]
\ No newline at end of file
@@ -2,6 +2,9 @@ import re
 import hashlib
 from .models import ServiceLead
 from .services.lead_scorer import calculate_lead_score
+from .services.raw_payloads import raw_summary, store_raw_payloads
+from .services.lead_entities import entity_keys, link_lead_entities
+from .services.text_kernel import extract_contacts
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 
@@ -15,8 +18,7 @@ def extract_zip(text):
 
 
 def extract_email(text):
-    match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text or "")
-    return match.group() if match else None
+    return extract_contacts(text or "")[1]
 
 
 def make_content_hash(title, description, phone, email):
@@ -113,8 +115,9 @@ def process_results(results):
                     pass
 
             score, score_reason = calculate_lead_score(item)
+            phone_e164, email_norm, domain = entity_keys(phone, email, item.get("url"))
 
-            ServiceLead.objects.create(
+            lead = ServiceLead.objects.create(
                 post_id=post_id,
                 content_hash=content_hash,
                 url=item.get("url"),
@@ -129,13 +132,18 @@ def process_results(results):
                 post=description,
                 phone=phone,
                 email=email,
+                phone_e164=phone_e164,
+                email_norm=email_norm,
+                domain=domain,
                 zip_code=zip_code,
                 state=state,
-                raw_json=item,
+                raw_summary=raw_summary(item),
                 status="NEW",
                 score=score,
                 score_reason=score_reason,
             )
+            store_raw_payloads({lead.pk: item})
+            link_lead_entities([(lead.pk, phone_e164, email_norm, domain)])
             saved += 1
 
         except Exception as e:
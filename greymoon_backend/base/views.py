@@ -1,20 +1,34 @@
 import re
 import io
+import json
+import time
 import uuid
-import requests
+import asyncio
+import hashlib
+import hmac
 from datetime import datetime, timezone, timedelta
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.conf import settings
-from django.http import HttpResponse
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-
-from .models import ServiceLead, ScrapeRun, ScrapedFbGroup
-from .serializers import ServiceLeadSerializer, ScrapeRunSerializer
-from .services.tasks import start_pipeline_thread
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import ServiceLead, ScrapeRun, ScrapedFbGroup, RunEvent
+from .serializers import ServiceLeadSerializer, ServiceLeadDetailSerializer, ScrapeRunSerializer
+from .services.tasks import enqueue_pipeline
+from .services.job_queue import cancel_queued, resume_run
+from .services.run_events import log_event, flush_events, run_signal
+from .services.cancellation import cancel_run
+from .services.apify_client import get_client
+from .services.actor_webhooks import record_webhook_status, status_from_webhook
 from .services.category_map import ALL_CATEGORIES, SERVICE_CATEGORY_MAP
 from .services.location_resolver import resolve_location, LocationResolutionError
 from .services.city_structure import US_CITY_STRUCTURE
@@ -178,15 +192,14 @@ def manual_scrape(request):
         max_posts_per_group=max_posts_per_group,
         categories=categories,
         sources=sources,
-        current_stage="Starting",
-        stage_detail="Pipeline initialising…",
-        activity_log=[],
+        current_stage="Queued",
+        stage_detail="Waiting for a worker…",
         google_max_pages=google_max_pages,
         google_deep_scrape=google_deep_scrape,
         max_leads=max_leads,
     )
 
-    start_pipeline_thread(
+    enqueue_pipeline(
         location_type=location_type or "custom",
         location_value=location_value or "",
         categories=categories,
@@ -200,7 +213,7 @@ def manual_scrape(request):
     )
 
     return Response({
-        "message": "Scrape started successfully.",
+        "message": "Scrape queued successfully.",
         "run_id":  run.run_id,
         "location": location_display,
         "categories": categories,
@@ -211,32 +224,16 @@ def manual_scrape(request):
     }, status=202)
 
 
-def _sweep_and_abort(apify_headers: dict, already_aborted: set) -> list[str]:
+def _sweep_and_abort(client, already_aborted: set) -> list[str]:
     newly = []
     for status_filter in ("RUNNING", "READY"):
         try:
-            resp = requests.get(
-                "https://api.apify.com/v2/actor-runs",
-                headers=apify_headers,
-                params={"status": status_filter, "limit": 100},
-                timeout=15,
-            )
-            if resp.status_code != 200:
-                continue
-            for actor_run in resp.json().get("data", {}).get("items", []):
+            for actor_run in client.list_runs(status_filter, limit=100):
                 aid = actor_run.get("id")
                 if aid and aid not in already_aborted:
-                    try:
-                        ar = requests.post(
-                            f"https://api.apify.com/v2/actor-runs/{aid}/abort",
-                            headers=apify_headers,
-                            timeout=10,
-                        )
-                        if ar.status_code in (200, 204):
-                            newly.append(aid)
-                            already_aborted.add(aid)
-                    except Exception as e:
-                        print(f"[Cancel] Could not abort actor {aid}: {e}")
+                    if client.abort_run(aid):
+                        newly.append(aid)
+                        already_aborted.add(aid)
         except Exception as e:
             print(f"[Cancel] Sweep ({status_filter}) error: {e}")
     return newly
@@ -253,28 +250,21 @@ def cancel_scrape(request):
     if not run:
         return Response({"error": "Run not found"}, status=404)
 
-    ScrapeRun.objects.filter(run_id=run_id).update(cancel_requested=True)
+    cancel_run(run.pk)
+    cancel_queued(run.pk)
 
-    apify_headers  = {"Authorization": f"Bearer {settings.APIFY_TOKEN}"}
+    client = get_client()
     aborted_set: set = set()
 
     for apify_id in (run.apify_run_ids or []):
-        try:
-            resp = requests.post(
-                f"https://api.apify.com/v2/actor-runs/{apify_id}/abort",
-                headers=apify_headers,
-                timeout=10,
-            )
-            if resp.status_code in (200, 204):
-                aborted_set.add(apify_id)
-        except Exception as e:
-            print(f"[Cancel] Abort failed for registered actor {apify_id}: {e}")
+        if client.abort_run(apify_id):
+            aborted_set.add(apify_id)
 
-    _sweep_and_abort(apify_headers, aborted_set)
+    _sweep_and_abort(client, aborted_set)
 
     import time as _time
     _time.sleep(3)
-    _sweep_and_abort(apify_headers, aborted_set)
+    _sweep_and_abort(client, aborted_set)
 
     run.refresh_from_db()
     detail = (
@@ -282,18 +272,12 @@ def cancel_scrape(request):
         if run.leads_collected > 0
         else "Run cancelled before any leads were collected."
     )
-    activity_log = run.activity_log or []
-    activity_log.append({
-        "ts":     datetime.now(timezone.utc).isoformat(),
-        "stage":  "Stopped by user",
-        "detail": detail,
-        "level":  "warning",
-    })
+    log_event(run.pk, "Stopped by user", detail, level="warning")
+    flush_events()
     run.status        = "PARTIAL" if run.leads_collected > 0 else "ABORTED"
     run.finished_at   = datetime.now(timezone.utc)
     run.current_stage = "Stopped by user"
     run.stage_detail  = detail
-    run.activity_log  = activity_log
     run.save()
 
     return Response({
@@ -303,21 +287,100 @@ def cancel_scrape(request):
     })
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def resume_scrape(request):
+    run_id = request.data.get("run_id")
+    if not run_id:
+        return Response({"error": "run_id required"}, status=400)
+
+    run = ScrapeRun.objects.filter(run_id=run_id).first()
+    if not run:
+        return Response({"error": "Run not found"}, status=404)
+
+    job = resume_run(run.pk)
+    if job is None:
+        return Response(
+            {"error": f"Run {run_id} can't be resumed — it is {run.status.lower()}, "
+                      f"cancelled, or still has a live job."},
+            status=409,
+        )
+
+    log_event(run.pk, "Resume queued", "Run will continue from its last checkpoint.")
+    flush_events()
+    return Response({
+        "message":            f"Scrape {run_id} queued to resume.",
+        "leads_saved_so_far": run.leads_collected,
+    })
+
+
+ACTIVITY_LOG_TAIL = 200    # log entries in a status response without ?since=
+
+_STATUS_FIELDS = (
+    "pk", "run_id", "status", "location_display", "categories", "sources",
+    "leads_collected", "leads_skipped", "source_stats",
+    "current_stage", "stage_detail", "created_at", "finished_at",
+    "max_leads", "limit_stop", "cancel_requested",
+)
+
+
+def _activity_log(run_pk, since: int = None) -> list[dict]:
+    """
+    Log entries after `since`, or — for a client with no cursor yet — only
+    the last ACTIVITY_LOG_TAIL of them; it follows on with ?since=.
+    """
+    events = RunEvent.objects.filter(run_id=run_pk)
+    if since is not None:
+        entries = [e.as_log_entry() for e in events.filter(seq__gt=since).order_by("seq")]
+    else:
+        entries = [e.as_log_entry() for e in events.order_by("-seq")[:ACTIVITY_LOG_TAIL]][::-1]
+
+    # Only the latest "live count" entry per source is kept, as before
+    latest_stats = {
+        e["source"]: e["seq"] for e in entries if e.get("type") == "source_stats"
+    }
+    return [
+        e for e in entries
+        if e.get("type") != "source_stats" or latest_stats.get(e.get("source")) == e["seq"]
+    ]
+
+
+def _status_etag(run: dict, last_seq, since) -> str:
+    key = "|".join(str(run[f]) for f in _STATUS_FIELDS) + f"|{last_seq}|{since}"
+    return f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def scrape_status(request):
-    run = ScrapeRun.objects.order_by("-created_at").first()
+    """
+    Latest run's status. Pass ?since=<cursor> (the "cursor" from the
+    previous response) to get only the log entries written after it.
+    Responds 304 when nothing changed since the ETag in If-None-Match.
+    """
+    run = ScrapeRun.objects.order_by("-created_at").values(*_STATUS_FIELDS).first()
     if not run:
         return Response({"status": "IDLE"})
 
-    source_stats = {}
     try:
-        source_stats = run.source_stats or {}
-    except AttributeError:
-        pass
+        since = int(request.query_params["since"])
+    except (KeyError, TypeError, ValueError):
+        since = None
+
+    last_seq = (
+        RunEvent.objects.filter(run_id=run["pk"])
+        .order_by("-seq").values_list("seq", flat=True).first()
+    )
+    etag = _status_etag(run, last_seq, since)
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers={"ETag": etag})
+
+    activity_log = _activity_log(run["pk"], since)
+
+    source_stats = run["source_stats"] or {}
 
     if not source_stats:
-        for entry in (run.activity_log or []):
+        for entry in activity_log:
             if entry.get("type") == "source_stats":
                 src = entry.get("source")
                 if src:
@@ -327,30 +390,211 @@ def scrape_status(request):
                     }
 
     return Response({
-        "run_id":          run.run_id,
-        "status":          run.status,
-        "location":        run.location_display,
-        "categories":      run.categories,
-        "sources":         run.sources,
-        "leads_collected": run.leads_collected,
-        "leads_skipped":   run.leads_skipped,
+        "run_id":          run["run_id"],
+        "status":          run["status"],
+        "location":        run["location_display"],
+        "categories":      run["categories"],
+        "sources":         run["sources"],
+        "leads_collected": run["leads_collected"],
+        "leads_skipped":   run["leads_skipped"],
         "source_stats":    source_stats,
-        "current_stage":   run.current_stage or "",
-        "stage_detail":    run.stage_detail or "",
-        "activity_log":    run.activity_log or [],
-        "started_at":      run.created_at,
-        "finished_at":     run.finished_at,
-        "max_leads":       run.max_leads,
-        "limit_stop":      run.limit_stop,
-        "cancel_requested": run.cancel_requested,
+        "current_stage":   run["current_stage"] or "",
+        "stage_detail":    run["stage_detail"] or "",
+        "activity_log":    activity_log,
+        "cursor":          max((c for c in (last_seq, since) if c is not None), default=None),
+        "incremental":     since is not None,
+        "started_at":      run["created_at"],
+        "finished_at":     run["finished_at"],
+        "max_leads":       run["max_leads"],
+        "limit_stop":      run["limit_stop"],
+        "cancel_requested": run["cancel_requested"],
         "is_stopping": (
-                        run.status == "RUNNING" and (
-                        run.cancel_requested or
-                        (run.current_stage or "").lower().startswith("stopping")
+                        run["status"] == "RUNNING" and (
+                        run["cancel_requested"] or
+                        (run["current_stage"] or "").lower().startswith("stopping")
     )
 ),
 
-    })
+    }, headers={"ETag": etag})
+
+
+SSE_POLL_INTERVAL  = 1.0    # seconds — re-read the tables at least this often
+SSE_HEARTBEAT      = 15     # seconds between keep-alive comments
+SSE_PAGE_SIZE      = 500    # log entries read per poll
+SSE_TICKET_MAX_AGE = 60     # seconds a stream ticket is accepted for
+SSE_TICKET_SALT    = "base.run_event_stream"
+
+_PROGRESS_FIELDS = (
+    "status", "leads_collected", "leads_skipped", "source_stats",
+    "current_stage", "stage_detail", "max_leads", "limit_stop",
+    "cancel_requested", "finished_at",
+)
+
+
+def _sse(event: str, data, event_id=None) -> str:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _stream_poll(run_pk, cursor, progress):
+    """
+    One read of the run for the event stream: log entries after `cursor`
+    and the progress fields if they changed since `progress`.
+    Returns (chunks, cursor, progress, finished).
+    """
+    chunks = []
+    run = ScrapeRun.objects.filter(pk=run_pk).values(*_PROGRESS_FIELDS).first()
+    if run is None:
+        return [_sse("end", {"status": "DELETED"})], cursor, progress, True
+
+    events = RunEvent.objects.filter(run_id=run_pk)
+    if cursor is not None:
+        events = events.filter(seq__gt=cursor)
+    page = list(events.order_by("seq")[:SSE_PAGE_SIZE])
+    for event in page:
+        chunks.append(_sse("log", event.as_log_entry(), event_id=event.seq))
+        cursor = event.seq
+
+    if run != progress:
+        chunks.append(_sse("progress", run, event_id=cursor))
+        progress = run
+
+    # Only finish once the backlog is drained — a full page means more to read
+    finished = run["status"] != "RUNNING" and len(page) < SSE_PAGE_SIZE
+    if finished:
+        chunks.append(_sse("end", {"status": run["status"]}, event_id=cursor))
+    return chunks, cursor, progress, finished
+
+
+def _event_stream_sync(run_pk, cursor):
+    """WSGI fallback: a plain generator that blocks the worker thread."""
+    progress, last_beat = None, time.monotonic()
+    while True:
+        version = run_signal.version(run_pk)
+        chunks, cursor, progress, finished = _stream_poll(run_pk, cursor, progress)
+        yield from chunks
+        if finished:
+            return
+        if time.monotonic() - last_beat >= SSE_HEARTBEAT:
+            last_beat = time.monotonic()
+            yield ": ping\n\n"
+        run_signal.wait(run_pk, version, SSE_POLL_INTERVAL)
+
+
+async def _event_stream_async(run_pk, cursor):
+    progress, last_beat = None, time.monotonic()
+    poll = sync_to_async(_stream_poll)
+    while True:
+        version = run_signal.version(run_pk)
+        chunks, cursor, progress, finished = await poll(run_pk, cursor, progress)
+        for chunk in chunks:
+            yield chunk
+        if finished:
+            return
+        if time.monotonic() - last_beat >= SSE_HEARTBEAT:
+            last_beat = time.monotonic()
+            yield ": ping\n\n"
+        await asyncio.to_thread(run_signal.wait, run_pk, version, SSE_POLL_INTERVAL)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def run_event_stream_ticket(request, run_id):
+    """
+    A short-lived ticket for opening one run's event stream. EventSource
+    can't send headers, so the stream URL carries this (?ticket=) instead
+    of the access token: it only opens that run's stream and only within
+    SSE_TICKET_MAX_AGE seconds, so one leaked from an access log is of
+    little use. A client that reconnects later asks for a new one.
+    """
+    if not ScrapeRun.objects.filter(run_id=run_id).exists():
+        return Response({"error": "Run not found"}, status=404)
+    ticket = signing.dumps({"user": request.user.pk, "run": run_id}, salt=SSE_TICKET_SALT)
+    return Response({"ticket": ticket, "expires_in": SSE_TICKET_MAX_AGE})
+
+
+def _stream_user(request, run_id):
+    """
+    Auth for the event stream — a Bearer access token, or a ticket from
+    run_event_stream_ticket issued for this run.
+    """
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        auth = JWTAuthentication()
+        try:
+            return auth.get_user(auth.get_validated_token(header.split(" ", 1)[1]))
+        except Exception:
+            return None
+
+    ticket = request.GET.get("ticket")
+    if not ticket:
+        return None
+    try:
+        claims = signing.loads(ticket, salt=SSE_TICKET_SALT, max_age=SSE_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if claims.get("run") != run_id:
+        return None
+    return get_user_model().objects.filter(pk=claims.get("user"), is_active=True).first()
+
+
+async def run_event_stream(request, run_id):
+    """
+    Server-Sent Events for one run: "log" for each activity entry,
+    "progress" whenever the counters/stage change and "end" once the run
+    has finished. Resumes after the seq in Last-Event-ID (or ?since=).
+    Authenticated by a Bearer token or a ?ticket= from
+    run_event_stream_ticket — never an access token in the URL.
+    """
+    user = await sync_to_async(_stream_user)(request, run_id)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    run_pk = await sync_to_async(
+        lambda: ScrapeRun.objects.filter(run_id=run_id).values_list("pk", flat=True).first()
+    )()
+    if run_pk is None:
+        return JsonResponse({"error": "Run not found"}, status=404)
+
+    try:
+        cursor = int(request.headers.get("Last-Event-ID") or request.GET["since"])
+    except (KeyError, TypeError, ValueError):
+        cursor = None
+
+    if isinstance(request, ASGIRequest):
+        stream = _event_stream_async(run_pk, cursor)
+    else:
+        stream = _event_stream_sync(run_pk, cursor)
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"]     = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def apify_webhook(request):
+    """
+    Receiver for the ad-hoc run webhooks attached at actor launch. Records
+    the run's final status in ActorRunStatus, where the wait loop polling
+    it picks it up from whichever process it runs in.
+    """
+    # No secret configured means webhooks are off — never accept unsigned calls
+    secret = getattr(settings, "APIFY_WEBHOOK_SECRET", "")
+    if not secret or not hmac.compare_digest(request.query_params.get("secret", ""), secret):
+        return Response({"error": "Invalid webhook secret"}, status=403)
+
+    run_id, status = status_from_webhook(request.data if isinstance(request.data, dict) else {})
+    if not run_id or not status:
+        return Response({"error": "Missing run id or status"}, status=400)
+
+    record_webhook_status(run_id, status)
+    print(f"[Apify webhook] Run {run_id} → {status}")
+    return Response({"ok": True})
 
 
 @api_view(["GET"])
@@ -589,15 +833,14 @@ def scrape_selected_groups(request):
         max_posts_per_group=max_posts_per_group,
         categories=[],
         sources=["facebook"],
-        current_stage="Starting",
-        stage_detail="Pipeline initialising…",
-        activity_log=[],
+        current_stage="Queued",
+        stage_detail="Waiting for a worker…",
         google_max_pages=3,
         google_deep_scrape=False,
         max_leads=max_leads,
     )
 
-    start_pipeline_thread(
+    enqueue_pipeline(
         location_type="custom",
         location_value="",
         categories=[],
@@ -609,7 +852,7 @@ def scrape_selected_groups(request):
     )
 
     return Response({
-        "message":   "Facebook scrape started.",
+        "message":   "Facebook scrape queued.",
         "run_id":    run.run_id,
         "groups":    len(group_urls),
         "max_posts": max_posts_per_group,
@@ -650,6 +893,25 @@ def delete_scraped_group(request):
     return Response({"deleted": deleted})
 
 
+def _collapse_by_entity(leads):
+    """
+    Keep the highest-scoring (then newest) filtered lead of each LeadEntity
+    and every lead without one. The per-row subquery is an index lookup
+    on entity_id.
+    """
+    from django.db.models import F, OuterRef, Q, Subquery
+
+    best = (
+        leads.filter(entity_id=OuterRef("entity_id"))
+        .order_by("-score", "-created_at", "-pk")
+        .values("pk")[:1]
+    )
+    return (
+        leads.filter(Q(entity__isnull=True) | Q(pk=Subquery(best)))
+        .annotate(entity_size=F("entity__lead_count"))
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_services(request):
@@ -657,6 +919,10 @@ def list_services(request):
 
     leads = _apply_lead_filters(leads, request.query_params)
 
+    # One card per business: the best lead of each entity, plus unlinked leads
+    if request.query_params.get("collapse") == "entity":
+        leads = _collapse_by_entity(leads)
+
     ordering_param = request.query_params.get("ordering", "-created_at")
     ALLOWED_ORDERING_FIELDS = {
         "datetime", "-datetime",
@@ -702,6 +968,17 @@ def list_services(request):
     })
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def lead_detail(request, post_id):
+    try:
+        lead = ServiceLead.objects.get(post_id=post_id)
+    except ServiceLead.DoesNotExist:
+        return Response({"error": "Lead not found"}, status=404)
+
+    return Response(ServiceLeadDetailSerializer(lead).data)
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def update_lead_status(request, post_id):
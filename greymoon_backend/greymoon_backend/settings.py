@@ -1,4 +1,5 @@
 from datetime import timedelta
+from corsheaders.defaults import default_headers as default_cors_headers
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -50,9 +51,58 @@ MIDDLEWARE = [
 load_dotenv()
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 
+# Actor runs kept in flight at once — globally, and per source
+APIFY_MAX_CONCURRENT_RUNS = int(os.getenv("APIFY_MAX_CONCURRENT_RUNS", "3"))
+APIFY_SOURCE_CONCURRENCY = {
+    "craigslist": int(os.getenv("APIFY_CRAIGSLIST_CONCURRENCY", APIFY_MAX_CONCURRENT_RUNS)),
+    "facebook":   int(os.getenv("APIFY_FACEBOOK_CONCURRENCY",   APIFY_MAX_CONCURRENT_RUNS)),
+    "crawl":      int(os.getenv("APIFY_CRAWL_CONCURRENCY",      APIFY_MAX_CONCURRENT_RUNS)),
+}
+
+# Ad-hoc run webhooks: set APIFY_WEBHOOK_URL to this backend's public
+# .../api/apify/webhook/ URL and APIFY_WEBHOOK_SECRET to a random string,
+# and actor waits wake on completion (the status is shared through
+# ActorRunStatus, checked every poll interval); Apify itself is then only
+# polled every APIFY_WEBHOOK_FALLBACK_POLL s. Without a secret webhooks
+# stay off and the receiver rejects every call.
+APIFY_WEBHOOK_URL           = os.getenv("APIFY_WEBHOOK_URL", "")
+APIFY_WEBHOOK_SECRET        = os.getenv("APIFY_WEBHOOK_SECRET", "")
+APIFY_WEBHOOK_FALLBACK_POLL = int(os.getenv("APIFY_WEBHOOK_FALLBACK_POLL", "30"))
+
+# Optionally run the Craigslist, Facebook and Google stages of a run side by
+# side (PIPELINE_CONCURRENT_SOURCES=1); off by default
+PIPELINE_CONCURRENT_SOURCES = os.getenv("PIPELINE_CONCURRENT_SOURCES", "0") == "1"
+
+# Pipeline job queue — requests enqueue, `manage.py run_workers` executes.
+# Until a run_workers process is deployed, PIPELINE_IN_PROCESS_WORKER (on by
+# default) also runs each job on a thread of the process that queued it;
+# set it to 0 once workers are running.
+PIPELINE_IN_PROCESS_WORKER  = os.getenv("PIPELINE_IN_PROCESS_WORKER", "1") == "1"
+PIPELINE_WORKER_CONCURRENCY = int(os.getenv("PIPELINE_WORKER_CONCURRENCY", "2"))   # runs per worker process
+PIPELINE_JOB_LEASE          = int(os.getenv("PIPELINE_JOB_LEASE", "60"))           # seconds, renewed while running
+PIPELINE_JOB_MAX_ATTEMPTS   = int(os.getenv("PIPELINE_JOB_MAX_ATTEMPTS", "2"))
+
+# Normalise, hash and score CL/FB batches on a process pool instead of the
+# ingest threads; 0 workers = one per CPU, minus one
+PIPELINE_PROCESS_POOL    = os.getenv("PIPELINE_PROCESS_POOL", "0") == "1"
+PIPELINE_PROCESS_WORKERS = int(os.getenv("PIPELINE_PROCESS_WORKERS", "0"))
+
+# CL/FB content_hash scheme: "fast" (blake2b), "legacy" (sha256 JSON) or
+# "compat" — fast, still matching legacy rows until `manage.py rehash_leads`
+CONTENT_HASH_MODE = os.getenv("CONTENT_HASH_MODE", "compat")
+
+# Scheduled scrapes — fired by `run_workers`; each run only fetches postings
+# newer than its spec's last successful run, less the overlap
+SCHEDULER_INTERVAL      = int(os.getenv("SCHEDULER_INTERVAL", "30"))        # seconds
+SCHEDULE_WINDOW_OVERLAP = int(os.getenv("SCHEDULE_WINDOW_OVERLAP", "60"))   # minutes
+
 CORS_ALLOWED_ORIGINS = [
     "https://wocco-greymoon.vercel.app",
 ]
+# The dashboard polls /scrape/status/ conditionally, so it sends If-None-Match
+# and has to be able to read the ETag back
+CORS_ALLOW_HEADERS  = (*default_cors_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag"]
 
 CSRF_TRUSTED_ORIGINS = [
     "https://wocco-greymoon.vercel.app",